@@ -1,8 +1,20 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+
+import numpy as np
 import streamlit as st
 from pydantic_ai import Agent
 
 import settings
+from caching import LRUCache, SQLiteCache, TieredCache
 from models import Competency
+from prompt_builder import NO_RELEVANT_COURSES_MESSAGE, build_prompt, score_courses
+from tools import usable_courses
+
+logger = logging.getLogger(__name__)
 
 
 def init_llm_agent():
@@ -25,17 +37,60 @@ def init_llm_agent():
         return None
 
 
-def generate_course_message_with_llm(
+NO_AGENT_MESSAGE = "LLM Agent is not initialized. Cannot generate recommendations."
+NO_COMPETENCIES_MESSAGE = "I couldn't find any competencies or courses this time."
+NO_COURSES_MESSAGE = "I found some relevant competencies, but couldn't find specific courses for them at this time. The course search might have failed or returned no results."
+LLM_ERROR_MESSAGE = (
+    "Sorry, I encountered an error while trying to generate the course recommendations."
+)
+
+
+def valid_course_titles(
+    search_results: dict, competencies: list[Competency]
+) -> dict[str, list[str]]:
+    """Course titles shown to the LLM, per competency in competency order.
+
+    Competencies left without usable courses are dropped.
+    """
+    titles = {}
+    for comp in competencies:
+        courses = usable_courses(search_results.get(comp.name))
+        if courses:
+            titles[comp.name] = courses
+    return titles
+
+
+def build_recommendation_prompt(
     search_results: dict,
     competencies: list[Competency],
     user_query: str,
-    llm_agent: Agent,
+    encoder=None,
 ):
-    if llm_agent is None:
-        return "LLM Agent is not initialized. Cannot generate recommendations."
+    """Return `(prompt, None)`, or `(None, reply)` when the LLM is not needed.
 
+    Given the sentence `encoder` (and PROMPT_FILTER_ENABLED), course titles
+    are scored, filtered and deduplicated locally and the prompt is kept
+    within PROMPT_TOKEN_BUDGET; otherwise every title is sent and the LLM is
+    asked to discard irrelevant ones.
+    """
     if not competencies:
-        return "I couldn't find any competencies or courses this time."
+        return None, NO_COMPETENCIES_MESSAGE
+
+    course_titles = valid_course_titles(search_results, competencies)
+    if not course_titles:
+        return None, NO_COURSES_MESSAGE
+
+    if encoder is not None and settings.PROMPT_FILTER_ENABLED:
+        try:
+            scored_courses = score_courses(
+                encoder, user_query, competencies, course_titles
+            )
+        except Exception as e:
+            logger.warning(f"Course pre-filtering failed, sending all titles: {e}")
+        else:
+            if not scored_courses:
+                return None, NO_RELEVANT_COURSES_MESSAGE
+            return build_prompt(user_query, competencies, scored_courses), None
 
     data_for_llm = f"User Query: {user_query}\n\nRelevant Competencies:\n"
     for i, comp in enumerate(competencies):
@@ -44,28 +99,10 @@ def generate_course_message_with_llm(
         )
 
     data_for_llm += "\nSearch Results (Competency -> List of Course Titles):\n"
-    found_any_courses_in_results = False
-    for comp in competencies:
-        if (
-            comp.name in search_results
-            and search_results[comp.name]
-            and search_results[comp.name] != ["No courses found."]
-        ):
-            valid_courses_for_comp = [
-                course
-                for course in search_results[comp.name]
-                if course
-                and course != "No courses found."
-                and not course.startswith("Error")
-            ]
-            if valid_courses_for_comp:
-                data_for_llm += f"- {comp.name}:\n"
-                for course in valid_courses_for_comp:
-                    data_for_llm += f"  - {course}\n"
-                found_any_courses_in_results = True
-
-    if not found_any_courses_in_results:
-        return "I found some relevant competencies, but couldn't find specific courses for them at this time. The course search might have failed or returned no results."
+    for name, courses in course_titles.items():
+        data_for_llm += f"- {name}:\n"
+        for course in courses:
+            data_for_llm += f"  - {course}\n"
 
     prompt = f"""
 You are a helpful Learning Path Assistant. Your task is to generate a course recommendation message for a user based on their original interest, a list of relevant competencies, and a list of courses found for each competency.
@@ -90,10 +127,275 @@ If after filtering, you find that none of the courses are truly relevant, state:
 
 Ensure the final output uses correct Markdown syntax for headings, bold text, and italics.
 """
+    return prompt, None
+
+
+class RecommendationCache:
+    """Final LLM recommendations keyed on everything the prompt is built from.
+
+    The exact tier hashes the normalized query together with the ordered
+    competencies and the course titles shown to the LLM. The semantic tier
+    remembers, per competency/course set, the embeddings of the queries
+    answered for it; a new query whose embedding has cosine similarity of at
+    least `semantic_threshold` with one of them reuses that answer. Both
+    tiers live in `cache`, so they share its TTL, eviction and persistence.
+    """
+
+    def __init__(
+        self,
+        cache: TieredCache,
+        semantic_threshold=settings.RECOMMENDATION_SEMANTIC_THRESHOLD,
+        max_queries=settings.RECOMMENDATION_SEMANTIC_MAX_QUERIES,
+    ):
+        self.cache = cache
+        self.semantic_threshold = semantic_threshold
+        self.max_queries = max_queries
+        self._query_vectors = LRUCache(maxsize=256)
+        self._lock = threading.Lock()
+        self._semantic_hits = 0
+
+    @staticmethod
+    def context_key(competencies: list[Competency], course_titles: dict) -> str:
+        """Hash of the LLM and retrieval inputs, without the user query."""
+        payload = {
+            "model": settings.LLM_MODEL_NAME,
+            "competencies": [[comp.name, comp.description] for comp in competencies],
+            "courses": [[name, courses] for name, courses in course_titles.items()],
+        }
+        return _sha256(payload)
+
+    @staticmethod
+    def exact_key(user_query: str, context_key: str) -> str:
+        return _sha256({"query": _normalize_query(user_query), "context": context_key})
+
+    def get(
+        self, user_query, competencies, course_titles, embed_query=None
+    ) -> str | None:
+        """Cached message for these inputs, or None.
+
+        `embed_query` maps a query to its embedding, or None when it has
+        none; without an embedding only exact repeats are answered from the
+        cache.
+        """
+        context = self.context_key(competencies, course_titles)
+        message = self.cache.get(f"exact:{self.exact_key(user_query, context)}")
+        if message is not None or not self._semantic_enabled(embed_query):
+            return message
+
+        remembered = self.cache.get(f"semantic:{context}")
+        if not remembered:
+            return None
+        vector = self._query_vector(user_query, embed_query)
+        if vector is None:
+            return None
+        vectors = np.asarray([entry["vector"] for entry in remembered])
+        similarities = vectors @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_threshold:
+            return None
+        message = self.cache.get(f"exact:{remembered[best]['key']}")
+        if message is not None:
+            with self._lock:
+                self._semantic_hits += 1
+        return message
+
+    def set(self, user_query, competencies, course_titles, message, embed_query=None):
+        context = self.context_key(competencies, course_titles)
+        key = self.exact_key(user_query, context)
+        self.cache.set(f"exact:{key}", message)
+        if not self._semantic_enabled(embed_query):
+            return
+        vector = self._query_vector(user_query, embed_query)
+        if vector is None:
+            return
+        with self._lock:
+            remembered = [
+                entry
+                for entry in self.cache.get(f"semantic:{context}") or []
+                if entry["key"] != key
+            ]
+            remembered.append({"key": key, "vector": vector.tolist()})
+            self.cache.set(f"semantic:{context}", remembered[-self.max_queries :])
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        with self._lock:
+            stats["semantic_hits"] = self._semantic_hits
+        return stats
+
+    def _semantic_enabled(self, embed_query) -> bool:
+        return embed_query is not None and self.semantic_threshold > 0
+
+    def _query_vector(self, user_query, embed_query):
+        """Unit-length query embedding, or None when `embed_query` has none."""
+        query = _normalize_query(user_query)
+        vector = self._query_vectors.get(query)
+        if vector is None:
+            try:
+                vector = embed_query(query)
+            except Exception as e:
+                logger.warning(
+                    f"Could not embed query for the recommendation cache: {e}"
+                )
+                return None
+            if vector is None:
+                return None
+            vector = np.asarray(vector, dtype=np.float32).ravel()
+            vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+            self._query_vectors.set(query, vector)
+        return vector
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _sha256(payload) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_recommendation_cache = None
+_recommendation_cache_lock = threading.Lock()
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """Return the process-wide recommendation cache, creating it on first use"""
+    global _recommendation_cache
+    with _recommendation_cache_lock:
+        if _recommendation_cache is None:
+            disk = None
+            if settings.RECOMMENDATION_CACHE_PATH:
+                try:
+                    disk = SQLiteCache(
+                        settings.RECOMMENDATION_CACHE_PATH,
+                        table="recommendations",
+                        max_entries=settings.RECOMMENDATION_CACHE_DISK_MAX_ENTRIES,
+                    )
+                except Exception as e:
+                    logger.warning(f"On-disk recommendation cache unavailable: {e}")
+            _recommendation_cache = RecommendationCache(
+                TieredCache(
+                    LRUCache(
+                        maxsize=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+                        default_ttl=settings.RECOMMENDATION_CACHE_TTL,
+                    ),
+                    disk,
+                )
+            )
+    return _recommendation_cache
+
+
+def generate_course_message_with_llm(
+    search_results: dict,
+    competencies: list[Competency],
+    user_query: str,
+    llm_agent: Agent,
+    embed_query=None,
+    encoder=None,
+):
+    """Recommendation message for the search results.
+
+    With RECOMMENDATION_CACHE_ENABLED, repeated (and, given `embed_query`,
+    near-duplicate) queries over the same competencies and courses are
+    answered from the cache without calling the LLM.
+    """
+    if llm_agent is None:
+        return NO_AGENT_MESSAGE
+
+    reply, prompt, remember = prepare_recommendation(
+        search_results, competencies, user_query, embed_query, encoder
+    )
+    if reply is not None:
+        return reply
 
     try:
         result = llm_agent.run_sync(prompt)
-        return result.output
     except Exception as e:
         st.error(f"Error generating message with LLM: {e}")
-        return "Sorry, I encountered an error while trying to generate the course recommendations."
+        return LLM_ERROR_MESSAGE
+    remember(result.output)
+    return result.output
+
+
+async def astream_course_message_with_llm(
+    search_results: dict,
+    competencies: list[Competency],
+    user_query: str,
+    llm_agent: Agent,
+    embed_query=None,
+    encoder=None,
+):
+    """Yield the recommendation message as markdown chunks while it is generated.
+
+    Same replies as `generate_course_message_with_llm`, so joining the chunks
+    gives the text to store in the chat history. A cached message is yielded
+    in one piece; a streamed one is cached once it has completed. Streams on
+    the caller's event loop, so many concurrent runs (e.g. API requests)
+    don't each hold a thread; only the cache lookup and the prompt building
+    run in a worker thread.
+    """
+    if llm_agent is None:
+        yield NO_AGENT_MESSAGE
+        return
+
+    reply, prompt, remember = await asyncio.to_thread(
+        prepare_recommendation,
+        search_results,
+        competencies,
+        user_query,
+        embed_query,
+        encoder,
+    )
+    if reply is not None:
+        yield reply
+        return
+
+    chunks = []
+    try:
+        async for chunk in llm_deltas(llm_agent, prompt):
+            chunks.append(chunk)
+            yield chunk
+    except Exception as e:
+        logger.error(f"Error generating message with LLM: {e}")
+        yield f"\n\n{LLM_ERROR_MESSAGE}" if chunks else LLM_ERROR_MESSAGE
+        return
+    if chunks:
+        await asyncio.to_thread(remember, "".join(chunks))
+
+
+def prepare_recommendation(
+    search_results, competencies, user_query, embed_query=None, encoder=None
+):
+    """Return `(reply, prompt, remember)` for a recommendation request.
+
+    `reply` is the final message when no LLM call is needed (a cached answer
+    or a canned reply), otherwise None and `prompt` is set. `remember(message)`
+    caches a generated message for these inputs.
+    """
+    cache = (
+        get_recommendation_cache() if settings.RECOMMENDATION_CACHE_ENABLED else None
+    )
+    course_titles = valid_course_titles(search_results, competencies)
+
+    def remember(message):
+        if cache is not None:
+            cache.set(user_query, competencies, course_titles, message, embed_query)
+
+    # Checked first: a hit needs neither the LLM nor the course scoring
+    if cache is not None:
+        cached = cache.get(user_query, competencies, course_titles, embed_query)
+        if cached is not None:
+            return cached, None, remember
+
+    prompt, reply = build_recommendation_prompt(
+        search_results, competencies, user_query, encoder=encoder
+    )
+    return reply, prompt, remember
+
+
+async def llm_deltas(llm_agent: Agent, prompt: str):
+    """Text deltas of a streamed agent run."""
+    async with llm_agent.run_stream(prompt) as result:
+        async for delta in result.stream_text(delta=True):
+            yield delta
@@ -0,0 +1,393 @@
+"""HTTP API for competency search, course search and recommendations.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Endpoints (query parameters or a JSON body):
+    GET  /health
+    GET  /stats                       batching, coalescing and cache counters
+    GET  /competencies?query=...&top_n=3&threshold=0.4   top_n: 1..API_MAX_TOP_N
+    GET  /courses?competency=...&max_courses=5   502/503 when the search fails
+    POST /recommendations {"query": ...}
+    GET  /recommendations/stream?query=...   server-sent events
+
+Every request in a process shares one model, index and course cache (the
+`service.get_service()` singleton), so each uvicorn worker loads them once.
+Concurrent identical requests are coalesced into one execution, and
+concurrent competency searches are micro-batched into one encoder call.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sse_starlette.sse import EventSourceResponse
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import settings
+from async_scraper import AsyncCourseSearcher
+from pipeline import RecommendationPipeline
+from tools import (
+    COURSE_SEARCH_UNAVAILABLE,
+    is_error_result,
+    normalize_search_term,
+    usable_courses,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    Callers arriving while a call for their key is running await its result
+    instead of starting another. The shared call is shielded, so one caller
+    going away (e.g. a client disconnect) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        future = self._calls.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+class MicroBatcher:
+    """Groups concurrent competency searches into batched service calls.
+
+    The first query of a batch waits at most `window` seconds for others
+    with the same parameters; the batch goes out earlier once it holds
+    `max_batch` queries. Each batch is one `search_competencies_batch` call,
+    i.e. one `model.encode` over all queries that missed the caches.
+    """
+
+    def __init__(
+        self,
+        service,
+        window=settings.API_BATCH_WINDOW_MS / 1000,
+        max_batch=settings.API_MAX_BATCH_SIZE,
+    ):
+        self.service = service
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+        self._timers = {}
+        self._running = set()
+        self.batches = 0
+        self.queries = 0
+
+    async def search(self, query, top_n, similarity_threshold):
+        key = (top_n, similarity_threshold)
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((query, future))
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.window, self._flush, key
+            )
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.create_task(self._run(key, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, key, batch):
+        top_n, similarity_threshold = key
+        self.batches += 1
+        self.queries += len(batch)
+        try:
+            results = await asyncio.to_thread(
+                self.service.search_competencies_batch,
+                [query for query, _ in batch],
+                top_n=top_n,
+                similarity_threshold=similarity_threshold,
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), competencies in zip(batch, results):
+            if not future.done():
+                future.set_result(competencies)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+        }
+
+
+class CoalescingCourseSearcher(AsyncCourseSearcher):
+    """`AsyncCourseSearcher` whose concurrent searches for a term are shared."""
+
+    def __init__(self, flight: SingleFlight, **kwargs):
+        super().__init__(**kwargs)
+        self.flight = flight
+
+    async def search(self, search_term: str, max_courses=settings.MAX_COURSES) -> list:
+        key = ("courses", normalize_search_term(search_term), max_courses)
+        parent = super()
+        courses = await self.flight.do(
+            key, lambda: parent.search(search_term, max_courses)
+        )
+        return list(courses)
+
+
+@dataclasses.dataclass
+class ApiState:
+    service: object
+    llm_agent: object
+    batcher: MicroBatcher
+    flight: SingleFlight
+    searcher: CoalescingCourseSearcher
+    started_at: float
+
+    def pipeline(self, **options) -> RecommendationPipeline:
+        return RecommendationPipeline(
+            service=self.service,
+            llm_agent=self.llm_agent,
+            competency_search=self.batcher.search,
+            course_searcher=self.searcher,
+            **options,
+        )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Encoding, catalog lookups and prompt building run in worker threads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.API_THREADS, thread_name_prefix="api")
+    )
+    from agent import init_llm_agent
+    from service import get_service
+
+    service = await asyncio.to_thread(get_service)
+    flight = SingleFlight()
+    async with CoalescingCourseSearcher(flight) as searcher:
+        app.state.api = ApiState(
+            service=service,
+            llm_agent=init_llm_agent(),
+            batcher=MicroBatcher(service),
+            flight=flight,
+            searcher=searcher,
+            started_at=time.time(),
+        )
+        logger.info(f"API ready with {service.competency_count} competencies")
+        yield
+
+
+async def read_params(request) -> dict:
+    params = dict(request.query_params)
+    if request.method == "POST":
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPException(400, "Request body must be a JSON object")
+        params.update(body)
+    return params
+
+
+def text_param(params, name) -> str:
+    value = str(params.get(name) or "").strip()
+    if not value:
+        raise HTTPException(400, f"Missing '{name}'")
+    if len(value) > settings.API_MAX_QUERY_LENGTH:
+        raise HTTPException(
+            400, f"'{name}' is longer than {settings.API_MAX_QUERY_LENGTH} characters"
+        )
+    return value
+
+
+def number_param(params, name, default, cast, minimum=None, maximum=None):
+    """Numeric parameter, clamped to `[minimum, maximum]` when given."""
+    try:
+        value = cast(params.get(name, default))
+    except (TypeError, ValueError, OverflowError):
+        raise HTTPException(400, f"'{name}' must be a number")
+    if not math.isfinite(value):
+        raise HTTPException(400, f"'{name}' must be a finite number")
+    if minimum is not None:
+        value = max(value, minimum)
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+
+def competency_dicts(competencies) -> list[dict]:
+    return [dataclasses.asdict(comp) for comp in competencies]
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def stats(request):
+    state = request.app.state.api
+    from agent import get_recommendation_cache
+    from tools import get_course_breaker, get_course_cache
+
+    payload = {
+        "uptime_s": time.time() - state.started_at,
+        "batching": state.batcher.stats(),
+        "coalescing": state.flight.stats(),
+        "competency_cache": state.service.cache_stats(),
+        "course_breaker": get_course_breaker().snapshot(),
+    }
+    if settings.COURSE_CACHE_ENABLED:
+        payload["course_cache"] = get_course_cache().stats()
+    if settings.RECOMMENDATION_CACHE_ENABLED:
+        payload["recommendation_cache"] = get_recommendation_cache().stats()
+    return JSONResponse(payload)
+
+
+async def competencies(request):
+    state = request.app.state.api
+    params = await read_params(request)
+    query = text_param(params, "query")
+    top_n = number_param(
+        params, "top_n", settings.TOP_N, int, 1, settings.API_MAX_TOP_N
+    )
+    threshold = number_param(params, "threshold", settings.SIMILARITY_THRESHOLD, float)
+    found = await state.batcher.search(query, top_n, threshold)
+    return JSONResponse({"query": query, "competencies": competency_dicts(found)})
+
+
+async def courses(request):
+    state = request.app.state.api
+    params = await read_params(request)
+    competency = text_param(params, "competency")
+    max_courses = number_param(
+        params, "max_courses", settings.MAX_COURSES, int, 1, settings.API_MAX_COURSES
+    )
+
+    titles = []
+    if settings.COURSE_SOURCE == "catalog":
+        titles = await asyncio.to_thread(
+            state.service.search_courses, competency, top_n=max_courses
+        )
+    if not titles:
+        titles = await state.searcher.search(competency, max_courses)
+    if is_error_result(titles):
+        # The search failed (or the breaker is open): not an empty result
+        status = 503 if titles == [COURSE_SEARCH_UNAVAILABLE] else 502
+        return JSONResponse(
+            {"competency": competency, "error": titles[0]}, status_code=status
+        )
+    return JSONResponse({"competency": competency, "courses": usable_courses(titles)})
+
+
+async def run_recommendation(state, query) -> dict:
+    result = {"query": query, "competencies": [], "courses": {}, "message": ""}
+    async for event in state.pipeline().run(query):
+        if event.kind == "error":
+            raise RuntimeError(f"{event.stage} failed: {event.text}")
+        if event.kind == "competencies":
+            result["competencies"] = competency_dicts(event.competencies)
+        elif event.kind == "courses_done":
+            result["courses"] = event.search_results
+        elif event.kind == "done":
+            result["message"] = event.text
+    return result
+
+
+async def recommendations(request):
+    state = request.app.state.api
+    params = await read_params(request)
+    query = text_param(params, "query")
+    key = ("recommendation", " ".join(query.lower().split()))
+    try:
+        result = await state.flight.do(key, lambda: run_recommendation(state, query))
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    return JSONResponse(result)
+
+
+def event_payload(event) -> dict:
+    if event.kind == "competencies":
+        return {"competencies": competency_dicts(event.competencies)}
+    if event.kind == "courses":
+        return {
+            "competency": event.competency_name,
+            "courses": event.courses,
+            "completed": event.completed,
+            "total": event.total,
+        }
+    if event.kind == "courses_done":
+        return {
+            "courses": event.search_results,
+            "completed": event.completed,
+            "total": event.total,
+        }
+    if event.kind == "error":
+        return {"stage": event.stage, "error": event.text}
+    return {"text": event.text}
+
+
+async def recommendations_stream(request):
+    state = request.app.state.api
+    params = await read_params(request)
+    query = text_param(params, "query")
+
+    async def events():
+        # Closed by sse-starlette when the client disconnects, which cancels
+        # the run (shared course searches keep going for other requests)
+        async for event in state.pipeline().run(query):
+            yield {"event": event.kind, "data": json.dumps(event_payload(event))}
+
+    return EventSourceResponse(events())
+
+
+async def http_error(request, exc):
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health),
+        Route("/stats", stats),
+        Route("/competencies", competencies, methods=["GET", "POST"]),
+        Route("/courses", courses, methods=["GET", "POST"]),
+        Route("/recommendations", recommendations, methods=["GET", "POST"]),
+        Route(
+            "/recommendations/stream", recommendations_stream, methods=["GET", "POST"]
+        ),
+    ],
+    exception_handlers={HTTPException: http_error},
+    lifespan=lifespan,
+)
@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+import httpx
+
+import settings
+from models import Competency
+from tools import (
+    COURSE_SEARCH_UNAVAILABLE,
+    admit_search,
+    build_search_url,
+    cache_courses,
+    cached_courses,
+    courses_from_response,
+    get_coniverse_courses_selenium,
+    get_course_breaker,
+    http_client_options,
+    http_fetch_result,
+    is_error_result,
+    report_search,
+    search_retry_delays,
+    uses_http_fetch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of recent search latencies."""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float):
+        """Return the latency at `fraction` (0-1), or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(fraction * len(samples)))
+        return samples[index]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+
+# Shared so hedging thresholds are learned across searches and sessions
+latency_tracker = LatencyTracker()
+
+
+class AsyncCourseSearcher:
+    """Runs course searches on an event loop with bounded concurrency.
+
+    Each search is capped at `deadline` seconds. Once enough latency samples
+    exist, an attempt that is slower than the `hedge_percentile` latency gets
+    a second, hedged attempt, and whichever usable answer arrives first wins.
+    The losing attempt is cancelled: HTTP requests are aborted and browser
+    searches are told to stop, returning their driver to the pool.
+
+    Caching, circuit breaking, retries and the HTTP/Selenium choice are the
+    same as `tools.get_all_coniverse_courses`, built from the same helpers;
+    cache reads and writes run in a worker thread to keep the loop free.
+
+        async with AsyncCourseSearcher() as searcher:
+            courses = await searcher.search("Data Analysis")
+    """
+
+    def __init__(
+        self,
+        max_concurrency=settings.ASYNC_SEARCH_CONCURRENCY,
+        deadline=settings.COURSE_SEARCH_DEADLINE,
+        hedge=settings.HEDGE_ENABLED,
+        hedge_percentile=settings.HEDGE_PERCENTILE,
+        hedge_min_samples=settings.HEDGE_MIN_SAMPLES,
+        hedge_min_delay=settings.HEDGE_MIN_DELAY,
+        use_cache=settings.COURSE_CACHE_ENABLED,
+        tracker=latency_tracker,
+    ):
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.use_cache = use_cache
+        self.tracker = tracker
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._client = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(**http_client_options())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, or None when hedging is off."""
+        if not self.hedge or len(self.tracker) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, self.tracker.percentile(self.hedge_percentile))
+
+    async def search(self, search_term: str, max_courses=settings.MAX_COURSES) -> list:
+        if self.use_cache:
+            cached = await asyncio.to_thread(cached_courses, search_term, max_courses)
+            if cached is not None:
+                return cached
+
+        breaker = get_course_breaker()
+        courses = None
+        try:
+            # The deadline also covers queueing and backoff, but only attempts
+            # that were actually in flight report an outcome to the breaker
+            async with asyncio.timeout(self.deadline) as deadline:
+                async with self._semaphore:
+                    courses = await self._search_with_retries(
+                        breaker, search_term, max_courses, deadline
+                    )
+        except TimeoutError:
+            logger.warning(
+                f"Course search for {search_term} exceeded {self.deadline:g}s deadline"
+            )
+            # Not cached: the next search may well be admitted in time
+            return [
+                f"Error retrieving courses: search timed out after {self.deadline:g}s"
+            ]
+
+        if courses is None:
+            return [COURSE_SEARCH_UNAVAILABLE]
+
+        if self.use_cache:
+            await asyncio.to_thread(cache_courses, search_term, max_courses, courses)
+        return courses
+
+    async def _search_with_retries(self, breaker, search_term, max_courses, deadline):
+        courses = None
+        for delay in search_retry_delays():
+            if not admit_search(breaker):
+                break
+
+            started = time.monotonic()
+            try:
+                courses = await self._hedged(search_term, max_courses)
+            except asyncio.CancelledError:
+                if deadline.expired():
+                    # Cut off while in flight: a failure after the time it ran
+                    breaker.record_failure(time.monotonic() - started)
+                else:
+                    breaker.release()
+                raise
+            duration = time.monotonic() - started
+            if report_search(breaker, courses, duration):
+                if not is_error_result(courses):
+                    self.tracker.record(duration)
+                break
+            if delay is None:
+                break
+            logger.info(f"Retrying course search for {search_term} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return courses
+
+    async def iter_searches(
+        self, competencies: list[Competency], max_courses=settings.MAX_COURSES
+    ):
+        """Yield `(competency_name, courses)` as each search completes.
+
+        Closing the iterator early cancels the searches still running.
+        """
+        names = list(dict.fromkeys(comp.name for comp in competencies))
+        tasks = {
+            asyncio.create_task(self.search(name, max_courses)): name for name in names
+        }
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield tasks[task], task.result()
+        finally:
+            await _cancel_all(tasks)
+
+    async def search_many(
+        self, competencies: list[Competency], max_courses=settings.MAX_COURSES
+    ) -> dict:
+        """Return `{competency_name: [course titles]}` in competency order."""
+        results = {
+            name: courses
+            async for name, courses in self.iter_searches(competencies, max_courses)
+        }
+        return {
+            comp.name: results[comp.name]
+            for comp in competencies
+            if comp.name in results
+        }
+
+    async def _hedged(self, search_term: str, max_courses: int) -> list:
+        tasks = {asyncio.create_task(self._attempt(search_term, max_courses))}
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    logger.info(
+                        f"Search for {search_term} slower than {delay:.1f}s, sending hedged attempt"
+                    )
+                    tasks.add(
+                        asyncio.create_task(self._attempt(search_term, max_courses))
+                    )
+
+            courses = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    courses = task.result()
+                    if not is_error_result(courses):
+                        return courses
+            # Every attempt failed; report the last error
+            return courses
+        finally:
+            await _cancel_all(tasks)
+
+    async def _attempt(self, search_term: str, max_courses: int) -> list:
+        if uses_http_fetch():
+            try:
+                courses = http_fetch_result(
+                    await self._fetch_http(search_term, max_courses)
+                )
+            except httpx.HTTPError as e:
+                courses = http_fetch_result(error=e)
+            if courses is not None:
+                return courses
+
+        # The browser search runs in a worker thread, which can't be
+        # interrupted directly; the event tells it to stop at its next check.
+        cancel_event = threading.Event()
+        try:
+            return await asyncio.to_thread(
+                get_coniverse_courses_selenium, search_term, max_courses, cancel_event
+            )
+        finally:
+            cancel_event.set()
+
+    async def _fetch_http(self, search_term: str, max_courses: int) -> list:
+        url = build_search_url(search_term)
+        logger.info(f"Fetching search results over HTTP: {url}")
+        return courses_from_response(await self._client.get(url), max_courses)
+
+
+async def _cancel_all(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def get_all_coniverse_courses_async(
+    search_term: str = "", max_courses=settings.MAX_COURSES
+) -> list:
+    async with AsyncCourseSearcher() as searcher:
+        return await searcher.search(search_term, max_courses)
+
+
+async def search_courses_async(
+    competencies: list[Competency], max_courses=settings.MAX_COURSES
+) -> dict:
+    """Async counterpart of `tools.search_courses_parallel`."""
+    async with AsyncCourseSearcher() as searcher:
+        return await searcher.search_many(competencies, max_courses)
@@ -0,0 +1,93 @@
+"""Find competencies for every query in a CSV or JSONL file.
+
+python -m batch_search roster.csv -o results.jsonl             # "query" column
+python -m batch_search roster.jsonl -o results.jsonl --field goal --top-n 5
+
+Input is read and searched in chunks and each result is written as soon as
+its chunk is done, so files of any size run in constant memory. Every output
+line is the input record plus a "competencies" list.
+"""
+
+import argparse
+import csv
+import dataclasses
+import itertools
+import json
+import sys
+
+import settings
+from service import get_service
+
+
+def read_records(path):
+    """Yield input rows as dicts from a .csv or .jsonl file ("-" for stdin)."""
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def run_batch(
+    records,
+    output,
+    field="query",
+    chunk_size=256,
+    top_n=settings.TOP_N,
+    similarity_threshold=settings.SIMILARITY_THRESHOLD,
+):
+    """Search each record's `field` and write one JSON line per record."""
+    service = get_service()
+    written = 0
+    for chunk in itertools.batched(records, chunk_size):
+        queries = [str(record.get(field) or "") for record in chunk]
+        results = service.search_competencies_batch(
+            queries, top_n=top_n, similarity_threshold=similarity_threshold
+        )
+        for record, competencies in zip(chunk, results):
+            record = dict(record)
+            record["competencies"] = [dataclasses.asdict(c) for c in competencies]
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        written += len(chunk)
+        print(f"Processed {written} queries", file=sys.stderr)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL file, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file")
+    parser.add_argument("--field", default="query", help="Column holding the query")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--top-n", type=int, default=settings.TOP_N)
+    parser.add_argument(
+        "--threshold", type=float, default=settings.SIMILARITY_THRESHOLD
+    )
+    args = parser.parse_args()
+
+    output = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    try:
+        run_batch(
+            read_records(args.input),
+            output,
+            field=args.field,
+            chunk_size=args.chunk_size,
+            top_n=args.top_n,
+            similarity_threshold=args.threshold,
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolError(Exception):
+    pass
+
+
+class SearchCancelled(Exception):
+    """Raised inside a browser search when its caller no longer wants the result."""
+
+
+# How often a cancellable acquire re-checks its cancel event while waiting
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class PooledDriver:
+    driver: object
+    name: str
+    uses: int = 0
+    broken: bool = False
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class DriverPool:
+    """Keeps a fixed number of warm browser drivers and leases them out per search.
+
+    Drivers are launched in background threads, all at once, both when the
+    pool warms up and when a recycled driver is replaced; `acquire` hands out
+    whichever driver is ready first.
+
+    `factory` must return a `(driver, driver_name)` tuple (or `(None, None)` on
+    failure). `on_wedged(driver)` is called when a driver cannot be shut down
+    cleanly.
+    """
+
+    def __init__(
+        self,
+        factory,
+        size=settings.BROWSER_POOL_SIZE,
+        max_uses=settings.BROWSER_MAX_USES,
+        acquire_timeout=settings.BROWSER_ACQUIRE_TIMEOUT,
+        on_wedged=None,
+    ):
+        self._factory = factory
+        self._size = max(1, size)
+        self._max_uses = max_uses
+        self._acquire_timeout = acquire_timeout
+        self._on_wedged = on_wedged
+
+        self._cond = threading.Condition()
+        self._idle: list[PooledDriver] = []
+        # Drivers alive or being created, and how many of them are being created
+        self._total = 0
+        self._creating = 0
+        self._started = False
+        self._closed = False
+
+    @property
+    def size(self):
+        return self._size
+
+    def start(self):
+        """Start launching the configured number of drivers in the background.
+
+        Returns without waiting for them. Safe to call more than once.
+        """
+        with self._cond:
+            if self._started or self._closed:
+                return
+            self._started = True
+        logger.info(f"Warming up browser pool with {self._size} driver(s)")
+        self._spawn(self._size)
+
+    def acquire(self, timeout=None, cancel_event=None) -> PooledDriver:
+        """Lease a driver, waiting up to `timeout` seconds for one to be free.
+
+        Raises `SearchCancelled` instead once `cancel_event` is set.
+        """
+        self.start()
+        timeout = self._acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        requested = False
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise DriverPoolError("Browser driver pool is shut down")
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise SearchCancelled()
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._total < self._size:
+                        # A creation failed; retry once, then give up when
+                        # nothing else is on its way
+                        if requested and not self._creating:
+                            raise DriverPoolError("Failed to create any browser driver")
+                        requested = True
+                        self._spawn(1)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolError(
+                            "Timed out waiting for a free browser driver"
+                        )
+                    if cancel_event is not None:
+                        remaining = min(remaining, _CANCEL_POLL_INTERVAL)
+                    self._cond.wait(remaining)
+
+            if not self._is_healthy(pooled):
+                logger.warning(f"Pooled {pooled.name} driver failed health check")
+                self._discard(pooled)
+                continue
+
+            pooled.uses += 1
+            return pooled
+
+    def release(self, pooled: PooledDriver):
+        if pooled.broken or self._closed or pooled.uses >= self._max_uses:
+            reason = (
+                "broken"
+                if pooled.broken
+                else "pool closed"
+                if self._closed
+                else f"reached {pooled.uses} uses"
+            )
+            logger.info(f"Recycling pooled {pooled.name} driver ({reason})")
+            self._discard(pooled)
+            return
+
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout=None, cancel_event=None):
+        """Context manager handing out a driver; exceptions mark it as broken.
+
+        `SearchCancelled` does not: the driver goes back to the pool, so the
+        caller must leave it idle (e.g. stop the page load) before raising it.
+        """
+        pooled = self.acquire(timeout, cancel_event)
+        try:
+            yield pooled
+        except SearchCancelled:
+            raise
+        except BaseException:
+            pooled.broken = True
+            raise
+        finally:
+            self.release(pooled)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+
+        for pooled in idle:
+            self._discard(pooled)
+        logger.info("Browser pool shut down")
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "alive": self._total - self._creating,
+                "creating": self._creating,
+                "idle": len(self._idle),
+                "closed": self._closed,
+            }
+
+    def _spawn(self, count):
+        """Create up to `count` drivers in background threads, within `size`."""
+        with self._cond:
+            if self._closed:
+                return
+            count = min(count, self._size - self._total)
+            self._total += count
+            self._creating += count
+        for _ in range(count):
+            threading.Thread(
+                target=self._create_idle, name="browser-pool-create", daemon=True
+            ).start()
+
+    def _create_idle(self):
+        try:
+            pooled = self._create()
+        except DriverPoolError as e:
+            logger.error(f"Failed to create pooled driver: {e}")
+            pooled = None
+        with self._cond:
+            self._creating -= 1
+            closed = self._closed
+            if pooled is not None and not closed:
+                self._idle.append(pooled)
+            self._cond.notify_all()
+        if pooled is not None and closed:
+            self._discard(pooled)
+
+    def _create(self) -> PooledDriver:
+        try:
+            driver, driver_name = self._factory()
+        except Exception as e:
+            logger.error(f"Browser driver factory raised: {e}")
+            driver, driver_name = None, None
+
+        if not driver:
+            self._release_slot()
+            raise DriverPoolError("Failed to create any browser driver")
+
+        return PooledDriver(driver=driver, name=driver_name)
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return document.readyState;")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(
+                f"Pooled {pooled.name} driver is wedged, forcing cleanup: {e}"
+            )
+            if self._on_wedged:
+                self._on_wedged(pooled.driver)
+        finally:
+            self._release_slot()
+        # Keep the pool warm: replace the driver right away
+        if self._started:
+            self._spawn(1)
+
+    def _release_slot(self):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
@@ -0,0 +1,245 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping with optional per-entry TTLs."""
+
+    def __init__(self, maxsize=1024, default_ttl=None):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if expires_at is None and ttl is not None:
+            expires_at = time.time() + ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class SQLiteCache:
+    """Persistent JSON key/value store with per-entry expiry.
+
+    Entries beyond `max_entries` are evicted least-recently-used first.
+    """
+
+    def __init__(self, path, table="cache", max_entries=100_000):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_accessed_at "
+                f"ON {table} (accessed_at)"
+            )
+
+    def get(self, key):
+        """Return `(value, expires_at)` or None when missing or expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value), expires_at
+
+    def set(self, key, value, expires_at=None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            self._prune_locked(now)
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[
+                0
+            ]
+
+    def stats(self) -> dict:
+        return {"size": len(self), "evictions": self._evictions}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _prune_locked(self, now):
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        )
+        if self.max_entries is None:
+            return
+        overflow = (
+            self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            - self.max_entries
+        )
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self._evictions += overflow
+
+
+class TieredCache:
+    """In-memory LRU tier in front of an optional on-disk tier.
+
+    Values must be JSON-serialisable when a disk tier is configured.
+    """
+
+    def __init__(self, memory: LRUCache, disk: SQLiteCache | None = None):
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._disk_hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                self.memory.set(key, value, expires_at=expires_at)
+                with self._lock:
+                    self._disk_hits += 1
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.memory.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at=expires_at)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        memory_stats = self.memory.stats()
+        with self._lock:
+            disk_hits, misses = self._disk_hits, self._misses
+        hits = memory_stats["hits"] + disk_hits
+        lookups = hits + misses
+        stats = {
+            "hits": hits,
+            "memory_hits": memory_stats["hits"],
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_size": memory_stats["size"],
+            "memory_evictions": memory_stats["evictions"],
+        }
+        if self.disk is not None:
+            disk_stats = self.disk.stats()
+            stats["disk_size"] = disk_stats["size"]
+            stats["disk_evictions"] = disk_stats["evictions"]
+        return stats
+
+
+_MISSING = object()
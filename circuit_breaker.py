@@ -0,0 +1,185 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based circuit breaker.
+
+    The breaker looks at the last `window_size` calls. Once at least
+    `min_calls` are recorded it opens when the failure rate reaches
+    `failure_rate_threshold` or the share of calls slower than
+    `slow_call_seconds` reaches `slow_call_rate_threshold`. While open,
+    `allow_request()` returns False. After the open period it lets up to
+    `half_open_max_calls` trial calls through: a success closes the breaker,
+    a failure re-opens it for twice as long (capped at `max_open_seconds`).
+    """
+
+    def __init__(
+        self,
+        name,
+        failure_rate_threshold=settings.BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate_threshold=settings.BREAKER_SLOW_CALL_RATE,
+        window_size=settings.BREAKER_WINDOW,
+        min_calls=settings.BREAKER_MIN_CALLS,
+        open_seconds=settings.BREAKER_OPEN_SECONDS,
+        max_open_seconds=settings.BREAKER_MAX_OPEN_SECONDS,
+        half_open_max_calls=settings.BREAKER_HALF_OPEN_CALLS,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = None
+        self._current_open_seconds = open_seconds
+        self._half_open_in_flight = 0
+        self._trips = 0
+        self._rejected = 0
+        self._successes = 0
+        self._failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if (
+                self._state == HALF_OPEN
+                and self._half_open_in_flight < self.half_open_max_calls
+            ):
+                self._half_open_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def release(self):
+        """Give back an admitted call without recording an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def record_success(self, duration: float):
+        self.record(duration, success=True)
+
+    def record_failure(self, duration: float):
+        self.record(duration, success=False)
+
+    def record(self, duration: float, success: bool):
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if success:
+                self._successes += 1
+            else:
+                self._failures += 1
+
+            if self._state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if success and not slow:
+                    self._transition(CLOSED)
+                    self._current_open_seconds = self.open_seconds
+                else:
+                    self._current_open_seconds = min(
+                        self._current_open_seconds * 2, self.max_open_seconds
+                    )
+                    self._transition(OPEN)
+                return
+
+            if self._state == OPEN:
+                # A call admitted before the breaker opened finished late
+                return
+
+            self._calls.append((success, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failure_rate, slow_rate = self._rates()
+            if (
+                failure_rate >= self.failure_rate_threshold
+                or slow_rate >= self.slow_call_rate_threshold
+            ):
+                self._transition(OPEN)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            failure_rate, slow_rate = self._rates()
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(
+                    0.0, self._opened_at + self._current_open_seconds - self._clock()
+                )
+            return {
+                "name": self.name,
+                "state": self._state,
+                "failure_rate": failure_rate,
+                "slow_call_rate": slow_rate,
+                "window_calls": len(self._calls),
+                "retry_in_seconds": retry_in,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "successes": self._successes,
+                "failures": self._failures,
+            }
+
+    def _rates(self):
+        if not self._calls:
+            return 0.0, 0.0
+        failures = sum(1 for success, _ in self._calls if not success)
+        slow = sum(1 for _, is_slow in self._calls if is_slow)
+        return failures / len(self._calls), slow / len(self._calls)
+
+    def _maybe_half_open(self):
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self._current_open_seconds
+        ):
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state):
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker {self.name}: {self._state} -> {state}")
+        self._state = state
+        if state == OPEN:
+            self._opened_at = self._clock()
+            self._trips += 1
+        elif state == HALF_OPEN:
+            self._half_open_in_flight = 0
+        elif state == CLOSED:
+            self._calls.clear()
+
+
+def backoff_delays(
+    retries,
+    base_delay=settings.RETRY_BASE_DELAY,
+    max_delay=settings.RETRY_MAX_DELAY,
+):
+    """Full-jitter exponential backoff: one delay per retry."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(max_delay, base_delay * 2**attempt))
@@ -0,0 +1,130 @@
+"""Build the offline course catalog used by `vector_db.search_courses`.
+
+python -m course_catalog build                 # scrape every competency
+python -m course_catalog build --only-missing  # scrape only new competencies
+python -m course_catalog import courses.csv    # import competency,title rows
+"""
+
+import argparse
+
+import pandas as pd
+
+import settings
+from encoders import load_encoder
+from models import Competency
+from tools import is_error_result, iter_course_searches, usable_courses
+from vector_db import (
+    load_competency_data,
+    load_course_catalog,
+    save_course_catalog,
+)
+
+
+def _write_catalog(model, existing_df, new_rows, replaced_competencies, output_path):
+    new_df = pd.DataFrame(new_rows, columns=["competency", "title"])
+    if existing_df is not None:
+        kept = existing_df[~existing_df["competency"].isin(replaced_competencies)]
+        catalog_df = pd.concat([kept, new_df], ignore_index=True)
+    else:
+        catalog_df = new_df
+    catalog_df = catalog_df.drop_duplicates(ignore_index=True)
+
+    print(f"Encoding {len(catalog_df)} course titles with {settings.MODEL_NAME}")
+    embeddings = model.encode(catalog_df["title"].tolist(), show_progress_bar=True)
+    save_course_catalog(catalog_df, embeddings, output_path)
+    print(f"Saved course catalog with {len(catalog_df)} courses to {output_path}")
+    return len(catalog_df)
+
+
+def build_catalog(
+    model,
+    competency_path=settings.COMPETENCY_DATA_PATH,
+    output_path=settings.COURSE_CATALOG_PATH,
+    max_courses=settings.MAX_COURSES,
+    max_workers=settings.COURSE_SEARCH_WORKERS,
+    only_missing=False,
+):
+    """Scrape courses for each competency in the CSV and store them with embeddings."""
+    competencies_df = load_competency_data(competency_path)
+    existing_df, _, _ = load_course_catalog(output_path)
+
+    names = list(dict.fromkeys(competencies_df["competency"]))
+    if only_missing and existing_df is not None:
+        known = set(existing_df["competency"])
+        names = [name for name in names if name not in known]
+    print(f"Scraping courses for {len(names)} competencies")
+
+    rows = []
+    scraped = []
+    competencies = [
+        Competency(name=name, description="", similarity_score=1.0) for name in names
+    ]
+    for done, (name, courses) in enumerate(
+        iter_course_searches(competencies, max_courses, max_workers, use_cache=False),
+        start=1,
+    ):
+        titles = usable_courses(courses)
+        if is_error_result(courses):
+            # Keep whatever the previous build had for this competency
+            print(f"[{done}/{len(names)}] {name}: {courses[0]}")
+            continue
+        scraped.append(name)
+        rows.extend((name, title) for title in titles)
+        print(f"[{done}/{len(names)}] {name}: {len(titles)} courses")
+
+    return _write_catalog(model, existing_df, rows, scraped, output_path)
+
+
+def import_catalog(model, csv_path, output_path=settings.COURSE_CATALOG_PATH):
+    """Merge `competency,title` rows from a CSV file into the catalog."""
+    imported_df = pd.read_csv(csv_path)
+    imported_df.columns = [col.strip().lower() for col in imported_df.columns]
+    imported_df = imported_df.dropna(subset=["competency", "title"])
+    rows = list(
+        zip(imported_df["competency"].str.strip(), imported_df["title"].str.strip())
+    )
+    existing_df, _, _ = load_course_catalog(output_path)
+    replaced = set(competency for competency, _ in rows)
+    return _write_catalog(model, existing_df, rows, replaced, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=settings.COURSE_CATALOG_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Scrape courses per competency")
+    build_parser.add_argument("--competencies", default=settings.COMPETENCY_DATA_PATH)
+    build_parser.add_argument("--max-courses", type=int, default=settings.MAX_COURSES)
+    build_parser.add_argument(
+        "--workers", type=int, default=settings.COURSE_SEARCH_WORKERS
+    )
+    build_parser.add_argument(
+        "--only-missing",
+        action="store_true",
+        help="Skip competencies that already have catalog entries",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import", help="Import competency,title rows from a CSV file"
+    )
+    import_parser.add_argument("csv_path")
+
+    args = parser.parse_args()
+
+    model = load_encoder()
+    if args.command == "build":
+        build_catalog(
+            model,
+            competency_path=args.competencies,
+            output_path=args.output,
+            max_courses=args.max_courses,
+            max_workers=args.workers,
+            only_missing=args.only_missing,
+        )
+    else:
+        import_catalog(model, args.csv_path, output_path=args.output)
+
+
+if __name__ == "__main__":
+    main()
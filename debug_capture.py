@@ -0,0 +1,176 @@
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "coniverse_"
+
+
+@dataclass
+class _CaptureJob:
+    name: str
+    screenshot: bytes | None
+    page_source: str | None
+
+
+class DebugCapture:
+    """Saves scraper screenshots and page sources off the request path.
+
+    Successful searches are captured with probability `sample_rate`; failed
+    ones always are when `on_error` is set. Artifacts are written by a
+    background thread, and the oldest files are deleted once the directory
+    holds more than `max_files` files or `max_bytes` bytes.
+    """
+
+    def __init__(
+        self,
+        directory=settings.DEBUG_CAPTURE_DIR,
+        sample_rate=settings.DEBUG_CAPTURE_SAMPLE_RATE,
+        on_error=settings.DEBUG_CAPTURE_ON_ERROR,
+        queue_size=settings.DEBUG_CAPTURE_QUEUE_SIZE,
+        max_files=settings.DEBUG_CAPTURE_MAX_FILES,
+        max_bytes=settings.DEBUG_CAPTURE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.on_error = on_error
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._captured = 0
+        self._dropped = 0
+        self._deleted = 0
+
+    def should_capture(self, error=False) -> bool:
+        if error and self.on_error:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def capture(self, driver, label: str, error=False) -> bool:
+        """Snapshot the driver's current page if sampling selects it.
+
+        Only the WebDriver calls happen on the caller's thread; disk I/O is
+        queued. Returns True if a capture was queued.
+        """
+        if not self.should_capture(error):
+            return False
+
+        try:
+            screenshot = driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.warning(f"Failed to take debug screenshot: {e}")
+            screenshot = None
+        try:
+            page_source = driver.page_source
+        except Exception as e:
+            logger.warning(f"Failed to read page source: {e}")
+            page_source = None
+        if screenshot is None and page_source is None:
+            return False
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:60] or "search"
+        status = "error" if error else "sample"
+        name = f"{FILE_PREFIX}{int(time.time() * 1000)}_{status}_{slug}"
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(_CaptureJob(name, screenshot, page_source))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Debug capture queue is full, dropping capture")
+            return False
+        return True
+
+    def flush(self, timeout=None):
+        """Block until queued captures are written (mainly for scripts)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "captured": self._captured,
+                "dropped": self._dropped,
+                "deleted": self._deleted,
+                "queued": self._queue.qsize(),
+            }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="debug-capture", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(job)
+                self._enforce_retention()
+            except Exception as e:
+                logger.warning(f"Failed to write debug capture {job.name}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job: _CaptureJob):
+        os.makedirs(self.directory, exist_ok=True)
+        if job.screenshot is not None:
+            with open(os.path.join(self.directory, f"{job.name}.png"), "wb") as f:
+                f.write(job.screenshot)
+        if job.page_source is not None:
+            with open(
+                os.path.join(self.directory, f"{job.name}.html"), "w", encoding="utf-8"
+            ) as f:
+                f.write(job.page_source)
+        with self._lock:
+            self._captured += 1
+        logger.info(f"Debug capture saved to {self.directory}/{job.name}.*")
+
+    def _enforce_retention(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.startswith(FILE_PREFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        total_bytes = sum(size for _, size, _ in files)
+        while files and (len(files) > self.max_files or total_bytes > self.max_bytes):
+            _, size, path = files.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            with self._lock:
+                self._deleted += 1
+
+
+_debug_capture = None
+_debug_capture_lock = threading.Lock()
+
+
+def get_debug_capture() -> DebugCapture:
+    global _debug_capture
+    with _debug_capture_lock:
+        if _debug_capture is None:
+            _debug_capture = DebugCapture()
+    return _debug_capture
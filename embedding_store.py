@@ -0,0 +1,109 @@
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+
+import settings
+from encoders import encoder_id
+
+
+class EmbeddingStore:
+    """On-disk float32 embedding matrix keyed by a hash of model name and text.
+
+    The matrix is saved as a plain `.npy` file so it can be memory-mapped on
+    load, next to a `.keys.npy` file holding one hex digest per row. Only
+    texts whose digest is not in the store are passed to `encode_fn`; the
+    files are rewritten to mirror the latest corpus whenever anything
+    changed.
+    """
+
+    def __init__(self, name, model_name=None, directory=None):
+        model_name = model_name or encoder_id()
+        directory = directory or settings.EMBEDDING_CACHE_DIR
+        model_slug = re.sub(r"[^A-Za-z0-9]+", "-", model_name).strip("-")
+        self.model_name = model_name
+        self.vectors_path = os.path.join(directory, f"{name}-{model_slug}.npy")
+        self.keys_path = os.path.join(directory, f"{name}-{model_slug}.keys.npy")
+        self._lock = threading.Lock()
+
+    def text_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def load(self):
+        """Return `(keys, vectors)` with vectors memory-mapped, or `(None, None)`."""
+        try:
+            keys = np.load(self.keys_path)
+            vectors = np.load(self.vectors_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None, None
+        if len(keys) != len(vectors):
+            return None, None
+        return keys, vectors
+
+    def get_or_encode(self, texts: list, encode_fn) -> np.ndarray:
+        """Return one embedding row per text, encoding only unseen texts.
+
+        `encode_fn` receives a list of texts and must return a 2D array.
+        """
+        if not texts:
+            return np.asarray(encode_fn([]), dtype=np.float32)
+
+        with self._lock:
+            keys = np.array([self.text_key(text) for text in texts], dtype="S64")
+            stored_keys, stored_vectors = self.load()
+
+            if stored_keys is not None and np.array_equal(stored_keys, keys):
+                print(f"Loaded {len(keys)} embeddings from {self.vectors_path}")
+                return stored_vectors
+
+            row_by_key = (
+                {key: row for row, key in enumerate(stored_keys)}
+                if stored_keys is not None
+                else {}
+            )
+            missing = {}
+            for i, key in enumerate(keys):
+                if key not in row_by_key and key not in missing:
+                    missing[key] = i
+
+            new_vectors = None
+            if missing:
+                print(
+                    f"Encoding {len(missing)} new or changed texts "
+                    f"({len(texts) - len(missing)} reused from {self.vectors_path})"
+                )
+                new_vectors = np.asarray(
+                    encode_fn([texts[i] for i in missing.values()]), dtype=np.float32
+                )
+
+            dim = (
+                new_vectors.shape[1]
+                if new_vectors is not None
+                else stored_vectors.shape[1]
+            )
+            vectors = np.empty((len(texts), dim), dtype=np.float32)
+            stored_rows = np.array([row_by_key.get(key, -1) for key in keys])
+            reused = stored_rows >= 0
+            if reused.any():
+                vectors[reused] = stored_vectors[stored_rows[reused]]
+            if new_vectors is not None:
+                new_row_by_key = {key: row for row, key in enumerate(missing)}
+                vectors[~reused] = new_vectors[
+                    [new_row_by_key[key] for key in keys[~reused]]
+                ]
+
+            self._save(keys, vectors)
+            return vectors
+
+    def _save(self, keys, vectors):
+        directory = os.path.dirname(os.path.abspath(self.vectors_path))
+        os.makedirs(directory, exist_ok=True)
+        # np.save appends ".npy" to names without it, so keep the suffix last
+        tmp_vectors = f"{self.vectors_path[:-4]}.tmp.npy"
+        tmp_keys = f"{self.keys_path[:-4]}.tmp.npy"
+        np.save(tmp_vectors, vectors)
+        np.save(tmp_keys, keys)
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_keys, self.keys_path)
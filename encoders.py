@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+
+import settings
+
+
+def encoder_id(backend=None) -> str:
+    """Identifier for the vectors an encoder produces.
+
+    Quantised ONNX vectors differ slightly from torch ones, so cached
+    embeddings are keyed by this rather than by the model name alone.
+    """
+    backend = backend or settings.ENCODER_BACKEND
+    if backend == "onnx":
+        variant = os.path.splitext(settings.ONNX_MODEL_FILE)[0]
+        return f"{settings.MODEL_NAME}-onnx-{variant}"
+    return settings.MODEL_NAME
+
+
+def load_encoder(backend=None):
+    """Return an object with `encode` and `get_sentence_embedding_dimension`."""
+    backend = backend or settings.ENCODER_BACKEND
+    if backend == "onnx":
+        return OnnxEncoder(settings.ONNX_MODEL_DIR, settings.ONNX_MODEL_FILE)
+    if backend == "torch":
+        # Imported here so the ONNX backend never loads torch
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(settings.MODEL_NAME)
+    raise ValueError(f"Unknown encoder backend: {backend}")
+
+
+class OnnxEncoder:
+    """Sentence encoder running an ONNX export with onnxruntime on CPU.
+
+    Reproduces the sentence-transformers pipeline for mean-pooling models:
+    tokenize, run the transformer, average token embeddings over the
+    attention mask and optionally L2-normalise. The directory must hold the
+    ONNX file, `tokenizer.json` and the `encoder_config.json` written by
+    `scripts/export_onnx.py`.
+    """
+
+    def __init__(self, model_dir, model_file=settings.ONNX_MODEL_FILE):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, "encoder_config.json")) as f:
+            config = json.load(f)
+        self.dimension = config["dimension"]
+        self.normalize = config["normalize"]
+        self.max_seq_length = config["max_seq_length"]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=config.get("pad_token_id", 0))
+
+        options = onnxruntime.SessionOptions()
+        if settings.ONNX_THREADS:
+            options.intra_op_num_threads = settings.ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {
+            model_input.name for model_input in self.session.get_inputs()
+        }
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(
+        self,
+        sentences,
+        batch_size=32,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        **kwargs,
+    ):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        batches = [
+            self._encode_batch(texts[start : start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        ]
+        embeddings = np.concatenate(batches)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(
+            mask.sum(axis=1), 1e-9, None
+        )
+        if self.normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings.astype(np.float32)
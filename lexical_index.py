@@ -0,0 +1,146 @@
+import math
+import re
+
+import numpy as np
+
+from models import Competency
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+
+# Common English words that say nothing about which competency is meant
+STOPWORDS = frozenset(
+    """
+    a about after all also an and any are as at be been but by can do for
+    from has have how i in into is it its me more my no not of on or our
+    so some than that the their them then there these they this to up us
+    was we what when which who will with you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; keeps "c++" and "c#" intact."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """In-memory BM25 inverted index over competency names and descriptions.
+
+    Postings are stored as numpy arrays per term, so a query only touches
+    the documents that contain one of its terms.
+    """
+
+    def __init__(self, names, descriptions, k1=1.5, b=0.75):
+        self.names = list(names)
+        self.descriptions = list(descriptions)
+        self.k1 = k1
+        self.b = b
+
+        term_counts = {}
+        lengths = []
+        for row, (name, description) in enumerate(zip(self.names, self.descriptions)):
+            tokens = tokenize(f"{name} {description}")
+            lengths.append(len(tokens))
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term_counts.setdefault(token, []).append((row, count))
+
+        self.doc_lengths = np.array(lengths, dtype=np.float32)
+        average_length = self.doc_lengths.mean() if lengths else 0.0
+        self._length_norm = (
+            1 - b + b * self.doc_lengths / average_length
+            if average_length
+            else np.ones_like(self.doc_lengths)
+        )
+        total = len(self.names)
+        self.postings = {}
+        self.idf = {}
+        for token, entries in term_counts.items():
+            rows, counts = zip(*entries)
+            self.postings[token] = (
+                np.array(rows, dtype=np.int64),
+                np.array(counts, dtype=np.float32),
+            )
+            self.idf[token] = math.log(
+                1 + (total - len(entries) + 0.5) / (len(entries) + 0.5)
+            )
+
+    def __len__(self):
+        return len(self.names)
+
+    def covers(self, query: str, max_docs: int | None = None) -> bool:
+        """True when every query term is a selective word of the corpus.
+
+        Each term must occur somewhere in the corpus, not be a stopword and,
+        given `max_docs`, appear in at most that many documents.
+        """
+        tokens = tokenize(query)
+        return bool(tokens) and all(
+            token not in STOPWORDS
+            and token in self.postings
+            and (max_docs is None or len(self.postings[token][0]) <= max_docs)
+            for token in tokens
+        )
+
+    def search(self, query: str, top_n: int) -> list[tuple[int, float]]:
+        """Return `(row, score)` pairs with a positive score, best first."""
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            rows, counts = posting
+            scores[rows] += (
+                self.idf[token]
+                * counts
+                * (self.k1 + 1)
+                / (counts + self.k1 * self._length_norm[rows])
+            )
+
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > top_n:
+            matched = matched[np.argpartition(-scores[matched], top_n - 1)[:top_n]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(row), float(scores[row])) for row in matched]
+
+    def competencies(self, hits) -> list[Competency]:
+        return [
+            Competency(
+                name=self.names[row],
+                description=self.descriptions[row],
+                similarity_score=score,
+            )
+            for row, score in hits
+        ]
+
+
+def reciprocal_rank_fusion(ranked_lists, top_n, k=60) -> list[Competency]:
+    """Fuse ranked Competency lists with reciprocal rank fusion.
+
+    Each competency scores sum(1 / (k + rank)) over the lists it appears
+    in. The score is divided by the best possible score (rank 1 in every
+    list, empty ones included), so it falls in (0, 1] like a cosine
+    similarity and only reaches 1 when all rankings agree on the top hit.
+    """
+    best_possible = len(ranked_lists) / (k + 1)
+    ranked_lists = [ranked for ranked in ranked_lists if ranked]
+    if not ranked_lists:
+        return []
+
+    fused = {}
+    for ranked in ranked_lists:
+        for rank, comp in enumerate(ranked, start=1):
+            score, first_seen = fused.get(comp.name, (0.0, comp))
+            fused[comp.name] = (score + 1 / (k + rank), first_seen)
+
+    ordered = sorted(fused.values(), key=lambda item: item[0], reverse=True)
+    return [
+        Competency(
+            name=comp.name,
+            description=comp.description,
+            similarity_score=score / best_possible,
+        )
+        for score, comp in ordered[:top_n]
+    ]
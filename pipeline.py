@@ -0,0 +1,320 @@
+"""Recommendation pipeline usable without the Streamlit UI.
+
+    python -m pipeline "I want to get better at data analysis"
+
+`RecommendationPipeline.run` drives competency retrieval, course search and
+LLM generation for one query as an async stream of `PipelineEvent`s;
+`iter_pipeline_events` offers the same stream to synchronous callers.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import queue
+import sys
+import threading
+from dataclasses import dataclass, field
+
+import settings
+from agent import astream_course_message_with_llm
+from models import Competency
+from tools import usable_courses
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineEvent:
+    """One step of a pipeline run.
+
+    kind is one of:
+      "competencies"  retrieval finished (`competencies`, `total`)
+      "courses"       courses for one competency (`competency_name`,
+                      `courses`, `completed` of `total`)
+      "courses_done"  course search finished or stopped early
+                      (`search_results`, `completed` of `total`)
+      "delta"         a chunk of the recommendation message (`text`)
+      "done"          the run finished (`text` holds the full message, empty
+                      when no message was generated)
+      "error"         a stage failed (`stage`, `text`); the run ends
+    """
+
+    kind: str
+    competencies: list[Competency] = field(default_factory=list)
+    competency_name: str = ""
+    courses: list[str] = field(default_factory=list)
+    search_results: dict = field(default_factory=dict)
+    completed: int = 0
+    total: int = 0
+    text: str = ""
+    stage: str = ""
+
+
+class RecommendationPipeline:
+    """Retrieval -> course search -> generation, with overlap between stages.
+
+    Course searches run concurrently and stop early once `enough_courses`
+    usable titles were found, or `course_wait` seconds after the first ones
+    arrived; generation then starts on whatever results are ready. While
+    searches are still running, the titles that already arrived are embedded
+    for the prompt builder's relevance filter. Without an `llm_agent` the run
+    ends after the course search.
+
+    Long-running callers can share work between runs: `competency_search` is
+    an async `(query, top_n, similarity_threshold)` callable used instead of
+    the service's blocking search, and `course_searcher` an already entered
+    `AsyncCourseSearcher` used instead of one per run.
+    """
+
+    def __init__(
+        self,
+        service=None,
+        llm_agent=None,
+        top_n=settings.TOP_N,
+        similarity_threshold=settings.SIMILARITY_THRESHOLD,
+        max_courses=settings.MAX_COURSES,
+        enough_courses=settings.PIPELINE_ENOUGH_COURSES,
+        course_wait=settings.PIPELINE_COURSE_WAIT,
+        competency_search=None,
+        course_searcher=None,
+    ):
+        if service is None:
+            from service import get_service
+
+            service = get_service()
+        self.service = service
+        self.llm_agent = llm_agent
+        self.top_n = top_n
+        self.similarity_threshold = similarity_threshold
+        self.max_courses = max_courses
+        self.enough_courses = enough_courses
+        self.course_wait = course_wait
+        self.competency_search = competency_search or self._search_competencies
+        self.course_searcher = course_searcher
+
+    async def run(self, query: str):
+        """Yield the `PipelineEvent`s of one query; closing it cancels the run."""
+        try:
+            competencies = await self.competency_search(
+                query, self.top_n, self.similarity_threshold
+            )
+        except Exception as e:
+            logger.error(f"Competency search failed: {e}")
+            yield PipelineEvent("error", stage="competencies", text=str(e))
+            return
+        total = len(competencies)
+        yield PipelineEvent("competencies", competencies=competencies, total=total)
+        if not competencies:
+            yield PipelineEvent("done")
+            return
+
+        found = {}
+        warmups = []
+        try:
+            async for name, courses in self._search_courses(competencies):
+                found[name] = courses
+                yield PipelineEvent(
+                    "courses",
+                    competency_name=name,
+                    courses=courses,
+                    completed=len(found),
+                    total=total,
+                )
+                titles = usable_courses(courses)
+                if titles and self._filters_prompt():
+                    warmups.append(asyncio.create_task(self._embed_titles(titles)))
+
+            search_results = {
+                comp.name: found[comp.name]
+                for comp in competencies
+                if comp.name in found
+            }
+            yield PipelineEvent(
+                "courses_done",
+                search_results=search_results,
+                completed=len(found),
+                total=total,
+            )
+            if self.llm_agent is None:
+                yield PipelineEvent("done")
+                return
+
+            await asyncio.gather(*warmups)
+            chunks = []
+            async for chunk in astream_course_message_with_llm(
+                search_results,
+                competencies,
+                query,
+                self.llm_agent,
+                embed_query=self.service.cached_query_vector,
+                encoder=self.service.model,
+            ):
+                chunks.append(chunk)
+                yield PipelineEvent("delta", text=chunk)
+            yield PipelineEvent("done", text="".join(chunks))
+        finally:
+            for task in warmups:
+                task.cancel()
+
+    async def _search_competencies(self, query, top_n, similarity_threshold):
+        return await asyncio.to_thread(
+            self.service.search_competencies,
+            query,
+            top_n=top_n,
+            similarity_threshold=similarity_threshold,
+        )
+
+    async def _search_courses(self, competencies):
+        """Yield `(competency_name, courses)`: catalog first, then live searches."""
+        found = 0
+        live = []
+        for comp in competencies:
+            if settings.COURSE_SOURCE == "catalog":
+                courses = await asyncio.to_thread(
+                    self.service.search_courses, comp.name, top_n=self.max_courses
+                )
+                if courses:
+                    yield comp.name, courses
+                    found += len(usable_courses(courses))
+                    continue
+            live.append(comp)
+        if not live or self._enough(found):
+            return
+
+        from async_scraper import AsyncCourseSearcher
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.course_wait if found else None
+        if self.course_searcher is not None:
+            searcher_context = contextlib.nullcontext(self.course_searcher)
+        else:
+            searcher_context = AsyncCourseSearcher()
+        async with searcher_context as searcher:
+            searches = searcher.iter_searches(live, self.max_courses)
+            try:
+                while True:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            name, courses = await anext(searches)
+                    except StopAsyncIteration:
+                        return
+                    except TimeoutError:
+                        logger.info(
+                            f"Generating after waiting {self.course_wait:g}s for more courses"
+                        )
+                        return
+                    yield name, courses
+                    usable = len(usable_courses(courses))
+                    found += usable
+                    if self._enough(found):
+                        logger.info(f"Found {found} courses, stopping course search")
+                        return
+                    if usable and deadline is None:
+                        deadline = loop.time() + self.course_wait
+            finally:
+                # Cancels the searches still running
+                await searches.aclose()
+
+    def _enough(self, found: int) -> bool:
+        return self.enough_courses > 0 and found >= self.enough_courses
+
+    def _filters_prompt(self) -> bool:
+        return self.llm_agent is not None and settings.PROMPT_FILTER_ENABLED
+
+    async def _embed_titles(self, titles):
+        from prompt_builder import encode_titles
+
+        try:
+            await asyncio.to_thread(encode_titles, self.service.model, titles)
+        except Exception as e:
+            # The prompt builder encodes them again (and handles failures)
+            logger.warning(f"Could not embed course titles ahead of time: {e}")
+
+
+def iter_pipeline_events(query: str, **pipeline_options):
+    """Synchronous iterator over the events of a pipeline run.
+
+    The run happens on its own event loop in a worker thread, so Streamlit
+    scripts and other synchronous callers can consume it like a plain
+    generator. Closing the iterator cancels the run.
+    """
+    events = queue.Queue()
+    finished = object()
+    started = threading.Event()
+    state = {}
+
+    async def produce():
+        state["loop"] = asyncio.get_running_loop()
+        state["task"] = asyncio.current_task()
+        started.set()
+        pipeline = RecommendationPipeline(**pipeline_options)
+        async for event in pipeline.run(query):
+            events.put(event)
+
+    def run():
+        try:
+            asyncio.run(produce())
+            events.put(finished)
+        except BaseException as e:
+            events.put(e)
+        finally:
+            started.set()
+
+    threading.Thread(target=run, name="recommendation-pipeline", daemon=True).start()
+    try:
+        while True:
+            item = events.get()
+            if item is finished:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        started.wait()
+        if "task" in state:
+            try:
+                state["loop"].call_soon_threadsafe(state["task"].cancel)
+            except RuntimeError:
+                # The run already finished and its loop is closed
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend courses for a query")
+    parser.add_argument("query")
+    parser.add_argument(
+        "--no-llm", action="store_true", help="Stop after the course search"
+    )
+    args = parser.parse_args()
+
+    llm_agent = None
+    if not args.no_llm:
+        from agent import init_llm_agent
+
+        llm_agent = init_llm_agent()
+
+    for event in iter_pipeline_events(args.query, llm_agent=llm_agent):
+        if event.kind == "competencies":
+            names = ", ".join(comp.name for comp in event.competencies) or "none"
+            print(f"Competencies: {names}", file=sys.stderr)
+        elif event.kind == "courses":
+            print(
+                f"[{event.completed}/{event.total}] {event.competency_name}: "
+                f"{len(usable_courses(event.courses))} course(s)",
+                file=sys.stderr,
+            )
+        elif event.kind == "courses_done" and args.no_llm:
+            for name, courses in event.search_results.items():
+                print(f"\n{name}:")
+                for course in usable_courses(courses):
+                    print(f"  - {course}")
+        elif event.kind == "delta":
+            print(event.text, end="", flush=True)
+        elif event.kind == "error":
+            raise SystemExit(f"{event.stage} failed: {event.text}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
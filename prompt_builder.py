@@ -0,0 +1,170 @@
+import re
+
+import numpy as np
+
+import settings
+from caching import LRUCache
+from models import Competency
+
+NO_RELEVANT_COURSES_MESSAGE = "I found some competencies related to your interest, but couldn't find specific courses that are directly relevant at this time. Would you like to try a different search with more specific keywords?"
+
+INSTRUCTIONS = """You are a helpful Learning Path Assistant. Recommend courses to a user based on their interest, the relevant competencies and the course titles found for each competency. The courses are already filtered for relevance and listed best first.
+
+Format the response in Markdown:
+- Start with a short welcoming introduction like "Here are some course recommendations based on your interests:".
+- For each competency with courses, add a heading "## Courses for [Competency Name]".
+- List its courses as bold titles (**Course Title**), each followed by one italic sentence on how it relates to the competency and to the user's interest.
+- Only use the competencies and courses given below.
+- End by asking whether the user wants to explore a competency in more detail or search for something else.
+"""
+
+_title_vectors = LRUCache(maxsize=settings.PROMPT_TITLE_CACHE_SIZE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"\w+", title.lower()))
+
+
+def _unit(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.clip(
+        np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12, None
+    )
+
+
+def encode_titles(model, titles):
+    """Title embeddings; titles recur across queries, so they are cached."""
+    vectors = {}
+    for title in titles:
+        vector = _title_vectors.get(title)
+        if vector is not None:
+            vectors[title] = vector
+    missing = [title for title in titles if title not in vectors]
+    if missing:
+        for title, vector in zip(missing, _unit(model.encode(missing))):
+            _title_vectors.set(title, vector)
+            vectors[title] = vector
+    return np.stack([vectors[title] for title in titles])
+
+
+def score_courses(
+    model,
+    user_query: str,
+    competencies: list[Competency],
+    course_titles: dict[str, list[str]],
+    min_score=settings.PROMPT_COURSE_MIN_SCORE,
+    query_weight=settings.PROMPT_QUERY_WEIGHT,
+    dedupe_threshold=settings.PROMPT_DEDUPE_THRESHOLD,
+) -> dict[str, list[tuple[str, float]]]:
+    """Relevant course titles per competency as `(title, score)`, best first.
+
+    A title's score blends its cosine similarity to the user query and to its
+    competency. Titles scoring below `min_score` are dropped, and so are
+    duplicates: the same title under several competencies, or titles at
+    least `dedupe_threshold` similar to a better-scoring one, are kept only
+    where they score highest. Competencies left without titles are omitted.
+    """
+    descriptions = {comp.name: comp.description for comp in competencies}
+    entries = [
+        (name, title)
+        for name, titles in course_titles.items()
+        for title in dict.fromkeys(titles)
+    ]
+    if not entries:
+        return {}
+
+    anchors = _unit(
+        model.encode(
+            [user_query]
+            + [f"{name}. {descriptions.get(name, '')}" for name in course_titles]
+        )
+    )
+    query_vector, competency_vectors = anchors[0], dict(zip(course_titles, anchors[1:]))
+    titles = list(dict.fromkeys(title for _, title in entries))
+    title_vectors = dict(zip(titles, encode_titles(model, titles)))
+
+    scored = sorted(
+        (
+            (
+                query_weight * float(title_vectors[title] @ query_vector)
+                + (1 - query_weight)
+                * float(title_vectors[title] @ competency_vectors[name]),
+                name,
+                title,
+            )
+            for name, title in entries
+        ),
+        reverse=True,
+    )
+
+    kept = {}
+    kept_vectors = []
+    seen = set()
+    for score, name, title in scored:
+        if score < min_score:
+            break
+        key = _normalize_title(title)
+        if key in seen:
+            continue
+        vector = title_vectors[title]
+        if (
+            kept_vectors
+            and max(float(v @ vector) for v in kept_vectors) >= dedupe_threshold
+        ):
+            continue
+        seen.add(key)
+        kept_vectors.append(vector)
+        kept.setdefault(name, []).append((title, score))
+    # Keep the competency order of the search results
+    return {name: kept[name] for name in course_titles if name in kept}
+
+
+def build_prompt(
+    user_query: str,
+    competencies: list[Competency],
+    scored_courses: dict[str, list[tuple[str, float]]],
+    token_budget=settings.PROMPT_TOKEN_BUDGET,
+) -> str:
+    """Prompt listing the best courses that fit into `token_budget` tokens.
+
+    Courses are admitted in rank order, round-robin across competencies, so
+    each competency keeps its best titles when the budget is tight. The
+    instructions, query and competency descriptions are always included.
+    """
+    described = [comp for comp in competencies if comp.name in scored_courses]
+    header = (
+        f"{INSTRUCTIONS}\n"
+        f'User interest: "{user_query}"\n\n'
+        "Competencies:\n"
+        + "".join(f"- {comp.name}: {comp.description}\n" for comp in described)
+        + "\nCourses (competency -> titles, best first):\n"
+    )
+    used = estimate_tokens(header)
+
+    ranked = [
+        (rank, name, title)
+        for name, courses in scored_courses.items()
+        for rank, (title, _) in enumerate(courses)
+    ]
+    chosen = {}
+    for rank, name, title in sorted(ranked, key=lambda item: item[0]):
+        cost = estimate_tokens(f"  - {title}\n")
+        if name not in chosen:
+            cost += estimate_tokens(f"- {name}:\n")
+        # The first course always fits, so the prompt is never empty
+        if chosen and used + cost > token_budget:
+            break
+        chosen.setdefault(name, []).append(title)
+        used += cost
+
+    body = "".join(
+        f"- {name}:\n" + "".join(f"  - {title}\n" for title in chosen[name])
+        for name in scored_courses
+        if name in chosen
+    )
+    return header + body
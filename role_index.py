@@ -0,0 +1,267 @@
+"""Precomputed role -> competency lookup built from the roles CSV.
+
+python -m role_index build                 # (re)build the lookup table
+python -m role_index match "data engineer" # show what a query resolves to
+
+Each role is embedded as "role. description" and its closest competencies
+are stored once, so a query naming a known role needs no encoding or vector
+search at all.
+"""
+
+import argparse
+import difflib
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import settings
+from embedding_store import EmbeddingStore
+from encoders import encoder_id, load_encoder
+from models import Competency
+from search_backends import NumpySearchBackend
+from vector_db import encode_corpus, load_competency_data, normalize_query
+
+
+def load_role_data(file_path=settings.ROLE_DATA_PATH):
+    df = pd.read_csv(file_path)
+    df.columns = [col.strip().lower() for col in df.columns]
+    df = df.dropna(subset=["role", "description"])
+    df["role"] = df["role"].str.strip()
+    df["description"] = df["description"].str.strip()
+    return df
+
+
+def _texts(df, name_column):
+    return (df[name_column] + ". " + df["description"]).tolist()
+
+
+def role_index_fingerprint(role_df, competency_df, model_name, top_k) -> str:
+    """Hash of everything the table depends on; a mismatch means rebuild."""
+    digest = hashlib.sha256(f"{model_name}\0{top_k}".encode("utf-8"))
+    for text in _texts(role_df, "role") + ["\0"] + _texts(competency_df, "competency"):
+        digest.update(text.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class RoleIndex:
+    """Role names and the top competency rows/scores precomputed for each."""
+
+    def __init__(
+        self,
+        roles,
+        competency_names,
+        competency_descriptions,
+        rows,
+        scores,
+        fingerprint,
+        match_cutoff=settings.ROLE_MATCH_CUTOFF,
+    ):
+        self.roles = list(roles)
+        self.competency_names = list(competency_names)
+        self.competency_descriptions = list(competency_descriptions)
+        self.rows = rows
+        self.scores = scores
+        self.fingerprint = fingerprint
+        self.match_cutoff = match_cutoff
+        self._by_name = {normalize_query(role): i for i, role in enumerate(self.roles)}
+
+    def __len__(self):
+        return len(self.roles)
+
+    @classmethod
+    def load(cls, file_path=settings.ROLE_INDEX_PATH):
+        try:
+            with np.load(file_path) as table:
+                return cls(
+                    table["roles"].astype(str),
+                    table["competency_names"].astype(str),
+                    table["competency_descriptions"].astype(str),
+                    table["rows"],
+                    table["scores"],
+                    str(table["fingerprint"]),
+                )
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def save(self, file_path=settings.ROLE_INDEX_PATH):
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{file_path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            roles=np.array(self.roles, dtype=str),
+            competency_names=np.array(self.competency_names, dtype=str),
+            competency_descriptions=np.array(self.competency_descriptions, dtype=str),
+            rows=np.asarray(self.rows, dtype=np.int32),
+            scores=np.asarray(self.scores, dtype=np.float32),
+            fingerprint=np.array(self.fingerprint),
+        )
+        os.replace(tmp_path, file_path)
+
+    def match(self, query: str):
+        """Return the role a query names, or None.
+
+        Exact (case and whitespace insensitive) names match first, then the
+        closest name above `match_cutoff`, which absorbs typos and plurals.
+        """
+        query = normalize_query(query)
+        if not query:
+            return None
+        position = self._by_name.get(query)
+        if position is None:
+            close = difflib.get_close_matches(
+                query, self._by_name, n=1, cutoff=self.match_cutoff
+            )
+            if not close:
+                return None
+            position = self._by_name[close[0]]
+        return self.roles[position]
+
+    def competencies(
+        self,
+        query: str,
+        top_n=settings.TOP_N,
+        similarity_threshold=settings.SIMILARITY_THRESHOLD,
+    ):
+        """Precomputed competencies for the role `query` names.
+
+        Returns None when no role matches or more than the stored top-k are
+        requested, so the caller can fall back to a vector search.
+        """
+        if top_n > self.rows.shape[1]:
+            return None
+        role = self.match(query)
+        if role is None:
+            return None
+        position = self._by_name[normalize_query(role)]
+        return [
+            Competency(
+                name=self.competency_names[row],
+                description=self.competency_descriptions[row],
+                similarity_score=float(score),
+            )
+            for row, score in zip(
+                self.rows[position, :top_n].tolist(),
+                self.scores[position, :top_n].tolist(),
+            )
+            if score > similarity_threshold
+        ]
+
+
+def build_role_index(
+    model,
+    competency_df,
+    role_df,
+    output_path=settings.ROLE_INDEX_PATH,
+    top_k=settings.ROLE_INDEX_TOP_K,
+    collection_name=settings.QDRANT_COLLECTION_NAME,
+) -> RoleIndex:
+    """Embed every role and store its `top_k` closest competencies."""
+    print(f"Building role index for {len(role_df)} roles")
+    role_vectors = EmbeddingStore("roles").get_or_encode(
+        _texts(role_df, "role"), lambda batch: encode_corpus(model, batch)
+    )
+    # Same store setup_vector_db fills, so competencies are not re-encoded
+    competency_vectors = EmbeddingStore(collection_name).get_or_encode(
+        _texts(competency_df, "competency"), lambda batch: encode_corpus(model, batch)
+    )
+    backend = NumpySearchBackend(
+        competency_vectors,
+        {
+            "competency": competency_df["competency"].to_numpy(),
+            "description": competency_df["description"].to_numpy(),
+        },
+    )
+    rows, scores = backend.top_k(role_vectors, top_k)
+
+    index = RoleIndex(
+        role_df["role"].tolist(),
+        backend.names,
+        backend.descriptions,
+        rows,
+        scores,
+        role_index_fingerprint(role_df, competency_df, encoder_id(), top_k),
+    )
+    index.save(output_path)
+    print(f"Saved role index with {len(index)} roles to {output_path}")
+    return index
+
+
+def load_or_build_role_index(
+    model,
+    competency_df,
+    role_path=settings.ROLE_DATA_PATH,
+    index_path=settings.ROLE_INDEX_PATH,
+    top_k=settings.ROLE_INDEX_TOP_K,
+    collection_name=settings.QDRANT_COLLECTION_NAME,
+):
+    """Load the role index, rebuilding it when missing or out of date.
+
+    Returns None when there is no roles CSV.
+    """
+    if not os.path.exists(role_path):
+        print(f"No role data found at {role_path}")
+        return None
+
+    role_df = load_role_data(role_path)
+    fingerprint = role_index_fingerprint(role_df, competency_df, encoder_id(), top_k)
+    index = RoleIndex.load(index_path)
+    if index is not None and index.fingerprint == fingerprint:
+        print(f"Loaded role index with {len(index)} roles from {index_path}")
+        return index
+    return build_role_index(
+        model,
+        competency_df,
+        role_df,
+        output_path=index_path,
+        top_k=top_k,
+        collection_name=collection_name,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", default=settings.ROLE_DATA_PATH)
+    parser.add_argument("--competencies", default=settings.COMPETENCY_DATA_PATH)
+    parser.add_argument("--output", default=settings.ROLE_INDEX_PATH)
+    parser.add_argument("--top-k", type=int, default=settings.ROLE_INDEX_TOP_K)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Rebuild the role index")
+    match_parser = subparsers.add_parser("match", help="Resolve a query to a role")
+    match_parser.add_argument("query")
+    args = parser.parse_args()
+
+    model = load_encoder()
+    competency_df = load_competency_data(args.competencies)
+    if args.command == "build":
+        build_role_index(
+            model,
+            competency_df,
+            load_role_data(args.roles),
+            output_path=args.output,
+            top_k=args.top_k,
+        )
+        return
+
+    index = load_or_build_role_index(
+        model,
+        competency_df,
+        role_path=args.roles,
+        index_path=args.output,
+        top_k=args.top_k,
+    )
+    role = index.match(args.query) if index is not None else None
+    if role is None:
+        print(f"No role matches {args.query!r}")
+        return
+    print(f"{args.query!r} -> {role}")
+    for comp in index.competencies(
+        args.query, top_n=args.top_k, similarity_threshold=-1
+    ):
+        print(f"  {comp.similarity_score:.3f}  {comp.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Compare the torch and ONNX encoder backends.
+
+Each backend runs in its own process so startup time (imports + model load)
+and peak RSS are measured cleanly. Retrieval parity uses every role in the
+roles CSV as a query against the competency corpus and reports how often
+the ONNX top-k matches torch:
+
+    python -m scripts.export_onnx            # once
+    python -m scripts.bench_encoders
+    python -m scripts.bench_encoders --backends onnx --queries 500
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import settings
+
+
+def worker(backend, output_dir, queries):
+    started = time.perf_counter()
+    from encoders import load_encoder
+
+    model = load_encoder(backend)
+    model.encode("warm up")
+    startup = time.perf_counter() - started
+
+    import pandas as pd
+
+    competencies = pd.read_csv(settings.COMPETENCY_DATA_PATH).dropna()
+    roles = pd.read_csv(settings.ROLE_DATA_PATH).dropna()
+    competency_texts = competencies["competency"] + ". " + competencies["description"]
+    role_names = roles["role"].tolist()
+
+    latencies = []
+    for i in range(queries):
+        began = time.perf_counter()
+        model.encode(role_names[i % len(role_names)])
+        latencies.append(time.perf_counter() - began)
+
+    began = time.perf_counter()
+    corpus = model.encode(competency_texts.tolist(), batch_size=64)
+    batch_seconds = time.perf_counter() - began
+    np.save(os.path.join(output_dir, f"{backend}-corpus.npy"), corpus)
+    np.save(os.path.join(output_dir, f"{backend}-roles.npy"), model.encode(role_names))
+
+    latencies_ms = np.array(latencies) * 1000
+    # ru_maxrss is in KiB on Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        json.dumps(
+            {
+                "backend": backend,
+                "startup_s": startup,
+                "peak_rss_mb": rss_mb,
+                "p50_ms": float(np.percentile(latencies_ms, 50)),
+                "p95_ms": float(np.percentile(latencies_ms, 95)),
+                "corpus_rows_per_s": len(competency_texts) / batch_seconds,
+            }
+        )
+    )
+
+
+def top_k(corpus, queries, k):
+    corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+
+
+def parity(output_dir, k):
+    torch_top = top_k(
+        np.load(os.path.join(output_dir, "torch-corpus.npy")),
+        np.load(os.path.join(output_dir, "torch-roles.npy")),
+        k,
+    )
+    onnx_top = top_k(
+        np.load(os.path.join(output_dir, "onnx-corpus.npy")),
+        np.load(os.path.join(output_dir, "onnx-roles.npy")),
+        k,
+    )
+    overlap = [
+        len(set(a) & set(b)) / k for a, b in zip(torch_top.tolist(), onnx_top.tolist())
+    ]
+    return {
+        "queries": len(overlap),
+        "top1_agreement": float(np.mean(torch_top[:, 0] == onnx_top[:, 0])),
+        f"overlap_at_{k}": float(np.mean(overlap)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=settings.TOP_N)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.output_dir, args.queries)
+        return
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for backend in args.backends:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "scripts.bench_encoders",
+                    "--worker",
+                    backend,
+                    "--output-dir",
+                    output_dir,
+                    "--queries",
+                    str(args.queries),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{backend:>6}: startup {stats['startup_s']:.2f}s, "
+                f"peak RSS {stats['peak_rss_mb']:.0f} MB, "
+                f"single query p50 {stats['p50_ms']:.2f}ms / p95 {stats['p95_ms']:.2f}ms, "
+                f"corpus {stats['corpus_rows_per_s']:.0f} rows/s"
+            )
+
+        if {"torch", "onnx"} <= set(args.backends):
+            print(f"parity: {parity(output_dir, args.top_k)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Benchmark competency ingestion throughput (rows/sec).
+
+Compares the previous per-row PointStruct + upsert loop with
+`vector_db.bulk_load_vectors` on synthetic competencies:
+
+    python -m scripts.bench_ingest                         # 1k, 100k, 1M rows
+    python -m scripts.bench_ingest --sizes 1000 --encode   # include model encoding
+    python -m scripts.bench_ingest --qdrant-url http://localhost:6333 --parallel 4
+
+1M rows of 384-d float32 vectors need roughly 1.5 GB for the matrix alone,
+plus whatever the in-memory Qdrant keeps; use --qdrant-url for the largest
+sizes on small machines.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import qdrant_client
+from qdrant_client.http import models
+
+import settings
+from vector_db import bulk_load_vectors, encode_corpus
+
+WORDS = (
+    "analyse plan lead design manage communicate budget report model coach "
+    "negotiate audit forecast review build test deploy secure optimise support"
+).split()
+
+
+def synthetic_competencies(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    word_ids = rng.integers(0, len(WORDS), size=(rows, 12))
+    descriptions = [" ".join(WORDS[i] for i in row) for row in word_ids]
+    return pd.DataFrame(
+        {
+            "competency": [f"Competency {i}" for i in range(rows)],
+            "description": descriptions,
+        }
+    )
+
+
+def synthetic_embeddings(rows, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def make_collection(client, name, dim):
+    try:
+        client.delete_collection(collection_name=name)
+    except Exception:
+        pass
+    client.create_collection(
+        collection_name=name,
+        vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE),
+    )
+
+
+def legacy_load(client, name, df, embeddings):
+    """The per-row loop setup_vector_db used before the bulk loader."""
+    points = []
+    for i, (_, row) in enumerate(df.iterrows()):
+        points.append(
+            models.PointStruct(
+                id=i,
+                vector=embeddings[i].tolist(),
+                payload={
+                    "competency": row["competency"],
+                    "description": row["description"],
+                },
+            )
+        )
+    for i in range(0, len(points), 100):
+        client.upsert(collection_name=name, points=points[i : i + 100], wait=True)
+
+
+def bulk_load(client, name, df, embeddings, batch_size, parallel):
+    bulk_load_vectors(
+        client,
+        name,
+        embeddings,
+        {
+            "competency": df["competency"].to_numpy(),
+            "description": df["description"].to_numpy(),
+        },
+        batch_size=batch_size,
+        parallel=parallel,
+    )
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=settings.UPLOAD_BATCH_SIZE)
+    parser.add_argument("--parallel", type=int, default=settings.UPLOAD_PARALLEL)
+    parser.add_argument("--qdrant-url", default=settings.QDRANT_URL)
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=100_000,
+        help="Skip the legacy loop above this size",
+    )
+    parser.add_argument(
+        "--encode",
+        action="store_true",
+        help=f"Also time encode_corpus with {settings.MODEL_NAME}",
+    )
+    parser.add_argument("--encode-max-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.qdrant_url:
+        client = qdrant_client.QdrantClient(url=args.qdrant_url)
+    else:
+        client = qdrant_client.QdrantClient(location=":memory:")
+
+    model = None
+    if args.encode:
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(settings.MODEL_NAME)
+        args.dim = model.get_sentence_embedding_dimension()
+
+    print(f"{'rows':>10} {'stage':>8} {'seconds':>10} {'rows/sec':>12}")
+    for rows in args.sizes:
+        df = synthetic_competencies(rows)
+        results = []
+
+        if model is not None and rows <= args.encode_max_rows:
+            texts = (df["competency"] + ". " + df["description"]).tolist()
+            holder = {}
+            seconds = timed(lambda: holder.update(v=encode_corpus(model, texts)))
+            embeddings = np.asarray(holder["v"], dtype=np.float32)
+            results.append(("encode", seconds))
+        else:
+            embeddings = synthetic_embeddings(rows, args.dim)
+
+        if rows <= args.legacy_max_rows:
+            make_collection(client, "bench_legacy", args.dim)
+            results.append(
+                (
+                    "legacy",
+                    timed(lambda: legacy_load(client, "bench_legacy", df, embeddings)),
+                )
+            )
+            client.delete_collection(collection_name="bench_legacy")
+
+        make_collection(client, "bench_bulk", args.dim)
+        results.append(
+            (
+                "bulk",
+                timed(
+                    lambda: bulk_load(
+                        client,
+                        "bench_bulk",
+                        df,
+                        embeddings,
+                        args.batch_size,
+                        args.parallel,
+                    )
+                ),
+            )
+        )
+        client.delete_collection(collection_name="bench_bulk")
+
+        for stage, seconds in results:
+            print(f"{rows:>10} {stage:>8} {seconds:>10.2f} {rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compare recommendation prompt size with and without local course filtering.
+
+Every query runs the normal competency and course search once; the same
+results are then turned into the full prompt (all titles, the LLM filters)
+and the budgeted one built by `prompt_builder`:
+
+    python -m scripts.bench_prompt_tokens                    # 50 role names
+    python -m scripts.bench_prompt_tokens --queries 200 --budget 500
+    python -m scripts.bench_prompt_tokens --llm              # also time the LLM
+
+Token counts use the same four-characters-per-token estimate as the budget.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import settings
+from agent import build_recommendation_prompt, init_llm_agent
+from prompt_builder import estimate_tokens
+from service import get_service
+
+
+def course_results(service, competencies):
+    if settings.COURSE_SOURCE == "catalog":
+        return {
+            comp.name: service.search_courses(comp.name, top_n=settings.MAX_COURSES)
+            for comp in competencies
+        }
+    from tools import iter_course_searches
+
+    return dict(iter_course_searches(competencies, max_courses=settings.MAX_COURSES))
+
+
+def listed_titles(prompt):
+    return sum(line.startswith("  - ") for line in prompt.splitlines())
+
+
+def time_llm(llm_agent, prompt):
+    started = time.perf_counter()
+    llm_agent.run_sync(prompt)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument(
+        "--queries-file", help="One query per line instead of role names"
+    )
+    parser.add_argument("--budget", type=int, default=settings.PROMPT_TOKEN_BUDGET)
+    parser.add_argument(
+        "--llm", action="store_true", help="Also time LLM_MODEL_NAME on both prompts"
+    )
+    args = parser.parse_args()
+    settings.PROMPT_TOKEN_BUDGET = args.budget
+
+    if args.queries_file:
+        with open(args.queries_file) as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = pd.read_csv(settings.ROLE_DATA_PATH).dropna()["role"].tolist()
+    queries = queries[: args.queries]
+
+    service = get_service()
+    llm_agent = init_llm_agent() if args.llm else None
+    rows = []
+    for query in queries:
+        competencies = service.search_competencies(query)
+        results = course_results(service, competencies)
+        full_prompt, _ = build_recommendation_prompt(results, competencies, query)
+        if full_prompt is None:
+            continue
+
+        started = time.perf_counter()
+        prompt, _ = build_recommendation_prompt(
+            results, competencies, query, encoder=service.model
+        )
+        build_ms = (time.perf_counter() - started) * 1000
+        titles = sum(len(courses) for courses in results.values())
+        row = {
+            "query": query,
+            "full_tokens": estimate_tokens(full_prompt),
+            "budgeted_tokens": estimate_tokens(prompt) if prompt else 0,
+            "titles": titles,
+            "titles_kept": listed_titles(prompt) if prompt else 0,
+            "build_ms": build_ms,
+        }
+        if llm_agent is not None:
+            row["full_llm_s"] = time_llm(llm_agent, full_prompt)
+            row["budgeted_llm_s"] = time_llm(llm_agent, prompt) if prompt else 0.0
+        rows.append(row)
+        print(
+            f"{query[:40]:<40} {row['full_tokens']:>5} -> {row['budgeted_tokens']:>5} "
+            f"tokens, {row['titles_kept']}/{titles} titles, {build_ms:.1f}ms"
+        )
+
+    if not rows:
+        raise SystemExit("No query produced a prompt (are courses available?)")
+    full = np.array([row["full_tokens"] for row in rows])
+    budgeted = np.array([row["budgeted_tokens"] for row in rows])
+    saved = full - budgeted
+    print(
+        f"\n{len(rows)} queries: mean {full.mean():.0f} -> {budgeted.mean():.0f} tokens, "
+        f"saved {saved.mean():.0f} per query ({saved.sum() / full.sum():.0%}); "
+        f"{sum(not row['budgeted_tokens'] for row in rows)} answered without the LLM"
+    )
+    print(
+        "titles kept: "
+        f"{sum(row['titles_kept'] for row in rows)}/{sum(row['titles'] for row in rows)}, "
+        f"prompt build p50 {np.percentile([row['build_ms'] for row in rows], 50):.1f}ms"
+    )
+    if llm_agent is not None:
+        print(
+            f"LLM latency: full {np.mean([row['full_llm_s'] for row in rows]):.2f}s, "
+            f"budgeted {np.mean([row['budgeted_llm_s'] for row in rows]):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare competency search latency of the numpy and Qdrant backends.
+
+Both backends index the same synthetic normalised vectors; every query is
+checked for identical names and (to float32 precision) identical scores:
+
+    python -m scripts.bench_search_backends
+    python -m scripts.bench_search_backends --sizes 300 5000 --queries 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import qdrant_client
+from qdrant_client.http import models
+
+from search_backends import NumpySearchBackend, QdrantSearchBackend
+from vector_db import bulk_load_vectors
+
+
+def random_unit_vectors(rows, dim, rng):
+    vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_backends(client, rows, dim, rng):
+    embeddings = random_unit_vectors(rows, dim, rng)
+    payloads = {
+        "competency": np.array([f"Competency {i}" for i in range(rows)]),
+        "description": np.array([f"Description {i}" for i in range(rows)]),
+    }
+    collection_name = f"bench_{rows}"
+    try:
+        client.delete_collection(collection_name=collection_name)
+    except Exception:
+        pass
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE),
+    )
+    bulk_load_vectors(client, collection_name, embeddings, payloads)
+    return (
+        NumpySearchBackend(embeddings, payloads),
+        QdrantSearchBackend(client, collection_name),
+    )
+
+
+def time_single(backend, queries, top_n, threshold):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(backend.search([query], top_n, threshold)[0])
+        latencies.append(time.perf_counter() - started)
+    return np.array(latencies) * 1000, results
+
+
+def time_batch(backend, queries, top_n, threshold):
+    started = time.perf_counter()
+    backend.search(queries, top_n, threshold)
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def mismatches(expected, actual):
+    count = 0
+    for want, got in zip(expected, actual):
+        same = [c.name for c in want] == [c.name for c in got] and np.allclose(
+            [c.similarity_score for c in want],
+            [c.similarity_score for c in got],
+            atol=1e-5,
+        )
+        count += not same
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[300, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    client = qdrant_client.QdrantClient(location=":memory:")
+
+    print(
+        f"{'rows':>8} {'backend':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'batch ms/q':>11} {'mismatches':>11}"
+    )
+    for rows in args.sizes:
+        numpy_backend, qdrant_backend = build_backends(client, rows, args.dim, rng)
+        queries = random_unit_vectors(args.queries, args.dim, rng)
+
+        reference = None
+        for backend in (qdrant_backend, numpy_backend):
+            latencies, results = time_single(
+                backend, queries, args.top_n, args.threshold
+            )
+            batch = time_batch(backend, queries, args.top_n, args.threshold)
+            if reference is None:
+                reference = results
+            print(
+                f"{rows:>8} {backend.name:>8} {np.percentile(latencies, 50):>8.3f} "
+                f"{np.percentile(latencies, 95):>8.3f} {batch:>11.3f} "
+                f"{mismatches(reference, results):>11}"
+            )
+        client.delete_collection(collection_name=qdrant_backend.collection_name)
+
+
+if __name__ == "__main__":
+    main()
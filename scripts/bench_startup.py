@@ -0,0 +1,166 @@
+"""Profile app startup: import-time breakdown and time-to-first-interactive.
+
+    python -m scripts.bench_startup                          # print a report
+    python -m scripts.bench_startup --output startup.json    # save it
+    python -m scripts.bench_startup --baseline startup.json  # fail on regressions
+
+Every measurement runs in a fresh interpreter. Time-to-first-interactive is
+how long the first script run of `ui_streamlit.py` takes until the chat input
+is rendered (measured with Streamlit's AppTest); model-ready is how long
+until the background warm-up has finished.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+# Modules that must not be imported before the first render
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "onnxruntime",
+    "pydantic_ai",
+    "openai",
+    "selenium",
+    "qdrant_client",
+    "pandas",
+]
+
+# Lower is better for all of these
+METRICS = ["import_ms", "first_interactive_s", "model_ready_s"]
+
+
+def import_profile(module="ui_streamlit", top=15):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative_us)))
+
+    total_us = next(cumulative for name, _, cumulative in rows if name == module)
+    # The page's direct imports and what they import themselves
+    breakdown = sorted(
+        (
+            (name, cumulative / 1000)
+            for name, depth, cumulative in rows
+            if 1 <= depth <= 2
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    loaded = {name for name, _, _ in rows}
+    return {
+        "import_ms": total_us / 1000,
+        "top_imports_ms": dict(breakdown),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in loaded],
+    }
+
+
+def interactive_worker(timeout):
+    from streamlit.testing.v1 import AppTest
+
+    started = time.perf_counter()
+    app = AppTest.from_file("ui_streamlit.py", default_timeout=timeout)
+    app.run()
+    first_interactive = time.perf_counter() - started
+    if not app.chat_input:
+        raise SystemExit("chat input was not rendered on the first run")
+
+    model_ready = None
+    while time.perf_counter() - started < timeout:
+        if app.error:
+            raise SystemExit(f"warm-up failed: {app.error[0].value}")
+        if app.success:
+            model_ready = time.perf_counter() - started
+            break
+        time.sleep(0.2)
+        app.run()
+
+    print(
+        json.dumps(
+            {"first_interactive_s": first_interactive, "model_ready_s": model_ready}
+        )
+    )
+
+
+def interactive_profile(timeout):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "scripts.bench_startup",
+            "--interactive-worker",
+            "--timeout",
+            str(timeout),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(report, baseline, tolerance):
+    regressions = []
+    for metric in METRICS:
+        old, new = baseline.get(metric), report.get(metric)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        flag = "REGRESSION" if change > tolerance else "ok"
+        print(f"{metric:>22}: {old:10.3f} -> {new:10.3f} ({change:+.0%}) {flag}")
+        if change > tolerance:
+            regressions.append(metric)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Compare against an earlier report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown before a metric counts as a regression",
+    )
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument(
+        "--interactive-worker", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.interactive_worker:
+        interactive_worker(args.timeout)
+        return
+
+    report = import_profile()
+    report.update(interactive_profile(args.timeout))
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Local stand-in for the coniverse search page.
+
+Serves recorded search responses so the HTTP and Selenium fetch paths can be
+exercised without touching the real site:
+
+    python -m scripts.coniverse_stub record "Data Analysis" --out recordings/
+    python -m scripts.coniverse_stub serve --recordings recordings/ --port 8765
+    CONIVERSE_BASE_URL=http://127.0.0.1:8765 streamlit run ui_streamlit.py
+
+Recordings are stored as `<slug>.html` or `<slug>.json` (the slug is the
+lower-cased search term with non-alphanumerics replaced by "-"); a
+`<slug>.status` file holding an HTTP status code makes the stub fail that
+search with it instead. Search terms without a recording get a generated
+page with `--fallback-courses` results.
+"""
+
+import argparse
+import html
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+import settings
+from tools import build_search_url
+
+
+def slugify(search_term: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", search_term.lower()).strip("-") or "empty"
+
+
+def render_search_page(search_term: str, course_count: int) -> str:
+    cards = "\n".join(
+        f'<div class="search-result-card"><span data-qa="txt-name">'
+        f"{html.escape(search_term)} Course {i + 1}</span></div>"
+        for i in range(course_count)
+    )
+    if not cards:
+        cards = '<div class="empty-state">No results</div>'
+    return (
+        "<!doctype html><html><head><title>coniverse</title></head><body>"
+        f'<div id="search-courses-page">{cards}</div></body></html>'
+    )
+
+
+def make_handler(recordings_dir, fallback_courses, delay):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            if parsed.path != settings.CONIVERSE_SEARCH_PATH:
+                self.send_error(404)
+                return
+
+            search_term = urllib.parse.parse_qs(parsed.query).get("search", [""])[0]
+            if delay:
+                time.sleep(delay)
+
+            body, content_type = None, "text/html; charset=utf-8"
+            if recordings_dir:
+                slug = slugify(search_term)
+                status_path = recordings_dir / f"{slug}.status"
+                if status_path.exists():
+                    self.send_error(int(status_path.read_text("utf-8").strip()))
+                    return
+                for suffix, recorded_type in (
+                    (".json", "application/json"),
+                    (".html", "text/html; charset=utf-8"),
+                ):
+                    path = recordings_dir / f"{slug}{suffix}"
+                    if path.exists():
+                        body, content_type = path.read_text("utf-8"), recorded_type
+                        break
+            if body is None:
+                body = render_search_page(search_term, fallback_courses)
+
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(
+    host="127.0.0.1", port=0, recordings_dir=None, fallback_courses=5, delay=0.0
+):
+    """Start the stub in a daemon thread; returns the server (see `server_address`)."""
+    recordings_dir = Path(recordings_dir) if recordings_dir else None
+    server = ThreadingHTTPServer(
+        (host, port), make_handler(recordings_dir, fallback_courses, delay)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record(search_terms, out_dir):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with httpx.Client(
+        timeout=settings.HTTP_FETCH_TIMEOUT, follow_redirects=True
+    ) as client:
+        for search_term in search_terms:
+            response = client.get(build_search_url(search_term))
+            response.raise_for_status()
+            suffix = (
+                ".json"
+                if "json" in response.headers.get("content-type", "")
+                else ".html"
+            )
+            path = out_dir / f"{slugify(search_term)}{suffix}"
+            path.write_text(response.text, "utf-8")
+            print(f"Recorded {search_term!r} -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve recorded pages")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--recordings", default=None)
+    serve_parser.add_argument("--fallback-courses", type=int, default=5)
+    serve_parser.add_argument(
+        "--delay", type=float, default=0.0, help="Seconds to wait per response"
+    )
+
+    record_parser = subparsers.add_parser(
+        "record", help="Save live search pages for later replay"
+    )
+    record_parser.add_argument("search_terms", nargs="+")
+    record_parser.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.search_terms, args.out)
+        return
+
+    server = start_stub_server(
+        args.host, args.port, args.recordings, args.fallback_courses, args.delay
+    )
+    host, port = server.server_address[:2]
+    print(f"coniverse stub listening on http://{host}:{port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
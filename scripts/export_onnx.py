@@ -0,0 +1,92 @@
+"""Export MODEL_NAME to ONNX with int8 dynamic quantisation.
+
+    python -m scripts.export_onnx                      # writes ./onnx_model
+    python -m scripts.export_onnx --output /models/minilm --no-quantize
+
+Needs torch and sentence-transformers, so run it once on a build machine and
+ship the output directory; the app then only needs onnxruntime and
+tokenizers (ENCODER_BACKEND=onnx, ONNX_MODEL_DIR=<output>).
+"""
+
+import argparse
+import json
+import os
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.models import Normalize, Pooling
+
+import settings
+
+
+def export(model_name, output_dir, quantize=True, opset=17):
+    model = SentenceTransformer(model_name, device="cpu")
+    pooling = next(module for module in model if isinstance(module, Pooling))
+    if pooling.get_pooling_mode_str() != "mean":
+        raise ValueError(
+            f"{model_name} uses {pooling.get_pooling_mode_str()} pooling; "
+            "OnnxEncoder only implements mean pooling"
+        )
+
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    os.makedirs(output_dir, exist_ok=True)
+
+    sample = tokenizer(["An example sentence"], return_tensors="pt")
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    onnx_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    print(f"Exported {model_name} to {onnx_path}")
+
+    if quantize:
+        quantized_path = os.path.join(output_dir, "model_quantized.onnx")
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+        print(f"Wrote int8 model to {quantized_path}")
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+    config = {
+        "model_name": model_name,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "max_seq_length": model.max_seq_length,
+        "normalize": any(isinstance(module, Normalize) for module in model),
+        "pad_token_id": tokenizer.pad_token_id or 0,
+    }
+    with open(os.path.join(output_dir, "encoder_config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+    print(f"Wrote tokenizer and encoder_config.json to {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=settings.MODEL_NAME)
+    parser.add_argument("--output", default=settings.ONNX_MODEL_DIR)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument(
+        "--no-quantize",
+        dest="quantize",
+        action="store_false",
+        help="Only write the float32 model.onnx",
+    )
+    args = parser.parse_args()
+    export(args.model, args.output, quantize=args.quantize, opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
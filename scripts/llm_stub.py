@@ -0,0 +1,154 @@
+"""Local stand-in for an OpenAI-compatible chat completions API.
+
+Answers every request with a canned Markdown recommendation, streamed word by
+word when asked to, with configurable latency. Lets the app and the load test
+run without calling (or paying for) a real model:
+
+    python -m scripts.llm_stub --port 8766 --first-token-delay 0.5 --token-delay 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=stub \
+        LLM_MODEL_NAME=openai:gpt-4o uvicorn api:app
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = """Here are some course recommendations based on your interests:
+
+## Courses for your competencies
+
+**Introduction to the Topic**
+*This course covers the fundamentals related to your interest.*
+
+**Applied Practice**
+*This course helps you apply the competency in real projects.*
+
+Would you like to explore any of these competencies in more detail, or search for something else?"""
+
+
+def make_handler(first_token_delay, token_delay):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            model = request.get("model", "stub")
+            prompt_tokens = sum(
+                len(str(message.get("content", ""))) // 4
+                for message in request.get("messages", [])
+            )
+            words = REPLY.split(" ")
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(words),
+                "total_tokens": prompt_tokens + len(words),
+            }
+            time.sleep(first_token_delay)
+
+            if not request.get("stream"):
+                time.sleep(token_delay * len(words))
+                self._send_json(
+                    {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": REPLY},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": usage,
+                    }
+                )
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(token_delay)
+                delta = {"content": word if i == 0 else f" {word}"}
+                if i == 0:
+                    delta["role"] = "assistant"
+                self._send_chunk(model, [{"index": 0, "delta": delta}])
+            self._send_chunk(
+                model, [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            )
+            if (request.get("stream_options") or {}).get("include_usage"):
+                self._send_chunk(model, [], usage=usage)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def _send_json(self, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_chunk(self, model, choices, usage=None):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"finish_reason": None, **choice} for choice in choices],
+            }
+            if usage is not None:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(host="127.0.0.1", port=0, first_token_delay=0.0, token_delay=0.0):
+    """Start the stub in a daemon thread; returns the server (see `server_address`)."""
+    server = ThreadingHTTPServer(
+        (host, port), make_handler(first_token_delay, token_delay)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--first-token-delay",
+        type=float,
+        default=0.5,
+        help="Seconds before the first token",
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.02, help="Seconds between tokens"
+    )
+    args = parser.parse_args()
+
+    server = start_stub_server(
+        args.host, args.port, args.first_token_delay, args.token_delay
+    )
+    host, port = server.server_address[:2]
+    print(f"LLM stub listening on http://{host}:{port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Load-test the HTTP API against local coniverse and LLM stubs.
+
+Starts both stubs and `uvicorn api:app` with caches on disk disabled, then
+sends requests from `--concurrency` concurrent clients and reports
+throughput, latency percentiles and the server's batching/coalescing stats:
+
+    python -m scripts.load_test --endpoint competencies --requests 2000
+    python -m scripts.load_test --endpoint stream --concurrency 64 --distinct 20
+    python -m scripts.load_test --api-url http://127.0.0.1:8000   # running API
+
+Queries are role names from the roles CSV; `--distinct` controls how many
+different ones are cycled through, so repeats exercise coalescing and the
+caches. With `--llm test` pydantic-ai's TestModel replaces the LLM stub.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+import settings
+from scripts import coniverse_stub, llm_stub
+
+ENDPOINTS = ["competencies", "courses", "recommendations", "stream"]
+
+
+def start_api(port, coniverse_url, llm_url, llm, log_file):
+    env = dict(
+        os.environ,
+        CONIVERSE_BASE_URL=coniverse_url,
+        COURSE_FETCH_MODE="http",
+        COURSE_SOURCE="live",
+        COURSE_CACHE_PATH="",
+        RECOMMENDATION_CACHE_PATH="",
+    )
+    if llm == "stub":
+        env.update(
+            OPENAI_BASE_URL=llm_url,
+            OPENAI_API_KEY="stub",
+            LLM_MODEL_NAME="openai:gpt-4o",
+        )
+    else:
+        env["LLM_MODEL_NAME"] = "test"
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+
+async def wait_until_ready(client, api_url, process, timeout):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process is not None and process.poll() is not None:
+            raise SystemExit("API process exited during startup")
+        try:
+            if (await client.get(f"{api_url}/health")).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"API not ready after {timeout:g}s")
+
+
+async def send(client, api_url, endpoint, query, competency):
+    """Send one request; returns `(seconds, first_delta_seconds or None)`."""
+    started = time.perf_counter()
+    if endpoint == "competencies":
+        response = await client.get(f"{api_url}/competencies", params={"query": query})
+    elif endpoint == "courses":
+        response = await client.get(
+            f"{api_url}/courses", params={"competency": competency}
+        )
+    elif endpoint == "recommendations":
+        response = await client.post(
+            f"{api_url}/recommendations", json={"query": query}
+        )
+    else:
+        first_delta = None
+        async with client.stream(
+            "GET", f"{api_url}/recommendations/stream", params={"query": query}
+        ) as response:
+            response.raise_for_status()
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[len("event:") :].strip()
+                if event == "delta" and first_delta is None:
+                    first_delta = time.perf_counter() - started
+                if event in ("done", "error") and line.startswith("data:"):
+                    if event == "error":
+                        raise RuntimeError(json.loads(line[len("data:") :])["error"])
+                    break
+        return time.perf_counter() - started, first_delta
+    response.raise_for_status()
+    return time.perf_counter() - started, None
+
+
+async def run_load(api_url, endpoint, queries, competencies, requests, concurrency):
+    work = iter(range(requests))
+    latencies, first_deltas, errors = [], [], []
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+
+        async def worker():
+            for i in work:
+                try:
+                    seconds, first_delta = await send(
+                        client,
+                        api_url,
+                        endpoint,
+                        queries[i % len(queries)],
+                        competencies[i % len(competencies)],
+                    )
+                except Exception as e:
+                    errors.append(repr(e))
+                    continue
+                latencies.append(seconds)
+                if first_delta is not None:
+                    first_deltas.append(first_delta)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        server_stats = (await client.get(f"{api_url}/stats")).json()
+    return elapsed, latencies, first_deltas, errors, server_stats
+
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    return ", ".join(f"p{p} {np.percentile(values, p):.0f}ms" for p in (50, 95, 99))
+
+
+async def main_async(args):
+    roles = pd.read_csv(settings.ROLE_DATA_PATH).dropna()["role"].tolist()
+    queries = roles[: args.distinct]
+    competencies = pd.read_csv(settings.COMPETENCY_DATA_PATH).dropna()["competency"]
+    competencies = competencies.tolist()[: args.distinct]
+
+    process = None
+    api_url = args.api_url
+    with tempfile.NamedTemporaryFile("w+", suffix=".log") as log_file:
+        if api_url is None:
+            coniverse = coniverse_stub.start_stub_server(
+                fallback_courses=settings.MAX_COURSES, delay=args.coniverse_delay
+            )
+            llm = llm_stub.start_stub_server(
+                first_token_delay=args.llm_first_token_delay,
+                token_delay=args.llm_token_delay,
+            )
+            coniverse_url = f"http://127.0.0.1:{coniverse.server_address[1]}"
+            llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+            process = start_api(args.port, coniverse_url, llm_url, args.llm, log_file)
+            api_url = f"http://127.0.0.1:{args.port}"
+        try:
+            async with httpx.AsyncClient() as client:
+                startup = await wait_until_ready(
+                    client, api_url, process, args.startup_timeout
+                )
+            print(f"API ready after {startup:.1f}s")
+            endpoints = ENDPOINTS if args.endpoint == "all" else [args.endpoint]
+            for endpoint in endpoints:
+                elapsed, latencies, first_deltas, errors, server_stats = await run_load(
+                    api_url,
+                    endpoint,
+                    queries,
+                    competencies,
+                    args.requests,
+                    args.concurrency,
+                )
+                print(f"\n{endpoint}: {len(latencies)} ok, {len(errors)} errors")
+                if latencies:
+                    print(
+                        f"  throughput {len(latencies) / elapsed:.1f} req/s, "
+                        f"latency {percentiles(latencies)}"
+                    )
+                if first_deltas:
+                    print(f"  first LLM token {percentiles(first_deltas)}")
+                for error in sorted(set(errors))[:5]:
+                    print(f"  error: {error}")
+                print(
+                    f"  server totals: batching {server_stats['batching']}, "
+                    f"coalescing {server_stats['coalescing']}"
+                )
+        except BaseException:
+            if process is not None:
+                log_file.seek(0)
+                print(log_file.read()[-3000:], file=sys.stderr)
+            raise
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoint", choices=ENDPOINTS + ["all"], default="all")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--distinct", type=int, default=50, help="Number of different queries"
+    )
+    parser.add_argument("--api-url", help="Use a running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--llm", choices=["stub", "test"], default="stub")
+    parser.add_argument("--coniverse-delay", type=float, default=0.3)
+    parser.add_argument("--llm-first-token-delay", type=float, default=0.5)
+    parser.add_argument("--llm-token-delay", type=float, default=0.02)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
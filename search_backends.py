@@ -0,0 +1,130 @@
+import numpy as np
+from qdrant_client.http import models
+
+import settings
+from models import Competency
+
+
+def choose_backend(rows: int, backend=None) -> str:
+    """Resolve the SEARCH_BACKEND setting to "numpy" or "qdrant" for a corpus."""
+    backend = (backend or settings.SEARCH_BACKEND).lower()
+    if backend == "auto":
+        return "numpy" if rows <= settings.NUMPY_BACKEND_MAX_ROWS else "qdrant"
+    if backend not in ("numpy", "qdrant"):
+        raise ValueError(f"Unknown search backend: {backend}")
+    return backend
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class NumpySearchBackend:
+    """Exact cosine search over an in-memory embedding matrix.
+
+    The corpus is normalised once, so a batch of queries is scored with a
+    single matrix product; `argpartition` picks the top rows without sorting
+    the whole corpus. Scores and ordering match the Qdrant backend.
+    """
+
+    name = "numpy"
+
+    def __init__(self, embeddings, payloads: dict):
+        self.matrix = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        self.names = np.asarray(payloads["competency"]).tolist()
+        self.descriptions = np.asarray(payloads["description"]).tolist()
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def top_k(self, query_vectors, k):
+        """Return `(rows, scores)`, each (queries, k), best match first."""
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        k = max(0, min(k, len(self.matrix)))
+        scores = _normalize_rows(queries) @ self.matrix.T
+        if k == 0:
+            rows = np.empty((len(queries), 0), dtype=np.int64)
+        elif k < scores.shape[1]:
+            rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        top_scores = np.take_along_axis(scores, rows, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(rows, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
+
+    def search(
+        self, query_vectors, top_n=settings.TOP_N, threshold=0.0
+    ) -> list[list[Competency]]:
+        rows, scores = self.top_k(query_vectors, top_n)
+        return [
+            self.competencies(query_rows, query_scores, threshold)
+            for query_rows, query_scores in zip(rows, scores)
+        ]
+
+    def competencies(self, rows, scores, threshold=0.0) -> list[Competency]:
+        return [
+            Competency(
+                name=self.names[row],
+                description=self.descriptions[row],
+                similarity_score=float(score),
+            )
+            for row, score in zip(
+                np.asarray(rows).tolist(), np.asarray(scores).tolist()
+            )
+            if score > threshold
+        ]
+
+
+class QdrantSearchBackend:
+    """Competency search against a Qdrant collection."""
+
+    name = "qdrant"
+
+    def __init__(self, client, collection_name=settings.QDRANT_COLLECTION_NAME):
+        self.client = client
+        self.collection_name = collection_name
+
+    def __len__(self):
+        return self.client.count(collection_name=self.collection_name, exact=True).count
+
+    def search(
+        self, query_vectors, top_n=settings.TOP_N, threshold=0.0
+    ) -> list[list[Competency]]:
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        if len(queries) == 1:
+            batches = [
+                self.client.search(
+                    collection_name=self.collection_name,
+                    query_vector=queries[0],
+                    limit=top_n,
+                )
+            ]
+        else:
+            batches = self.client.search_batch(
+                collection_name=self.collection_name,
+                requests=[
+                    models.SearchRequest(
+                        vector=query_vector.tolist(), limit=top_n, with_payload=True
+                    )
+                    for query_vector in queries
+                ],
+            )
+
+        results = []
+        for hits in batches:
+            competencies = [
+                Competency(
+                    name=hit.payload["competency"],
+                    description=hit.payload["description"],
+                    similarity_score=hit.score,
+                )
+                for hit in hits
+                if hit.score > threshold
+            ]
+            competencies.sort(key=lambda x: x.similarity_score, reverse=True)
+            results.append(competencies)
+        return results
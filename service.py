@@ -0,0 +1,151 @@
+import threading
+
+import settings
+from models import Competency
+from role_index import load_or_build_role_index
+from vector_db import (
+    cached_query_vector,
+    get_search_index,
+    init_model_and_db,
+    load_competency_data,
+    search_competencies,
+    search_competencies_batch,
+    search_courses,
+    setup_course_catalog,
+    setup_vector_db,
+)
+
+
+class ThreadSafeModel:
+    """Serialises `encode` calls on a shared sentence encoder.
+
+    Hugging Face fast tokenizers raise "Already borrowed" when one instance is
+    used from several threads at once. Everything else is delegated.
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self._lock = threading.Lock()
+
+    def encode(self, *args, **kwargs):
+        with self._lock:
+            return self._model.encode(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+class CompetencyService:
+    """Model, competency index and data shared by every session in the process.
+
+    All indexing happens in the constructor; afterwards the service is only
+    read, so searches can run concurrently from any thread.
+    """
+
+    def __init__(
+        self,
+        competency_path=settings.COMPETENCY_DATA_PATH,
+        collection_name=settings.QDRANT_COLLECTION_NAME,
+    ):
+        self.collection_name = collection_name
+        self.df = load_competency_data(competency_path)
+        model, self.client = init_model_and_db()
+        self.model = ThreadSafeModel(model)
+
+        self.competency_count = setup_vector_db(
+            self.client, self.model, self.df, collection_name=collection_name
+        )
+        self.role_index = None
+        if settings.ROLE_INDEX_ENABLED:
+            self.role_index = load_or_build_role_index(
+                self.model, self.df, collection_name=collection_name
+            )
+        self.catalog_count = 0
+        if settings.COURSE_SOURCE == "catalog":
+            self.catalog_count = setup_course_catalog(self.client, self.model)
+
+    def search_competencies(
+        self,
+        query,
+        top_n=settings.TOP_N,
+        similarity_threshold=settings.SIMILARITY_THRESHOLD,
+    ) -> list[Competency]:
+        competencies = self._role_competencies(query, top_n, similarity_threshold)
+        if competencies is not None:
+            return competencies
+        return search_competencies(
+            self.client,
+            self.model,
+            query,
+            collection_name=self.collection_name,
+            top_n=top_n,
+            similarity_threshold=similarity_threshold,
+        )
+
+    def search_competencies_batch(
+        self,
+        queries: list[str],
+        top_n=settings.TOP_N,
+        similarity_threshold=settings.SIMILARITY_THRESHOLD,
+    ) -> list[list[Competency]]:
+        results = [
+            self._role_competencies(query, top_n, similarity_threshold)
+            for query in queries
+        ]
+        unmatched = [i for i, result in enumerate(results) if result is None]
+        if unmatched:
+            searched = search_competencies_batch(
+                self.client,
+                self.model,
+                [queries[i] for i in unmatched],
+                collection_name=self.collection_name,
+                top_n=top_n,
+                similarity_threshold=similarity_threshold,
+            )
+            for i, competencies in zip(unmatched, searched):
+                results[i] = competencies
+        return results
+
+    def _role_competencies(self, query, top_n, similarity_threshold):
+        """Precomputed competencies when `query` names a known role, else None."""
+        if self.role_index is None:
+            return None
+        return self.role_index.competencies(query, top_n, similarity_threshold)
+
+    def cached_query_vector(self, query):
+        """Query embedding from the competency search's vector cache, or None."""
+        return cached_query_vector(
+            self.client, query, collection_name=self.collection_name
+        )
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the competency query caches."""
+        return get_search_index(self.client, self.collection_name).stats()
+
+    def search_courses(self, competency_name, top_n=settings.MAX_COURSES) -> list[str]:
+        """Catalog course titles for a competency (empty without a catalog)."""
+        if not self.catalog_count:
+            return []
+        return search_courses(
+            self.client,
+            self.model,
+            competency_name,
+            competency_name=competency_name,
+            top_n=top_n,
+        )
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> CompetencyService:
+    """Return the process-wide service, building it on first use.
+
+    Concurrent first callers wait for a single build.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CompetencyService()
+    return _service
@@ -9,3 +9,173 @@ COMPETENCY_DATA_PATH = os.getenv(
     "COMPETENCY_DATA_PATH", "./data/openai_result - competencies.csv"
 )
 LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gpt-4o")
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", TOP_N))
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", 25))
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", 120))
+COURSE_SEARCH_WORKERS = int(os.getenv("COURSE_SEARCH_WORKERS", BROWSER_POOL_SIZE))
+
+SCRAPER_READY_TIMEOUT = float(os.getenv("SCRAPER_READY_TIMEOUT", 15))
+SCRAPER_POLL_INTERVAL = float(os.getenv("SCRAPER_POLL_INTERVAL", 0.1))
+SCRAPER_SETTLE_TIME = float(os.getenv("SCRAPER_SETTLE_TIME", 0.75))
+
+# Course fetch strategy: "http_first" (plain HTTP, Selenium fallback),
+# "http" (never launch a browser) or "selenium" (browser only)
+COURSE_FETCH_MODE = os.getenv("COURSE_FETCH_MODE", "http_first")
+CONIVERSE_BASE_URL = os.getenv("CONIVERSE_BASE_URL", "https://coniverse.com")
+CONIVERSE_SEARCH_PATH = os.getenv("CONIVERSE_SEARCH_PATH", "/search/learning/courses")
+HTTP_FETCH_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", 10))
+
+COURSE_CACHE_ENABLED = os.getenv("COURSE_CACHE_ENABLED", "true").lower() == "true"
+# Set to an empty string to keep the course cache in memory only
+COURSE_CACHE_PATH = os.getenv("COURSE_CACHE_PATH", "./cache/course_cache.sqlite3")
+COURSE_CACHE_MAX_ENTRIES = int(os.getenv("COURSE_CACHE_MAX_ENTRIES", 1024))
+COURSE_CACHE_DISK_MAX_ENTRIES = int(os.getenv("COURSE_CACHE_DISK_MAX_ENTRIES", 100000))
+COURSE_CACHE_TTL = float(os.getenv("COURSE_CACHE_TTL", 24 * 3600))
+COURSE_CACHE_EMPTY_TTL = float(os.getenv("COURSE_CACHE_EMPTY_TTL", 3600))
+COURSE_CACHE_ERROR_TTL = float(os.getenv("COURSE_CACHE_ERROR_TTL", 60))
+
+# Where course titles come from at request time: "catalog" answers from the
+# prebuilt course catalog index (live scrape for competencies it lacks),
+# "live" always scrapes coniverse
+COURSE_SOURCE = os.getenv("COURSE_SOURCE", "catalog")
+COURSE_CATALOG_PATH = os.getenv("COURSE_CATALOG_PATH", "./data/course_catalog.npz")
+COURSE_COLLECTION_NAME = os.getenv("COURSE_COLLECTION_NAME", "courses")
+COURSE_SIMILARITY_THRESHOLD = float(os.getenv("COURSE_SIMILARITY_THRESHOLD", 0.0))
+
+DEBUG_CAPTURE_DIR = os.getenv("DEBUG_CAPTURE_DIR", "/tmp/coniverse_debug")
+# Fraction of successful searches to capture (0 disables sampling)
+DEBUG_CAPTURE_SAMPLE_RATE = float(os.getenv("DEBUG_CAPTURE_SAMPLE_RATE", 0.0))
+DEBUG_CAPTURE_ON_ERROR = os.getenv("DEBUG_CAPTURE_ON_ERROR", "true").lower() == "true"
+DEBUG_CAPTURE_QUEUE_SIZE = int(os.getenv("DEBUG_CAPTURE_QUEUE_SIZE", 16))
+DEBUG_CAPTURE_MAX_FILES = int(os.getenv("DEBUG_CAPTURE_MAX_FILES", 200))
+DEBUG_CAPTURE_MAX_BYTES = int(os.getenv("DEBUG_CAPTURE_MAX_BYTES", 100 * 1024 * 1024))
+
+ASYNC_SEARCH_CONCURRENCY = int(
+    os.getenv("ASYNC_SEARCH_CONCURRENCY", COURSE_SEARCH_WORKERS)
+)
+# Hard upper bound on one course search, including any hedged attempt
+COURSE_SEARCH_DEADLINE = float(os.getenv("COURSE_SEARCH_DEADLINE", 45))
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+# Send a hedged attempt once the first one is slower than this latency percentile
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", 1.0))
+
+# Circuit breaker around coniverse course searches
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", 0.5))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", 30))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("BREAKER_SLOW_CALL_RATE", 0.8))
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", 20))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", 5))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", 30))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv("BREAKER_MAX_OPEN_SECONDS", 300))
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", 1))
+COURSE_SEARCH_RETRIES = int(os.getenv("COURSE_SEARCH_RETRIES", 2))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", 0.5))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", 8))
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "./cache/embeddings")
+
+# Leave empty to keep the vector index in process memory
+QDRANT_URL = os.getenv("QDRANT_URL", "")
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", 64))
+# Corpora at least this large are encoded with a multi-process pool
+MULTIPROCESS_ENCODE_MIN_ROWS = int(os.getenv("MULTIPROCESS_ENCODE_MIN_ROWS", 50000))
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", 256))
+UPLOAD_PARALLEL = int(os.getenv("UPLOAD_PARALLEL", 1))
+
+# Competency search backend: "auto" (numpy up to NUMPY_BACKEND_MAX_ROWS,
+# Qdrant above), "numpy" (exact in-process matmul) or "qdrant"
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+NUMPY_BACKEND_MAX_ROWS = int(os.getenv("NUMPY_BACKEND_MAX_ROWS", 50000))
+# Per-index LRU caches for query embeddings and competency search results;
+# both are dropped whenever the index is rebuilt
+QUERY_VECTOR_CACHE_SIZE = int(os.getenv("QUERY_VECTOR_CACHE_SIZE", 2048))
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", 2048))
+
+# Job titles from roles.csv are answered from a precomputed role -> competency
+# table instead of a vector search; rebuilt when the CSVs or model change
+ROLE_INDEX_ENABLED = os.getenv("ROLE_INDEX_ENABLED", "true").lower() == "true"
+ROLE_DATA_PATH = os.getenv("ROLE_DATA_PATH", "./data/openai_result - roles.csv")
+ROLE_INDEX_PATH = os.getenv("ROLE_INDEX_PATH", "./cache/role_index.npz")
+ROLE_INDEX_TOP_K = int(os.getenv("ROLE_INDEX_TOP_K", 10))
+# difflib similarity needed for a query to count as a known role
+ROLE_MATCH_CUTOFF = float(os.getenv("ROLE_MATCH_CUTOFF", 0.9))
+
+# "vector" searches embeddings only; "hybrid" fuses them with a BM25 keyword
+# index using reciprocal rank fusion (scores are then fused ranks in (0, 1])
+SEARCH_MODE = os.getenv("SEARCH_MODE", "vector")
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", 60))
+# Candidates taken from each ranking before fusion
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+# Queries of at most this many terms are answered from the keyword index
+# without running the model when every term is selective: not a stopword and
+# found in at most LEXICAL_SHORTCUT_MAX_DOCS competencies (e.g. "GAAP")
+LEXICAL_SHORTCUT_MAX_TERMS = int(os.getenv("LEXICAL_SHORTCUT_MAX_TERMS", 2))
+LEXICAL_SHORTCUT_MAX_DOCS = int(os.getenv("LEXICAL_SHORTCUT_MAX_DOCS", 1))
+
+# Sentence encoder: "torch" (sentence-transformers) or "onnx" (int8 ONNX
+# export of MODEL_NAME made with `python -m scripts.export_onnx`)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "./onnx_model")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "model_quantized.onnx")
+# 0 lets onnxruntime pick the number of intra-op threads
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", 0))
+
+# Cache of final LLM recommendations, keyed on the query, competencies and
+# course titles; the semantic tier also reuses answers for near-duplicate
+# queries that retrieved the same competencies and courses
+RECOMMENDATION_CACHE_ENABLED = (
+    os.getenv("RECOMMENDATION_CACHE_ENABLED", "true").lower() == "true"
+)
+# Set to an empty string to keep recommendations in memory only
+RECOMMENDATION_CACHE_PATH = os.getenv(
+    "RECOMMENDATION_CACHE_PATH", "./cache/recommendations.sqlite3"
+)
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(
+    os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", 512)
+)
+RECOMMENDATION_CACHE_DISK_MAX_ENTRIES = int(
+    os.getenv("RECOMMENDATION_CACHE_DISK_MAX_ENTRIES", 20000)
+)
+RECOMMENDATION_CACHE_TTL = float(os.getenv("RECOMMENDATION_CACHE_TTL", 24 * 3600))
+# Cosine similarity a new query needs to reuse a cached answer; 0 disables
+RECOMMENDATION_SEMANTIC_THRESHOLD = float(
+    os.getenv("RECOMMENDATION_SEMANTIC_THRESHOLD", 0.92)
+)
+# Cached queries remembered per competency/course set for the semantic tier
+RECOMMENDATION_SEMANTIC_MAX_QUERIES = int(
+    os.getenv("RECOMMENDATION_SEMANTIC_MAX_QUERIES", 32)
+)
+
+# Course titles are scored locally against the query and their competency
+# before the recommendation prompt is built; see prompt_builder.py
+PROMPT_FILTER_ENABLED = os.getenv("PROMPT_FILTER_ENABLED", "true").lower() == "true"
+# Weight of query similarity vs. competency similarity in a title's score
+PROMPT_QUERY_WEIGHT = float(os.getenv("PROMPT_QUERY_WEIGHT", 0.5))
+PROMPT_COURSE_MIN_SCORE = float(os.getenv("PROMPT_COURSE_MIN_SCORE", 0.25))
+# Titles at least this similar to a better-scoring one are dropped as duplicates
+PROMPT_DEDUPE_THRESHOLD = float(os.getenv("PROMPT_DEDUPE_THRESHOLD", 0.92))
+# Estimated input tokens (about 4 characters each) for the whole prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 700))
+PROMPT_TITLE_CACHE_SIZE = int(os.getenv("PROMPT_TITLE_CACHE_SIZE", 4096))
+
+# Recommendation pipeline (pipeline.py): course searches stop once this many
+# usable course titles were found (0 waits for every competency) ...
+PIPELINE_ENOUGH_COURSES = int(os.getenv("PIPELINE_ENOUGH_COURSES", 10))
+# ... or this many seconds after the first usable titles arrived, and
+# generation starts on whatever results are ready
+PIPELINE_COURSE_WAIT = float(os.getenv("PIPELINE_COURSE_WAIT", 10))
+
+# HTTP API (api.py): concurrent competency searches are grouped into one
+# batched encode/search; a batch is sent after this many milliseconds or
+# once it holds API_MAX_BATCH_SIZE queries
+API_BATCH_WINDOW_MS = float(os.getenv("API_BATCH_WINDOW_MS", 5))
+API_MAX_BATCH_SIZE = int(os.getenv("API_MAX_BATCH_SIZE", 64))
+API_MAX_QUERY_LENGTH = int(os.getenv("API_MAX_QUERY_LENGTH", 500))
+# Upper bounds for the top_n and max_courses parameters (larger values are clamped)
+API_MAX_TOP_N = int(os.getenv("API_MAX_TOP_N", 20))
+API_MAX_COURSES = int(os.getenv("API_MAX_COURSES", 20))
+# Worker threads for blocking work (encoding, catalog lookups, prompt building)
+API_THREADS = int(os.getenv("API_THREADS", 32))
@@ -0,0 +1,122 @@
+"""Streamed recommendations through pydantic-ai's FunctionModel (no real LLM)."""
+
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.function import FunctionModel
+
+import agent
+import settings
+from models import Competency
+
+COMPETENCIES = [
+    Competency(
+        name="Data Analysis",
+        description="Inspecting and modelling data to support decisions.",
+        similarity_score=0.9,
+    )
+]
+SEARCH_RESULTS = {"Data Analysis": ["Intro to Pandas", "Statistics for Analysts"]}
+QUERY = "I want to analyse data"
+DELTAS = ["Here are ", "some courses:", "\n\n**Intro to Pandas**"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """A process-local, memory-only recommendation cache for every test."""
+    monkeypatch.setattr(settings, "RECOMMENDATION_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "RECOMMENDATION_CACHE_PATH", "")
+    monkeypatch.setattr(agent, "_recommendation_cache", None)
+
+
+def streaming_agent(deltas, error=None):
+    """Agent whose model streams `deltas`, then raises `error` if given."""
+    calls = []
+
+    async def stream(messages, info):
+        calls.append(messages)
+        for delta in deltas:
+            yield delta
+        if error is not None:
+            raise error
+
+    return Agent(FunctionModel(stream_function=stream)), calls
+
+
+def collect(search_results, competencies, llm_agent, query=QUERY):
+    async def run():
+        return [
+            chunk
+            async for chunk in agent.astream_course_message_with_llm(
+                search_results, competencies, query, llm_agent
+            )
+        ]
+
+    return asyncio.run(run())
+
+
+def cached_message(search_results=SEARCH_RESULTS, competencies=COMPETENCIES):
+    titles = agent.valid_course_titles(search_results, competencies)
+    return agent.get_recommendation_cache().get(QUERY, competencies, titles)
+
+
+def test_joined_chunks_are_the_stored_message():
+    llm_agent, calls = streaming_agent(DELTAS)
+
+    chunks = collect(SEARCH_RESULTS, COMPETENCIES, llm_agent)
+
+    assert "".join(chunks) == "".join(DELTAS)
+    assert cached_message() == "".join(chunks)
+    assert len(calls) == 1
+
+
+def test_cached_message_comes_back_in_one_piece():
+    llm_agent, calls = streaming_agent(DELTAS)
+    collect(SEARCH_RESULTS, COMPETENCIES, llm_agent)
+
+    assert collect(SEARCH_RESULTS, COMPETENCIES, llm_agent) == ["".join(DELTAS)]
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "search_results, competencies, expected",
+    [
+        ({}, [], agent.NO_COMPETENCIES_MESSAGE),
+        (
+            {"Data Analysis": ["No courses found."]},
+            COMPETENCIES,
+            agent.NO_COURSES_MESSAGE,
+        ),
+    ],
+)
+def test_canned_replies_come_back_in_one_piece(search_results, competencies, expected):
+    llm_agent, calls = streaming_agent(DELTAS)
+
+    assert collect(search_results, competencies, llm_agent) == [expected]
+    assert calls == []
+
+
+def test_no_agent_reply_comes_back_in_one_piece():
+    assert collect(SEARCH_RESULTS, COMPETENCIES, None) == [agent.NO_AGENT_MESSAGE]
+
+
+def test_error_mid_stream_yields_error_message_and_caches_nothing():
+    llm_agent, _ = streaming_agent(DELTAS[:2], error=RuntimeError("connection reset"))
+
+    chunks = collect(SEARCH_RESULTS, COMPETENCIES, llm_agent)
+
+    # Text already streamed stays; the error message is appended after it
+    *streamed, last = chunks
+    assert "".join(DELTAS[:2]).startswith("".join(streamed))
+    assert last == (
+        f"\n\n{agent.LLM_ERROR_MESSAGE}" if streamed else agent.LLM_ERROR_MESSAGE
+    )
+    assert cached_message() is None
+
+
+def test_error_before_first_delta_yields_only_the_error_message():
+    llm_agent, _ = streaming_agent([], error=RuntimeError("model unavailable"))
+
+    assert collect(SEARCH_RESULTS, COMPETENCIES, llm_agent) == [agent.LLM_ERROR_MESSAGE]
+    assert cached_message() is None
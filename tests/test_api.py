@@ -0,0 +1,23 @@
+"""Request parameter validation of the HTTP API."""
+
+import pytest
+from starlette.exceptions import HTTPException
+
+import api
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("-1", 1), ("0", 1), ("3", 3), ("1000", 20), (None, 3)]
+)
+def test_number_param_clamps_to_its_bounds(value, expected):
+    params = {} if value is None else {"top_n": value}
+
+    assert api.number_param(params, "top_n", 3, int, 1, 20) == expected
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "abc", ""])
+def test_number_param_rejects_non_finite_and_non_numbers(value):
+    with pytest.raises(HTTPException) as raised:
+        api.number_param({"threshold": value}, "threshold", 0.4, float)
+
+    assert raised.value.status_code == 400
@@ -0,0 +1,167 @@
+"""Warm-up, leasing and recycling of the browser driver pool (fake drivers)."""
+
+import threading
+import time
+
+import pytest
+
+import tools
+from browser_pool import DriverPool, DriverPoolError, SearchCancelled
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_calls = 0
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return "complete"
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class SlowFactory:
+    """Creates a FakeDriver after `delay` seconds; counts creations."""
+
+    def __init__(self, delay=0.2, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.created = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        if self.fail:
+            return None, None
+        with self._lock:
+            self.created += 1
+        return FakeDriver(), "fake"
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_first_lease_does_not_wait_for_the_whole_pool():
+    pool = DriverPool(SlowFactory(delay=0.2), size=3, max_uses=10, acquire_timeout=5)
+    try:
+        started = time.monotonic()
+        pooled = pool.acquire()
+        elapsed = time.monotonic() - started
+        pool.release(pooled)
+    finally:
+        pool.shutdown()
+
+    # Drivers start in parallel: one creation time, not size x creation time
+    assert elapsed < 0.45
+
+
+def test_start_returns_immediately_and_warms_in_the_background():
+    factory = SlowFactory(delay=0.2)
+    pool = DriverPool(factory, size=3, max_uses=10, acquire_timeout=5)
+    try:
+        started = time.monotonic()
+        pool.start()
+        assert time.monotonic() - started < 0.1
+        wait_until(lambda: pool.stats()["idle"] == 3)
+        assert factory.created == 3
+    finally:
+        pool.shutdown()
+
+
+def test_recycled_drivers_are_replaced():
+    factory = SlowFactory(delay=0.01)
+    pool = DriverPool(factory, size=2, max_uses=2, acquire_timeout=5)
+    try:
+        for _ in range(2 * 2 * 3):
+            pool.release(pool.acquire())
+        wait_until(lambda: pool.stats()["idle"] == 2)
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+
+    assert stats["alive"] == 2
+    assert factory.created > 2
+
+
+def test_acquire_fails_fast_when_no_driver_can_be_created():
+    pool = DriverPool(SlowFactory(delay=0.01, fail=True), size=2, acquire_timeout=30)
+    try:
+        started = time.monotonic()
+        with pytest.raises(DriverPoolError, match="Failed to create"):
+            pool.acquire()
+        assert time.monotonic() - started < 5
+    finally:
+        pool.shutdown()
+
+
+def test_acquire_times_out_when_every_driver_is_leased():
+    pool = DriverPool(SlowFactory(delay=0.01), size=1, acquire_timeout=5)
+    try:
+        pooled = pool.acquire()
+        with pytest.raises(DriverPoolError, match="Timed out"):
+            pool.acquire(timeout=0.1)
+        pool.release(pooled)
+    finally:
+        pool.shutdown()
+
+
+def test_acquire_stops_waiting_once_cancelled():
+    pool = DriverPool(SlowFactory(delay=0.01), size=1, acquire_timeout=30)
+    cancel_event = threading.Event()
+    try:
+        pooled = pool.acquire()
+        threading.Timer(0.1, cancel_event.set).start()
+        started = time.monotonic()
+        with pytest.raises(SearchCancelled):
+            pool.acquire(cancel_event=cancel_event)
+        assert time.monotonic() - started < 1
+        pool.release(pooled)
+    finally:
+        pool.shutdown()
+
+
+def test_cancelled_search_returns_its_driver_to_the_pool(monkeypatch):
+    factory = SlowFactory(delay=0.01)
+    pool = DriverPool(factory, size=1, acquire_timeout=5)
+    monkeypatch.setattr(tools, "_driver_pool", pool)
+    cancel_event = threading.Event()
+
+    def scrape(pooled, search_term, max_courses, cancel_event):
+        cancel_event.set()
+        raise SearchCancelled()
+
+    monkeypatch.setattr(tools, "_scrape_coniverse_courses", scrape)
+    try:
+        courses = tools.get_coniverse_courses_selenium("python", 5, cancel_event)
+        idle = pool.acquire()
+    finally:
+        pool.shutdown()
+
+    assert courses == ["Error retrieving courses: search cancelled"]
+    # The same driver, page load stopped, was leased again instead of a new one
+    assert "window.stop();" in idle.driver.scripts
+    assert idle.uses == 2
+    assert factory.created == 1
+
+
+def test_cancelled_search_does_not_wait_for_a_driver(monkeypatch):
+    pool = DriverPool(SlowFactory(delay=0.01), size=1, acquire_timeout=30)
+    monkeypatch.setattr(tools, "_driver_pool", pool)
+    cancel_event = threading.Event()
+    cancel_event.set()
+    try:
+        leased = pool.acquire()
+        started = time.monotonic()
+        courses = tools.get_coniverse_courses_selenium("python", 5, cancel_event)
+        assert time.monotonic() - started < 1
+        pool.release(leased)
+    finally:
+        pool.shutdown()
+
+    assert courses == ["Error retrieving courses: search cancelled"]
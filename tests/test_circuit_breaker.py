@@ -0,0 +1,212 @@
+"""Circuit breaker state machine, and how course searches report to it."""
+
+import asyncio
+
+import pytest
+
+import async_scraper
+import settings
+import tools
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(
+        failure_rate_threshold=0.5,
+        slow_call_seconds=10,
+        slow_call_rate_threshold=0.8,
+        window_size=10,
+        min_calls=4,
+        open_seconds=30,
+        max_open_seconds=100,
+        half_open_max_calls=1,
+        clock=clock,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker(clock)
+    for _ in range(3):
+        breaker.record_failure(1)
+
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_at_the_failure_rate_threshold(clock):
+    breaker = make_breaker(clock)
+    breaker.record_success(1)
+    breaker.record_success(1)
+    breaker.record_failure(1)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure(1)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_opens_when_most_calls_are_slow(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_success(12)
+
+    assert breaker.state == OPEN
+
+
+def test_half_opens_after_the_open_period_and_limits_trial_calls(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+
+    clock.advance(29)
+    assert breaker.state == OPEN
+    clock.advance(1)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_call_closes(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    breaker.record_success(1)
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_calls"] == 0
+
+
+def test_failed_trial_call_reopens_for_twice_as_long_up_to_the_cap(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+
+    for open_seconds in (60, 100, 100):
+        clock.advance(breaker.snapshot()["retry_in_seconds"])
+        assert breaker.allow_request()
+        breaker.record_failure(1)
+        assert breaker.state == OPEN
+        assert breaker.snapshot()["retry_in_seconds"] == pytest.approx(open_seconds)
+
+
+def test_slow_trial_call_reopens(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    breaker.record_success(15)
+
+    assert breaker.state == OPEN
+
+
+def test_release_frees_the_trial_slot_without_a_verdict(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_late_outcome_while_open_is_ignored(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1)
+
+    breaker.record_success(1)
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["trips"] == 1
+
+
+@pytest.fixture
+def course_search(monkeypatch, clock):
+    """A fresh breaker and an in-memory course cache for tools/async_scraper."""
+    monkeypatch.setattr(settings, "COURSE_CACHE_PATH", "")
+    monkeypatch.setattr(settings, "COURSE_SEARCH_RETRIES", 2)
+    monkeypatch.setattr(tools, "_course_cache", None)
+    breaker = make_breaker(clock)
+    monkeypatch.setattr(tools, "_course_breaker", breaker)
+    return breaker
+
+
+def test_busy_browser_pool_is_not_blamed_on_coniverse(monkeypatch, course_search):
+    attempts = []
+
+    def fetch(search_term, max_courses):
+        attempts.append(search_term)
+        return [f"{tools.BROWSER_UNAVAILABLE}: Timed out waiting for a free driver"]
+
+    monkeypatch.setattr(tools, "_fetch_coniverse_courses", fetch)
+
+    courses = tools.get_all_coniverse_courses("python", 5)
+
+    assert tools.is_browser_unavailable(courses)
+    assert attempts == ["python"]
+    assert course_search.snapshot()["failures"] == 0
+    assert tools.get_course_cache().get(tools.course_cache_key("python", 5)) is None
+
+
+def test_coniverse_errors_are_recorded_and_retried(monkeypatch, course_search):
+    monkeypatch.setattr(tools, "backoff_delays", lambda retries: [0] * retries)
+    attempts = []
+
+    def fetch(search_term, max_courses):
+        attempts.append(search_term)
+        return ["Error loading page: connection refused"]
+
+    monkeypatch.setattr(tools, "_fetch_coniverse_courses", fetch)
+
+    tools.get_all_coniverse_courses("python", 5)
+
+    assert len(attempts) == 3
+    assert course_search.snapshot()["failures"] == 3
+
+
+def test_async_search_does_not_blame_a_busy_browser_pool(monkeypatch, course_search):
+    attempts = []
+
+    async def attempt(self, search_term, max_courses):
+        attempts.append(search_term)
+        return [f"{tools.BROWSER_UNAVAILABLE}: Timed out waiting for a free driver"]
+
+    monkeypatch.setattr(async_scraper.AsyncCourseSearcher, "_attempt", attempt)
+
+    async def run():
+        async with async_scraper.AsyncCourseSearcher(hedge=False) as searcher:
+            return await searcher.search("python", 5)
+
+    courses = asyncio.run(run())
+
+    assert tools.is_browser_unavailable(courses)
+    assert attempts == ["python"]
+    assert course_search.snapshot()["failures"] == 0
@@ -0,0 +1,177 @@
+"""HTTP course fetch against the local coniverse stub serving recorded pages."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+import async_scraper
+import settings
+import tools
+from scripts.coniverse_stub import start_stub_server
+
+FIXTURES = Path(__file__).parent / "fixtures" / "coniverse"
+
+DATA_ANALYSIS = [
+    "Data Analysis with Python",
+    "Excel for Data Analysts",
+    "Statistics & Probability Basics",
+    "Data Visualization Fundamentals",
+    "Storytelling with Dashboards",
+]
+MACHINE_LEARNING = [
+    "Machine Learning Foundations",
+    "Applied Deep Learning",
+    "Model Evaluation in Practice",
+]
+PROJECT_MANAGEMENT = ["Project Management Essentials", "Agile Project Delivery"]
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    # No generated fallback page: unrecorded searches come back empty
+    server = start_stub_server(recordings_dir=FIXTURES, fallback_courses=0)
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def coniverse(monkeypatch, stub_url):
+    """Point course searches at the stub, with no cache, retries or browser."""
+    monkeypatch.setattr(settings, "CONIVERSE_BASE_URL", stub_url)
+    monkeypatch.setattr(settings, "COURSE_CACHE_PATH", "")
+    monkeypatch.setattr(settings, "COURSE_SEARCH_RETRIES", 0)
+    monkeypatch.setattr(tools, "_course_cache", None)
+    monkeypatch.setattr(tools, "_course_breaker", None)
+    selenium_searches = []
+
+    def selenium(search_term, max_courses=settings.MAX_COURSES, cancel_event=None):
+        selenium_searches.append(search_term)
+        return ["Selenium Result Title"]
+
+    monkeypatch.setattr(tools, "get_coniverse_courses_selenium", selenium)
+    monkeypatch.setattr(async_scraper, "get_coniverse_courses_selenium", selenium)
+    return selenium_searches
+
+
+@pytest.mark.parametrize(
+    "fixture, content_type, expected",
+    [
+        ("data-analysis.html", "text/html", DATA_ANALYSIS),
+        ("machine-learning.json", "application/json", MACHINE_LEARNING),
+        ("project-management.html", "text/html", PROJECT_MANAGEMENT),
+    ],
+)
+def test_parse_recorded_responses(fixture, content_type, expected):
+    body = (FIXTURES / fixture).read_text("utf-8")
+
+    titles = tools.filter_course_titles(
+        tools.parse_search_response(content_type, body), max_courses=10
+    )
+
+    assert titles == expected
+
+
+def test_empty_results_page_has_no_titles():
+    body = (FIXTURES / "no-results.html").read_text("utf-8")
+
+    assert tools.parse_search_response("text/html", body) == []
+
+
+@pytest.mark.parametrize(
+    "search_term, expected",
+    [
+        ("Data Analysis", DATA_ANALYSIS),
+        ("Machine Learning", MACHINE_LEARNING),
+        ("Project Management", PROJECT_MANAGEMENT),
+    ],
+)
+def test_fetch_extracts_titles_from_the_stub(coniverse, search_term, expected):
+    assert tools.fetch_coniverse_courses_http(search_term, max_courses=10) == expected
+
+
+def test_fetch_caps_the_number_of_titles(coniverse):
+    courses = tools.fetch_coniverse_courses_http("Data Analysis", max_courses=2)
+
+    assert courses == DATA_ANALYSIS[:2]
+
+
+def test_fetch_of_an_empty_page_returns_no_titles(coniverse):
+    assert tools.fetch_coniverse_courses_http("No Results", max_courses=10) == []
+
+
+def test_fetch_raises_on_an_error_status(coniverse):
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        tools.fetch_coniverse_courses_http("Broken Search", max_courses=10)
+
+    assert excinfo.value.response.status_code == 503
+
+
+@pytest.mark.parametrize(
+    "search_term, expected",
+    [("Machine Learning", MACHINE_LEARNING), ("No Results", ["No courses found."])],
+)
+def test_http_mode_answers_without_a_browser(
+    monkeypatch, coniverse, search_term, expected
+):
+    monkeypatch.setattr(settings, "COURSE_FETCH_MODE", "http")
+
+    courses = tools.get_all_coniverse_courses(search_term, 10, use_cache=False)
+
+    assert courses == expected
+    assert coniverse == []
+
+
+def test_http_mode_reports_an_error_status(monkeypatch, coniverse):
+    monkeypatch.setattr(settings, "COURSE_FETCH_MODE", "http")
+
+    courses = tools.get_all_coniverse_courses("Broken Search", 10, use_cache=False)
+
+    assert len(courses) == 1
+    assert courses[0].startswith("Error retrieving courses:")
+    assert "503" in courses[0]
+    assert coniverse == []
+
+
+@pytest.mark.parametrize("search_term", ["No Results", "Broken Search"])
+def test_http_first_falls_back_to_the_browser(monkeypatch, coniverse, search_term):
+    monkeypatch.setattr(settings, "COURSE_FETCH_MODE", "http_first")
+
+    courses = tools.get_all_coniverse_courses(search_term, 10, use_cache=False)
+
+    assert courses == ["Selenium Result Title"]
+    assert coniverse == [search_term]
+
+
+def test_http_first_uses_the_http_result_when_it_has_titles(monkeypatch, coniverse):
+    monkeypatch.setattr(settings, "COURSE_FETCH_MODE", "http_first")
+
+    courses = tools.get_all_coniverse_courses("Data Analysis", 10, use_cache=False)
+
+    assert courses == DATA_ANALYSIS
+    assert coniverse == []
+
+
+@pytest.mark.parametrize(
+    "search_term, expected",
+    [
+        ("Data Analysis", DATA_ANALYSIS),
+        ("No Results", ["Selenium Result Title"]),
+        ("Broken Search", ["Selenium Result Title"]),
+    ],
+)
+def test_async_search_fetches_from_the_stub(
+    monkeypatch, coniverse, search_term, expected
+):
+    monkeypatch.setattr(settings, "COURSE_FETCH_MODE", "http_first")
+
+    async def run():
+        async with async_scraper.AsyncCourseSearcher(
+            hedge=False, use_cache=False
+        ) as searcher:
+            return await searcher.search(search_term, 10)
+
+    assert asyncio.run(run()) == expected
@@ -0,0 +1,111 @@
+"""Keyword index, rank fusion and the hybrid search's lexical shortcut."""
+
+import numpy as np
+import pytest
+
+import settings
+import vector_db
+from lexical_index import BM25Index, reciprocal_rank_fusion
+from models import Competency
+from search_backends import NumpySearchBackend
+
+
+@pytest.fixture(scope="module")
+def competency_df():
+    return vector_db.load_competency_data(settings.COMPETENCY_DATA_PATH)
+
+
+@pytest.fixture(scope="module")
+def lexical(competency_df):
+    return BM25Index(competency_df["competency"], competency_df["description"])
+
+
+class CountingEncoder:
+    """Random unit vectors; records which queries were encoded."""
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        rng = np.random.default_rng(len(self.encoded))
+        return rng.normal(size=(len(texts), self.dim)).astype(np.float32)
+
+
+@pytest.fixture
+def hybrid_index(monkeypatch, competency_df, lexical):
+    """Register a hybrid search index over the real competency data."""
+    monkeypatch.setattr(settings, "SEARCH_MODE", "hybrid")
+    client = object()
+    embeddings = np.random.default_rng(0).normal(size=(len(competency_df), 16))
+    backend = NumpySearchBackend(
+        embeddings,
+        {
+            "competency": competency_df["competency"].to_numpy(),
+            "description": competency_df["description"].to_numpy(),
+        },
+    )
+    key = (id(client), "test")
+    monkeypatch.setitem(
+        vector_db._indexes, key, vector_db.SearchIndex(backend, lexical)
+    )
+    return client
+
+
+def search(client, model, query):
+    return vector_db.search_competencies(
+        client, model, query, collection_name="test", top_n=3, similarity_threshold=0
+    )
+
+
+@pytest.mark.parametrize("query", ["GAAP", "IFRS", "rigging"])
+def test_rare_terms_take_the_shortcut(lexical, query):
+    assert vector_db._lexical_shortcut(lexical, query)
+
+
+@pytest.mark.parametrize(
+    "query", ["the", "and", "excel", "leadership", "data analysis", "c++ the"]
+)
+def test_stopwords_and_common_terms_do_not_take_the_shortcut(lexical, query):
+    assert not vector_db._lexical_shortcut(lexical, query)
+
+
+def test_shortcut_answers_from_the_keyword_index(hybrid_index):
+    model = CountingEncoder()
+
+    competencies = search(hybrid_index, model, "GAAP")
+
+    assert model.encoded == []
+    assert [comp.name for comp in competencies] == ["Accounting Standards Knowledge"]
+    # Found by one of the two rankings only, so not a perfect score
+    assert competencies[0].similarity_score == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("query", ["the", "excel", "leadership", "data analysis"])
+def test_broad_queries_run_the_model(hybrid_index, query):
+    model = CountingEncoder()
+
+    competencies = search(hybrid_index, model, query)
+
+    assert model.encoded == [query]
+    assert len(competencies) == 3
+    assert len({comp.name for comp in competencies}) == 3
+    assert all(comp.similarity_score < 1 for comp in competencies)
+
+
+def competency(name):
+    return Competency(name=name, description="", similarity_score=0.0)
+
+
+def test_rrf_is_normalised_by_the_rankings_fused():
+    a, b, c = competency("A"), competency("B"), competency("C")
+
+    agreed = reciprocal_rank_fusion([[a, b], [a, c]], top_n=3)
+    single = reciprocal_rank_fusion([[a, b], []], top_n=3)
+
+    assert agreed[0].name == "A"
+    assert agreed[0].similarity_score == pytest.approx(1.0)
+    assert [comp.name for comp in single] == ["A", "B"]
+    assert single[0].similarity_score == pytest.approx(0.5)
+    assert reciprocal_rank_fusion([[], []], top_n=3) == []
@@ -0,0 +1,39 @@
+"""Exact and semantic tiers of the recommendation cache."""
+
+import numpy as np
+
+from agent import RecommendationCache
+from caching import LRUCache, TieredCache
+from models import Competency
+
+COMPETENCIES = [
+    Competency(name="Data Analytics", description="Analysing data.", similarity_score=1)
+]
+TITLES = {"Data Analytics": ["Intro to Pandas"]}
+VECTORS = {
+    "data analysis": np.array([1.0, 0.0]),
+    "analysing data": np.array([0.99, 0.1]),
+}
+
+
+def make_cache():
+    return RecommendationCache(
+        TieredCache(LRUCache(maxsize=16)), semantic_threshold=0.9
+    )
+
+
+def test_close_query_with_a_cached_embedding_reuses_the_answer():
+    cache = make_cache()
+    cache.set("data analysis", COMPETENCIES, TITLES, "message", VECTORS.get)
+
+    assert cache.get("analysing data", COMPETENCIES, TITLES, VECTORS.get) == "message"
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_query_without_an_embedding_only_matches_exactly():
+    cache = make_cache()
+    cache.set("data analyst", COMPETENCIES, TITLES, "message", VECTORS.get)
+
+    assert cache.get("Data  Analyst", COMPETENCIES, TITLES, VECTORS.get) == "message"
+    assert cache.get("data analysis", COMPETENCIES, TITLES, VECTORS.get) is None
+    assert cache.stats()["semantic_hits"] == 0
@@ -1,19 +1,25 @@
+import atexit
+import itertools
+import json
 import logging
+import os
+import signal
 import subprocess
 import sys
+import threading
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
 
-# Import multiple webdriver options to try different approaches
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+import httpx
 
 import settings
+from browser_pool import DriverPool, DriverPoolError, SearchCancelled
+from caching import LRUCache, SQLiteCache, TieredCache
+from circuit_breaker import CircuitBreaker, backoff_delays
+from debug_capture import get_debug_capture
+from models import Competency
 
 # Set up logging
 logging.basicConfig(
@@ -66,11 +72,62 @@ def kill_browser_processes():
         logger.warning(f"Error killing browser processes: {e}")
 
 
-def create_simple_driver():
-    """Create a minimal browser driver that works in containerized environments"""
+def _descendant_pids(pid: int) -> list[int]:
+    """Child processes of `pid`, recursively."""
+    result = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True)
+    children = [int(child) for child in result.stdout.split()]
+    return children + [pid for child in children for pid in _descendant_pids(child)]
+
+
+def kill_driver_processes(driver) -> bool:
+    """Kill one driver's webdriver process and the browser it launched.
+
+    Returns False when the driver's process can't be identified.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return False
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/f", "/t", "/pid", str(process.pid)],
+                stderr=subprocess.PIPE,
+            )
+        else:
+            # Collected first: once the driver dies its browser is reparented
+            for pid in [process.pid, *_descendant_pids(process.pid)]:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        process.wait(timeout=5)
+        logger.info(f"Killed wedged driver process {process.pid} and its browser")
+        return True
+    except Exception as e:
+        logger.warning(f"Error killing driver process {process.pid}: {e}")
+        return False
 
-    # Kill any existing browser processes
-    kill_browser_processes()
+
+def kill_wedged_driver(driver):
+    """Kill a pooled driver that would not quit, leaving its siblings running."""
+    if not kill_driver_processes(driver):
+        # Last resort: this also kills browsers in use by other searches
+        logger.warning("Wedged driver's processes not found, killing all browsers")
+        kill_browser_processes()
+
+
+def create_simple_driver(kill_existing=True):
+    """Create a minimal browser driver that works in containerized environments"""
+    # Selenium is imported on first use so HTTP-only searches and app
+    # startup never pay for it; try multiple webdriver options
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+    # Kill any existing browser processes (skipped for pooled drivers, which
+    # must not take down their siblings)
+    if kill_existing:
+        kill_browser_processes()
 
     drivers_to_try = []
 
@@ -82,6 +139,9 @@ def create_simple_driver():
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
+        # Return from driver.get() at DOMContentLoaded; wait_for_search_results
+        # decides when the page is actually usable
+        chrome_options.page_load_strategy = "eager"
 
         # Add Chrome to drivers to try
         drivers_to_try.append(("chrome", chrome_options))
@@ -94,6 +154,7 @@ def create_simple_driver():
         firefox_options = FirefoxOptions()
         firefox_options.add_argument("--headless")
         firefox_options.add_argument("--no-sandbox")
+        firefox_options.page_load_strategy = "eager"
 
         # Add Firefox to drivers to try
         drivers_to_try.append(("firefox", firefox_options))
@@ -119,7 +180,9 @@ def create_simple_driver():
 
             # Set short timeouts
             driver.set_page_load_timeout(30)
-            driver.implicitly_wait(20)
+            # No implicit wait: every selector miss would otherwise stall.
+            # Readiness is handled explicitly by wait_for_search_results.
+            driver.implicitly_wait(0)
 
             return driver, driver_name
 
@@ -133,152 +196,795 @@ def create_simple_driver():
                 pass
 
             # Kill processes before trying next driver
-            kill_browser_processes()
+            if kill_existing:
+                kill_browser_processes()
 
     # If we got here, all driver attempts failed
     logger.error("All driver initialization attempts failed")
     return None, None
 
 
-def get_all_coniverse_courses(
-    search_term: str = "", max_courses=settings.MAX_COURSES
+# Ordered from most to least specific; the first selector yielding titles wins
+COURSE_TITLE_SELECTORS = [
+    'span[data-qa="txt-name"]',
+    ".txt-name",
+    ".card-content span",
+    ".search-result-card span",
+    'div[id="search-courses-page"] span',
+    ".course-card .title",
+    ".course-title",
+    "h3.course-name",
+    ".course-list .item-title",
+    'a[href*="/course/"] .title',
+    # More general selectors
+    ".card h3",
+    "h3",
+    ".card span",
+]
+
+# Selectors that only match once search results have rendered. The generic
+# selectors above also match page chrome, so they don't signal readiness.
+RESULT_CARD_SELECTORS = COURSE_TITLE_SELECTORS[:4]
+
+EMPTY_STATE_SELECTORS = [
+    '[data-qa="empty-state"]',
+    ".empty-state",
+    ".no-result",
+    ".no-results",
+]
+
+EMPTY_STATE_MARKERS = [
+    "no results",
+    "no result found",
+    "no courses found",
+    "ไม่พบ",
+]
+
+TITLE_STOPLIST = ["coniverse", "results", "filters", "search", "course"]
+MIN_TITLE_LENGTH = 5
+
+_READINESS_PROBE_JS = """
+const [cardSelectors, emptySelectors, emptyMarkers] = arguments;
+let count = 0;
+for (const selector of cardSelectors) {
+    const titled = Array.from(document.querySelectorAll(selector)).filter(
+        (el) => (el.innerText || "").trim().length > 5
+    );
+    if (titled.length > 0) {
+        count = titled.length;
+        break;
+    }
+}
+let empty = false;
+if (count === 0) {
+    empty = emptySelectors.some((selector) => document.querySelector(selector));
+    if (!empty && document.body) {
+        const text = document.body.innerText.toLowerCase();
+        empty = emptyMarkers.some((marker) => text.includes(marker));
+    }
+}
+return [document.readyState, count, empty];
+"""
+
+
+class _SearchResultsReady:
+    """WebDriverWait condition for the coniverse search page.
+
+    Resolves to "results" once `min_results` titles are rendered (or the
+    title count has stopped changing for `settle_time` seconds after the
+    document finished loading), or to "empty" when the page shows an
+    empty-state marker.
+    """
+
+    def __init__(self, min_results, settle_time, cancel_event=None):
+        self.min_results = max(1, min_results)
+        self.settle_time = settle_time
+        self.cancel_event = cancel_event
+        self._last_count = 0
+        self._last_change = time.monotonic()
+
+    def __call__(self, driver):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+        ready_state, count, empty = driver.execute_script(
+            _READINESS_PROBE_JS,
+            RESULT_CARD_SELECTORS,
+            EMPTY_STATE_SELECTORS,
+            EMPTY_STATE_MARKERS,
+        )
+        now = time.monotonic()
+        if count != self._last_count:
+            self._last_count = count
+            self._last_change = now
+
+        if count >= self.min_results:
+            return "results"
+        if empty:
+            return "empty"
+        if (
+            count > 0
+            and ready_state == "complete"
+            and now - self._last_change >= self.settle_time
+        ):
+            return "results"
+        return False
+
+
+def wait_for_search_results(
+    driver,
+    min_results=settings.MAX_COURSES,
+    timeout=settings.SCRAPER_READY_TIMEOUT,
+    poll_frequency=settings.SCRAPER_POLL_INTERVAL,
+    settle_time=settings.SCRAPER_SETTLE_TIME,
+    cancel_event=None,
+) -> str:
+    """Poll the search page until results or an empty state are shown.
+
+    Returns "results", "empty" or "timeout". Raises `SearchCancelled` as soon
+    as `cancel_event` is set.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    started = time.monotonic()
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+            _SearchResultsReady(min_results, settle_time, cancel_event)
+        )
+    except TimeoutException:
+        state = "timeout"
+    logger.info(
+        f"Search page readiness: {state} after {time.monotonic() - started:.2f}s"
+    )
+    return state
+
+
+def build_search_url(search_term: str) -> str:
+    encoded_search_term = urllib.parse.quote_plus(search_term)
+    return (
+        f"{settings.CONIVERSE_BASE_URL.rstrip('/')}{settings.CONIVERSE_SEARCH_PATH}"
+        f"?search={encoded_search_term}&ordering=relevance"
+    )
+
+
+def _is_course_title(title_text: str, course_titles: list) -> bool:
+    return bool(
+        title_text
+        and len(title_text) > MIN_TITLE_LENGTH
+        and title_text.lower() not in TITLE_STOPLIST
+        and title_text not in course_titles
+    )
+
+
+def filter_course_titles(candidates, max_courses=settings.MAX_COURSES) -> list:
+    course_titles = []
+    for title_text in candidates:
+        if _is_course_title(title_text, course_titles):
+            course_titles.append(title_text)
+            if len(course_titles) >= max_courses:
+                break
+    return course_titles
+
+
+# Keys that hold the result list in JSON search responses / embedded app state
+_JSON_RESULT_KEYS = ("results", "courses", "items", "data", "list")
+_JSON_TITLE_KEYS = ("name", "title")
+
+
+def _titles_from_json(data) -> list:
+    """Breadth-first search for the first list of course-like objects."""
+    pending = [data]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, dict):
+            # Visit likely result containers before anything else
+            pending[:0] = [
+                node[key]
+                for key in _JSON_RESULT_KEYS
+                if isinstance(node.get(key), (dict, list))
+            ]
+            pending.extend(
+                value
+                for key, value in node.items()
+                if key not in _JSON_RESULT_KEYS and isinstance(value, (dict, list))
+            )
+        elif isinstance(node, list):
+            items = [item for item in node if isinstance(item, dict)]
+            for key in _JSON_TITLE_KEYS:
+                titles = [
+                    item[key].strip()
+                    for item in items
+                    if isinstance(item.get(key), str)
+                ]
+                if titles and len(titles) * 2 >= len(node):
+                    return titles
+            pending.extend(item for item in node if isinstance(item, (dict, list)))
+    return []
+
+
+class _CourseTitleParser(HTMLParser):
+    """Collects course title text and embedded JSON from a search page."""
+
+    _TITLE_CLASSES = {"txt-name", "course-title", "course-name", "item-title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.titles = []
+        self.json_blobs = []
+        self._capture_depth = 0
+        self._capture_parts = []
+        self._in_json_script = False
+        self._script_parts = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script":
+            script_type = (attrs.get("type") or "").lower()
+            self._in_json_script = "json" in script_type or attrs.get("id") in (
+                "__NEXT_DATA__",
+                "__NUXT_DATA__",
+            )
+            self._script_parts = []
+            return
+
+        if self._capture_depth:
+            self._capture_depth += 1
+            return
+
+        classes = set((attrs.get("class") or "").split())
+        if attrs.get("data-qa") == "txt-name" or classes & self._TITLE_CLASSES:
+            self._capture_depth = 1
+            self._capture_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            if self._in_json_script:
+                self.json_blobs.append("".join(self._script_parts))
+            self._in_json_script = False
+            return
+
+        if self._capture_depth:
+            self._capture_depth -= 1
+            if not self._capture_depth:
+                self.titles.append(" ".join("".join(self._capture_parts).split()))
+
+    def handle_data(self, data):
+        if self._in_json_script:
+            self._script_parts.append(data)
+        elif self._capture_depth:
+            self._capture_parts.append(data)
+
+
+def parse_search_response(content_type: str, body: str) -> list:
+    """Extract candidate course titles from a search page or JSON response."""
+    if "json" in content_type or body.lstrip().startswith(("{", "[")):
+        try:
+            return _titles_from_json(json.loads(body))
+        except ValueError:
+            pass
+
+    parser = _CourseTitleParser()
+    parser.feed(body)
+    parser.close()
+    if parser.titles:
+        return parser.titles
+
+    for blob in parser.json_blobs:
+        try:
+            titles = _titles_from_json(json.loads(blob))
+        except ValueError:
+            continue
+        if titles:
+            return titles
+    return []
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def http_client_options() -> dict:
+    """Keyword arguments for the httpx clients (sync and async) fetching searches."""
+    return dict(
+        timeout=settings.HTTP_FETCH_TIMEOUT,
+        follow_redirects=True,
+        headers={
+            "User-Agent": "Mozilla/5.0 (compatible; LearningPathAssistant)",
+            "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+        },
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared HTTP client so connections are reused across searches"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(**http_client_options())
+            atexit.register(_http_client.close)
+    return _http_client
+
+
+def courses_from_response(response: httpx.Response, max_courses: int) -> list:
+    """Course titles in a search response; raises `httpx.HTTPError` on error status."""
+    response.raise_for_status()
+    course_titles = filter_course_titles(
+        parse_search_response(response.headers.get("content-type", ""), response.text),
+        max_courses,
+    )
+    logger.info(f"HTTP fetch found {len(course_titles)} courses")
+    return course_titles
+
+
+def fetch_coniverse_courses_http(
+    search_term: str, max_courses=settings.MAX_COURSES
 ) -> list:
-    driver = None
-    driver_name = None
+    """Fetch course titles without a browser.
 
-    try:
-        logger.info(f"Starting course search for: {search_term}")
+    Returns an empty list when the response holds no recognisable titles;
+    raises `httpx.HTTPError` on transport or HTTP status errors.
+    """
+    url = build_search_url(search_term)
+    logger.info(f"Fetching search results over HTTP: {url}")
+    return courses_from_response(get_http_client().get(url), max_courses)
 
-        # Create a minimal driver that works
-        driver, driver_name = create_simple_driver()
 
-        if not driver:
-            return ["Error: Failed to create any browser driver"]
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
 
-        logger.info(f"Successfully created {driver_name} driver")
 
-        # Now use the driver for the actual task
-        encoded_search_term = urllib.parse.quote_plus(search_term)
-        url = f"https://coniverse.com/search/learning/courses?search={encoded_search_term}&ordering=relevance"
+def get_driver_pool() -> DriverPool:
+    """Return the process-wide browser pool, creating it on first use"""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(
+                factory=lambda: create_simple_driver(kill_existing=False),
+                on_wedged=kill_wedged_driver,
+            )
+            atexit.register(_driver_pool.shutdown)
+    return _driver_pool
+
+
+_course_cache = None
+_course_cache_lock = threading.Lock()
+
+
+def get_course_cache() -> TieredCache:
+    """Return the process-wide course search cache, creating it on first use"""
+    global _course_cache
+    with _course_cache_lock:
+        if _course_cache is None:
+            disk = None
+            if settings.COURSE_CACHE_PATH:
+                try:
+                    disk = SQLiteCache(
+                        settings.COURSE_CACHE_PATH,
+                        table="course_searches",
+                        max_entries=settings.COURSE_CACHE_DISK_MAX_ENTRIES,
+                    )
+                except Exception as e:
+                    logger.warning(f"On-disk course cache unavailable: {e}")
+            _course_cache = TieredCache(
+                LRUCache(
+                    maxsize=settings.COURSE_CACHE_MAX_ENTRIES,
+                    default_ttl=settings.COURSE_CACHE_TTL,
+                ),
+                disk,
+            )
+    return _course_cache
 
-        logger.info(f"Navigating to URL: {url}")
 
-        try:
-            driver.get(url)
-            logger.info("Page requested successfully")
-        except TimeoutException:
-            logger.warning("Page load timed out. Trying to continue anyway...")
-            try:
-                driver.execute_script("window.stop();")
-            except Exception as e:
-                logger.error(f"Failed to stop page load: {e}")
-        except Exception as e:
-            logger.error(f"Error loading page: {e}")
-            return [f"Error loading page: {str(e)}"]
+def normalize_search_term(search_term: str) -> str:
+    return " ".join(search_term.casefold().split())
 
-        # Log some debug info
-        logger.info(f"Current page title: {driver.title}")
-        logger.info(f"Current URL: {driver.current_url}")
 
-        # Take a screenshot for debugging
-        try:
-            screenshot_path = f"/tmp/coniverse_search_{int(time.time())}.png"
-            driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot saved to {screenshot_path}")
-        except Exception as e:
-            logger.warning(f"Failed to save screenshot: {e}")
+def course_cache_key(search_term: str, max_courses: int) -> str:
+    return f"{normalize_search_term(search_term)}|{max_courses}"
+
+
+def course_cache_ttl(courses: list) -> float:
+    if any(course.startswith("Error") for course in courses):
+        return settings.COURSE_CACHE_ERROR_TTL
+    if courses == ["No courses found."]:
+        return settings.COURSE_CACHE_EMPTY_TTL
+    return settings.COURSE_CACHE_TTL
+
+
+COURSE_SEARCH_UNAVAILABLE = (
+    "Error retrieving courses: course search is temporarily unavailable"
+)
+
+
+# A search that never reached coniverse because no browser driver was free
+BROWSER_UNAVAILABLE = "Error retrieving courses: no browser driver available"
+
+
+def is_error_result(courses: list) -> bool:
+    return bool(courses) and courses[0].startswith("Error")
+
+
+def is_browser_unavailable(courses: list) -> bool:
+    """True when the search failed locally, waiting for a pooled browser."""
+    return bool(courses) and courses[0].startswith(BROWSER_UNAVAILABLE)
+
+
+def usable_courses(courses: list[str]) -> list[str]:
+    """Course titles without the placeholder and error strings of a search."""
+    return [
+        course
+        for course in courses or []
+        if course and course != "No courses found." and not course.startswith("Error")
+    ]
+
+
+_course_breaker = None
+_course_breaker_lock = threading.Lock()
+
+
+def get_course_breaker() -> CircuitBreaker:
+    """Return the process-wide circuit breaker guarding coniverse searches"""
+    global _course_breaker
+    with _course_breaker_lock:
+        if _course_breaker is None:
+            _course_breaker = CircuitBreaker("coniverse")
+    return _course_breaker
+
+
+def cached_courses(search_term: str, max_courses: int) -> list | None:
+    """Courses cached for this search, or None."""
+    cached = get_course_cache().get(course_cache_key(search_term, max_courses))
+    if cached is None:
+        return None
+    logger.info(f"Course cache hit for: {search_term}")
+    return list(cached)
+
 
-        # Wait for page to load
-        logger.info("Waiting for page to load...")
+def cache_courses(search_term: str, max_courses: int, courses: list):
+    """Cache a search result; errors expire sooner, local failures aren't kept."""
+    if is_browser_unavailable(courses):
+        return
+    get_course_cache().set(
+        course_cache_key(search_term, max_courses),
+        courses,
+        ttl=course_cache_ttl(courses),
+    )
+
+
+def search_retry_delays():
+    """Backoff before each retry of a course search, then None (no more retries)."""
+    return itertools.chain(backoff_delays(settings.COURSE_SEARCH_RETRIES), [None])
+
+
+def admit_search(breaker: CircuitBreaker) -> bool:
+    if breaker.allow_request():
+        return True
+    logger.warning(f"Course search circuit is {breaker.state}, skipping scrape")
+    return False
+
+
+def report_search(breaker: CircuitBreaker, courses: list, duration: float) -> bool:
+    """Tell the breaker how an admitted attempt went; True when it is final.
+
+    A search that failed for lack of a free browser says nothing about
+    coniverse, so it releases the breaker slot and is not retried.
+    """
+    if is_browser_unavailable(courses):
+        breaker.release()
+        return True
+    failed = is_error_result(courses)
+    breaker.record(duration, success=not failed)
+    return not failed
+
+
+def uses_http_fetch() -> bool:
+    return settings.COURSE_FETCH_MODE in ("http", "http_first")
+
+
+def http_fetch_result(course_titles=None, error=None) -> list | None:
+    """Result of the HTTP step of a search, or None to fall back to Selenium.
+
+    Takes the titles the HTTP fetch found or the `httpx.HTTPError` it raised.
+    """
+    if course_titles:
+        return course_titles
+    if error is not None:
+        logger.warning(f"HTTP fetch failed: {error}")
+        if settings.COURSE_FETCH_MODE == "http":
+            return [f"Error retrieving courses: {str(error)}"]
+    else:
+        logger.info("HTTP fetch returned no courses")
+
+    if settings.COURSE_FETCH_MODE == "http":
+        return ["No courses found."]
+    logger.info("Falling back to Selenium")
+    return None
+
+
+def get_all_coniverse_courses(
+    search_term: str = "", max_courses=settings.MAX_COURSES, use_cache=True
+) -> list:
+    use_cache = use_cache and settings.COURSE_CACHE_ENABLED
+    if use_cache:
+        cached = cached_courses(search_term, max_courses)
+        if cached is not None:
+            return cached
+
+    breaker = get_course_breaker()
+    courses = None
+    for delay in search_retry_delays():
+        if not admit_search(breaker):
+            break
+
+        started = time.monotonic()
+        courses = _fetch_coniverse_courses(search_term, max_courses)
+        if report_search(breaker, courses, time.monotonic() - started):
+            break
+        if delay is None:
+            break
+        logger.info(f"Retrying course search for {search_term} in {delay:.2f}s")
+        time.sleep(delay)
+
+    if courses is None:
+        return [COURSE_SEARCH_UNAVAILABLE]
+
+    if use_cache:
+        cache_courses(search_term, max_courses, courses)
+    return courses
+
+
+def _fetch_coniverse_courses(search_term: str, max_courses: int) -> list:
+    logger.info(f"Starting course search for: {search_term}")
+
+    if uses_http_fetch():
         try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            courses = http_fetch_result(
+                fetch_coniverse_courses_http(search_term, max_courses)
             )
-            logger.info("Page body loaded")
+        except httpx.HTTPError as e:
+            courses = http_fetch_result(error=e)
+        if courses is not None:
+            return courses
 
-            # Wait for JavaScript content
-            time.sleep(5)
-        except Exception as e:
-            logger.warning(f"Timeout waiting for page: {e}")
-
-        # Extract course titles using multiple methods
-        course_titles = []
-
-        # Try different selectors
-        selectors_to_try = [
-            'span[data-qa="txt-name"]',
-            ".txt-name",
-            ".card-content span",
-            ".search-result-card span",
-            'div[id="search-courses-page"] span',
-            ".course-card .title",
-            ".course-title",
-            "h3.course-name",
-            ".course-list .item-title",
-            'a[href*="/course/"] .title',
-            # More general selectors
-            ".card h3",
-            "h3",
-            ".card span",
-        ]
-
-        elements_found = False
-        for selector in selectors_to_try:
-            try:
-                logger.info(f"Trying selector: {selector}")
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                logger.info(f"Found {len(elements)} elements with selector {selector}")
-
-                for element in elements:
-                    try:
-                        title_text = element.text.strip()
-                        if (
-                            title_text
-                            and len(title_text) > 5
-                            and title_text.lower()
-                            not in [
-                                "coniverse",
-                                "results",
-                                "filters",
-                                "search",
-                                "course",
-                            ]
-                            and title_text not in course_titles
-                        ):
-                            course_titles.append(title_text)
-                            elements_found = True
-                            logger.info(f"Added course title: {title_text}")
-                    except Exception:
-                        continue
-
-                if elements_found:
-                    logger.info(f"Successfully found courses with selector: {selector}")
-                    break
-            except Exception as e:
-                logger.warning(f"Error with selector {selector}: {e}")
+    return get_coniverse_courses_selenium(search_term, max_courses)
 
-        # Return results
-        if course_titles:
-            final_courses = course_titles[:max_courses]
-            logger.info(f"Returning {len(final_courses)} courses")
-            return final_courses
-        else:
-            logger.warning("No courses found")
-            return ["No courses found."]
 
+def get_coniverse_courses_selenium(
+    search_term: str, max_courses=settings.MAX_COURSES, cancel_event=None
+) -> list:
+    """Scrape course titles with a pooled browser.
+
+    Setting `cancel_event` from another thread aborts the search, also while
+    it waits for a free driver; a driver already in use has its page load
+    stopped and goes back to the pool.
+    """
+    try:
+        with get_driver_pool().lease(cancel_event=cancel_event) as pooled:
+            logger.info(f"Leased pooled {pooled.name} driver (use #{pooled.uses})")
+            try:
+                return _scrape_coniverse_courses(
+                    pooled, search_term, max_courses, cancel_event
+                )
+            except SearchCancelled:
+                stop_page_load(pooled)
+                raise
+
+    except SearchCancelled:
+        logger.info(f"Course search for {search_term} was cancelled")
+        return ["Error retrieving courses: search cancelled"]
+    except DriverPoolError as e:
+        logger.error(f"Could not lease a browser driver: {e}")
+        return [f"{BROWSER_UNAVAILABLE}: {e}"]
     except Exception as e:
         logger.error(f"Error in get_all_coniverse_courses: {e}")
         return [f"Error retrieving courses: {str(e)}"]
 
-    finally:
-        # Clean up browser driver
-        if driver:
+
+def iter_course_searches(
+    competencies: list[Competency],
+    max_courses=settings.MAX_COURSES,
+    max_workers=settings.COURSE_SEARCH_WORKERS,
+    use_cache=True,
+):
+    """Search courses for all competencies concurrently.
+
+    Yields `(competency_name, courses)` tuples in completion order.
+    """
+    names = list(dict.fromkeys(comp.name for comp in competencies))
+    if not names:
+        return
+
+    workers = max(1, min(max_workers, len(names)))
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="course-search"
+    )
+    try:
+        futures = {
+            executor.submit(
+                get_all_coniverse_courses, name, max_courses, use_cache
+            ): name
+            for name in names
+        }
+        for future in as_completed(futures):
+            name = futures[future]
             try:
-                logger.info(f"Closing {driver_name} driver")
-                driver.quit()
-                logger.info(f"{driver_name} driver closed successfully")
+                courses = future.result()
             except Exception as e:
-                logger.warning(f"Error closing {driver_name} driver: {e}")
+                logger.error(f"Course search for {name} failed: {e}")
+                courses = [f"Error retrieving courses: {str(e)}"]
+            yield name, courses
+    finally:
+        # Don't start searches nobody is waiting for if the caller stops early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def search_courses_parallel(
+    competencies: list[Competency],
+    max_courses=settings.MAX_COURSES,
+    max_workers=settings.COURSE_SEARCH_WORKERS,
+) -> dict:
+    """Search courses for all competencies concurrently.
+
+    Returns `{competency_name: [course titles]}` in competency order.
+    """
+    results = dict(iter_course_searches(competencies, max_courses, max_workers))
+    return {
+        comp.name: results[comp.name] for comp in competencies if comp.name in results
+    }
+
+
+_EXTRACT_TITLES_JS = """
+const [selectors, stoplist, minLength, maxCourses] = arguments;
+for (const selector of selectors) {
+    let elements;
+    try {
+        elements = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    const titles = [];
+    for (const el of elements) {
+        const text = (el.innerText || "").trim();
+        if (
+            text.length > minLength &&
+            !stoplist.includes(text.toLowerCase()) &&
+            !titles.includes(text)
+        ) {
+            titles.push(text);
+            if (titles.length >= maxCourses) {
+                break;
+            }
+        }
+    }
+    if (titles.length > 0) {
+        return [selector, titles];
+    }
+}
+return [null, []];
+"""
+
+
+def extract_course_titles_js(driver, max_courses=settings.MAX_COURSES):
+    """Evaluate the whole selector list in the browser with a single call.
+
+    Applies the same filtering as `extract_course_titles_per_element`.
+    Returns None if the script could not be executed.
+    """
+    try:
+        selector, course_titles = driver.execute_script(
+            _EXTRACT_TITLES_JS,
+            COURSE_TITLE_SELECTORS,
+            TITLE_STOPLIST,
+            MIN_TITLE_LENGTH,
+            max_courses,
+        )
+    except Exception as e:
+        logger.warning(f"Batched title extraction failed: {e}")
+        return None
 
-        # Kill any remaining browser processes
-        kill_browser_processes()
+    if selector:
+        logger.info(f"Found {len(course_titles)} courses with selector: {selector}")
+    return list(course_titles)
+
+
+def extract_course_titles_per_element(driver, max_courses=settings.MAX_COURSES):
+    from selenium.webdriver.common.by import By
+
+    course_titles = []
+
+    elements_found = False
+    for selector in COURSE_TITLE_SELECTORS:
+        try:
+            logger.info(f"Trying selector: {selector}")
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            logger.info(f"Found {len(elements)} elements with selector {selector}")
+
+            for element in elements:
+                try:
+                    title_text = element.text.strip()
+                    if _is_course_title(title_text, course_titles):
+                        course_titles.append(title_text)
+                        elements_found = True
+                        logger.info(f"Added course title: {title_text}")
+                        if len(course_titles) >= max_courses:
+                            break
+                except Exception:
+                    continue
+
+            if elements_found:
+                logger.info(f"Successfully found courses with selector: {selector}")
+                break
+        except Exception as e:
+            logger.warning(f"Error with selector {selector}: {e}")
+
+    return course_titles
+
+
+def stop_page_load(pooled):
+    """Stop loading the current page; a driver that can't is marked broken."""
+    try:
+        pooled.driver.execute_script("window.stop();")
+    except Exception as e:
+        logger.error(f"Failed to stop page load: {e}")
+        pooled.broken = True
+
+
+def _scrape_coniverse_courses(
+    pooled, search_term: str, max_courses: int, cancel_event=None
+) -> list:
+    from selenium.common.exceptions import TimeoutException
+
+    driver = pooled.driver
+
+    url = build_search_url(search_term)
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise SearchCancelled()
+    logger.info(f"Navigating to URL: {url}")
+
+    try:
+        driver.get(url)
+        logger.info("Page requested successfully")
+    except TimeoutException:
+        logger.warning("Page load timed out. Trying to continue anyway...")
+        stop_page_load(pooled)
+    except Exception as e:
+        logger.error(f"Error loading page: {e}")
+        pooled.broken = True
+        get_debug_capture().capture(driver, search_term, error=True)
+        return [f"Error loading page: {str(e)}"]
+
+    # Log some debug info
+    logger.info(f"Current page title: {driver.title}")
+    logger.info(f"Current URL: {driver.current_url}")
+
+    # Wait until result cards (or an empty state) are rendered
+    if cancel_event is not None and cancel_event.is_set():
+        raise SearchCancelled()
+    readiness = wait_for_search_results(
+        driver, min_results=max_courses, cancel_event=cancel_event
+    )
+    if readiness == "empty":
+        logger.warning("Search page reports no results")
+        get_debug_capture().capture(driver, search_term)
+        return ["No courses found."]
+
+    # Extract course titles in one round trip, falling back to the
+    # per-element WebDriver path if the script can't run
+    course_titles = extract_course_titles_js(driver, max_courses)
+    if course_titles is None:
+        course_titles = extract_course_titles_per_element(driver, max_courses)
+
+    # Sampled debug artifacts; failures are always captured if enabled
+    get_debug_capture().capture(
+        driver, search_term, error=not course_titles or readiness == "timeout"
+    )
+
+    # Return results
+    if course_titles:
+        final_courses = course_titles[:max_courses]
+        logger.info(f"Returning {len(final_courses)} courses")
+        return final_courses
+    else:
+        logger.warning("No courses found")
+        return ["No courses found."]
@@ -1,15 +1,13 @@
+import threading
+
 import streamlit as st
 
 import settings
-from agent import generate_course_message_with_llm, init_llm_agent
 from models import Competency
-from tools import get_all_coniverse_courses
-from vector_db import (
-    init_model_and_db,
-    load_competency_data,
-    search_competencies,
-    setup_vector_db,
-)
+
+# agent (pydantic_ai), service (encoder, qdrant, pandas) and tools are
+# imported where they are used, so the first page render does not wait for
+# them; the warm-up thread below loads them in the background.
 
 st.set_page_config(page_title="Learning Path Assistant", page_icon="🧠", layout="wide")
 
@@ -27,16 +25,76 @@ if "search_results" not in st.session_state:
     st.session_state.search_results = {}
 if "competencies" not in st.session_state:
     st.session_state.competencies = []
-if "current_search_index" not in st.session_state:
-    st.session_state.current_search_index = -1
-if "total_search_count" not in st.session_state:
-    st.session_state.total_search_count = 0
 if "user_query" not in st.session_state:
     st.session_state.user_query = ""
-if "llm_agent" not in st.session_state:
-    st.session_state.llm_agent = None
-if "final_message_added_for_current_search" not in st.session_state:
-    st.session_state.final_message_added_for_current_search = False
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_agent():
+    """One LLM agent per process; it holds no per-session state."""
+    from agent import init_llm_agent
+
+    return init_llm_agent()
+
+
+class Warmup:
+    """Builds the shared service and imports the LLM stack in the background."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+
+    def _run(self):
+        try:
+            from service import get_service
+
+            get_service()
+            import agent  # noqa: F401
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup() -> Warmup:
+    """Start warming up once per process; every session shares the result."""
+    return Warmup()
+
+
+@st.fragment(run_every=1)
+def show_warmup_progress(warmup: Warmup):
+    if warmup.done.is_set():
+        st.rerun()
+    st.info(
+        "Loading the competency model in the background. "
+        "You can already type your question."
+    )
+
+
+def finish_initialization(warmup: Warmup) -> bool:
+    """Wait for the warm-up if needed; True once the assistant is usable."""
+    if not warmup.done.is_set():
+        with st.spinner("Finishing startup (loading data and the model)..."):
+            warmup.done.wait()
+    if warmup.error is not None:
+        if isinstance(warmup.error, FileNotFoundError):
+            st.error(warmup.error)
+        else:
+            st.error(f"An error occurred during initialization: {warmup.error}")
+        # Retry on the next rerun instead of keeping the failure forever
+        start_warmup.clear()
+        return False
+    if not st.session_state.initialized:
+        from service import get_service
+
+        get_llm_agent()
+        st.session_state.initialized = True
+        st.success(
+            f"Assistant initialized with {get_service().competency_count} competencies!"
+        )
+    return True
 
 
 def format_competencies_message(competencies: list[Competency]):
@@ -55,49 +113,122 @@ def format_competencies_message(competencies: list[Competency]):
     return message
 
 
-def format_searching_message(competency_name: str, index: int, total: int):
-    return f"Searching for courses related to **{competency_name}** ({index + 1}/{total})...."
+def format_search_progress_message(
+    competency_name: str, courses: list, index: int, total: int
+):
+    from tools import COURSE_SEARCH_UNAVAILABLE, usable_courses
 
+    valid_courses = usable_courses(courses)
+    if valid_courses:
+        return f"Found {len(valid_courses)} course(s) for **{competency_name}** ({index + 1}/{total})."
+    if courses == [COURSE_SEARCH_UNAVAILABLE]:
+        return f"Course search is temporarily unavailable, skipped **{competency_name}** ({index + 1}/{total})."
+    return f"No courses found for **{competency_name}** ({index + 1}/{total})."
 
-def process_user_input(user_input: str):
-    st.session_state.user_query = user_input
 
+def add_assistant_message(content: str):
+    with st.chat_message("assistant"):
+        st.markdown(content)
+    st.session_state.messages.append({"role": "assistant", "content": content})
+
+
+def stream_message_deltas(events):
+    """Text of the pipeline's "delta" events, until the run ends."""
+    for event in events:
+        if event.kind == "delta":
+            yield event.text
+        elif event.kind in ("done", "error"):
+            return
+
+
+def run_recommendation(user_input: str):
+    """Render a pipeline run as its events arrive and record it in the chat.
+
+    The pipeline (pipeline.py) owns the control flow: competency retrieval,
+    the concurrent course search and the streamed LLM message all happen in
+    this one script run, and the page only reacts to progress events.
+    """
+    from pipeline import iter_pipeline_events
+
+    st.session_state.user_query = user_input
     st.session_state.search_results = {}
     st.session_state.competencies = []
-    st.session_state.current_search_index = -1
-    st.session_state.total_search_count = 0
-    st.session_state.final_message_added_for_current_search = False
 
+    events = iter_pipeline_events(user_input, llm_agent=get_llm_agent())
+    status = None
     try:
-        competencies = search_competencies(
-            st.session_state.client,
-            st.session_state.model,
-            user_input,
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            top_n=settings.TOP_N,
-            similarity_threshold=settings.SIMILARITY_THRESHOLD,
+        for event in events:
+            if event.kind == "error":
+                st.error(f"Error during competency search: {event.text}")
+                add_assistant_message(
+                    "Sorry, an error occurred while searching for competencies."
+                )
+            elif event.kind == "competencies":
+                st.session_state.competencies = event.competencies
+                add_assistant_message(format_competencies_message(event.competencies))
+                if event.competencies:
+                    with st.chat_message("assistant"):
+                        status = st.status(
+                            f"Searching online for courses for {event.total} competencies...",
+                            expanded=True,
+                        )
+            elif event.kind == "courses":
+                progress_msg_content = format_search_progress_message(
+                    event.competency_name,
+                    event.courses,
+                    event.completed - 1,
+                    event.total,
+                )
+                st.session_state.messages.append(
+                    {"role": "assistant", "content": progress_msg_content}
+                )
+                status.write(progress_msg_content)
+            elif event.kind == "courses_done":
+                st.session_state.search_results = event.search_results
+                label = "Course search complete"
+                if event.completed < event.total:
+                    label += f" (enough courses after {event.completed}/{event.total} competencies)"
+                status.update(label=label, state="complete")
+                if get_llm_agent() is None:
+                    continue
+                with st.chat_message("assistant"):
+                    # Rendered as it is generated; write_stream returns the full text
+                    course_message = st.write_stream(stream_message_deltas(events))
+                st.session_state.messages.append(
+                    {"role": "assistant", "content": course_message}
+                )
+    finally:
+        # Cancels whatever is still running if the script run is stopped
+        events.close()
+
+
+def show_search_health():
+    from service import get_service
+    from tools import get_course_breaker, get_course_cache
+
+    with st.expander("Competency search cache"):
+        st.json(get_service().cache_stats())
+    if settings.RECOMMENDATION_CACHE_ENABLED:
+        from agent import get_recommendation_cache
+
+        with st.expander("Recommendation cache"):
+            st.json(get_recommendation_cache().stats())
+    if settings.COURSE_CACHE_ENABLED:
+        with st.expander("Course search cache"):
+            st.json(get_course_cache().stats())
+    breaker_state = get_course_breaker().snapshot()
+    if breaker_state["state"] != "closed":
+        st.warning(
+            "Course search is degraded (coniverse is slow or failing); "
+            "results may come from cache only."
         )
-        st.session_state.competencies = competencies
-
-        if competencies:
-            st.session_state.current_search_index = 0
-            st.session_state.total_search_count = len(competencies)
-            return format_competencies_message(competencies)
-        else:
-            st.session_state.current_search_index = -1
-            st.session_state.total_search_count = 0
-            st.session_state.final_message_added_for_current_search = True
-            return "I couldn't find any relevant competencies based on your input. Could you provide more details or try different keywords?"
-    except Exception as e:
-        st.error(f"Error during competency search: {e}")
-        st.session_state.current_search_index = -1
-        st.session_state.total_search_count = 0
-        st.session_state.final_message_added_for_current_search = True
-        return "Sorry, an error occurred while searching for competencies."
+    with st.expander("Course search health"):
+        st.json(breaker_state)
 
 
 def main():
     st.title("🧠 Learning Path Assistant")
+    warmup = start_warmup()
 
     with st.sidebar:
         st.subheader("About this Assistant")
@@ -116,129 +247,32 @@ def main():
         st.warning(
             "Ensure your `OPENAI_API_KEY` environment variable is set or configure `pydantic-ai`."
         )
+        if st.session_state.initialized:
+            show_search_health()
 
     if not st.session_state.initialized:
-        with st.spinner(
-            "Initializing the Learning Path Assistant (Loading data, setting up DB and LLM)..."
-        ):
-            try:
-                df = load_competency_data()
-                model, client = init_model_and_db()
-                count = setup_vector_db(
-                    client, model, df, collection_name=settings.QDRANT_COLLECTION_NAME
-                )
-
-                st.session_state.llm_agent = init_llm_agent()
-
-                st.session_state.df = df
-                st.session_state.model = model
-                st.session_state.client = client
-                st.session_state.initialized = True
-
-                st.success(f"Assistant initialized with {count} competencies!")
-
-            except FileNotFoundError as e:
-                st.error(e)
-            except Exception as e:
-                st.error(f"An error occurred during initialization: {e}")
+        # The model, index and data are shared by every session in this
+        # process; only the chat state lives in session_state.
+        if warmup.done.is_set():
+            finish_initialization(warmup)
+        else:
+            show_warmup_progress(warmup)
 
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
-    if (
-        st.session_state.current_search_index >= 0
-        and st.session_state.current_search_index < st.session_state.total_search_count
-        and st.session_state.initialized
-    ):
-        competency_to_search = st.session_state.competencies[
-            st.session_state.current_search_index
-        ]
-        searching_msg_content = format_searching_message(
-            competency_to_search.name,
-            st.session_state.current_search_index,
-            st.session_state.total_search_count,
-        )
-        if not (
-            st.session_state.messages
-            and st.session_state.messages[-1]["role"] == "assistant"
-            and st.session_state.messages[-1]["content"] == searching_msg_content
-        ):
-            st.session_state.messages.append(
-                {"role": "assistant", "content": searching_msg_content}
-            )
-            with st.chat_message("assistant"):
-                st.markdown(searching_msg_content)
-            st.rerun()
-
-        if st.session_state.messages[-1]["content"] == searching_msg_content:
-            with st.spinner(
-                f"Searching online for courses for {competency_to_search.name}..."
-            ):
-                courses = get_all_coniverse_courses(
-                    competency_to_search.name, max_courses=settings.MAX_COURSES
-                )
-                st.session_state.search_results[competency_to_search.name] = courses
-
-                st.session_state.current_search_index += 1
-
-                st.rerun()
-
-    if (
-        st.session_state.current_search_index >= st.session_state.total_search_count
-        and st.session_state.total_search_count > 0
-        and st.session_state.llm_agent is not None
-        and not st.session_state.final_message_added_for_current_search
-    ):
-        with st.chat_message("assistant"):
-            with st.spinner("Generating personalized recommendations..."):
-                course_message = generate_course_message_with_llm(
-                    st.session_state.search_results,
-                    st.session_state.competencies,
-                    st.session_state.user_query,
-                    st.session_state.llm_agent,
-                )
-                st.markdown(course_message)
-
-        st.session_state.messages.append(
-            {"role": "assistant", "content": course_message}
-        )
-        st.session_state.final_message_added_for_current_search = True
-
-        st.session_state.current_search_index = -1
-
-    if (
-        st.session_state.current_search_index == -1
-        and st.session_state.total_search_count == 0
-        and st.session_state.user_query
-        and not st.session_state.final_message_added_for_current_search
-    ):
-        pass
-
-    if st.session_state.current_search_index == -1 and st.session_state.initialized:
-        user_input = st.chat_input(
-            "Enter a skill or interest you'd like to learn about:"
-        )
-        if user_input:
-            st.session_state.messages.append({"role": "user", "content": user_input})
-            with st.chat_message("user"):
-                st.markdown(user_input)
-
-            initial_assistant_response = process_user_input(user_input)
-
-            if not (
-                st.session_state.messages
-                and st.session_state.messages[-1]["role"] == "assistant"
-                and st.session_state.messages[-1]["content"]
-                == initial_assistant_response
-            ):
-                with st.chat_message("assistant"):
-                    st.markdown(initial_assistant_response)
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": initial_assistant_response}
-                )
-
-            st.rerun()
+    # Shown before the warm-up finishes; an early question waits for it
+    user_input = st.chat_input("Enter a skill or interest you'd like to learn about:")
+    if user_input:
+        st.session_state.messages.append({"role": "user", "content": user_input})
+        with st.chat_message("user"):
+            st.markdown(user_input)
+        if not finish_initialization(warmup):
+            return
+
+        run_recommendation(user_input)
+        st.rerun()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,48 @@
+import dataclasses
+import os
+
+import numpy as np
 import pandas as pd
 import qdrant_client
 from qdrant_client.http import models
-from sentence_transformers import SentenceTransformer
 
 import settings
+from caching import LRUCache
+from embedding_store import EmbeddingStore
+from encoders import encoder_id, load_encoder
+from lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
 from models import Competency
+from search_backends import NumpySearchBackend, QdrantSearchBackend, choose_backend
+
+
+class SearchIndex:
+    """A search backend plus the query caches that are only valid for it.
+
+    `setup_vector_db` registers a fresh index on every rebuild, so cached
+    vectors and results never outlive the data they were computed from.
+    """
+
+    def __init__(self, backend, lexical=None):
+        self.backend = backend
+        self.lexical = lexical
+        self.query_vectors = LRUCache(settings.QUERY_VECTOR_CACHE_SIZE)
+        self.results = LRUCache(settings.SEARCH_RESULT_CACHE_SIZE)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "lexical_terms": len(self.lexical.postings) if self.lexical else 0,
+            "query_vectors": self.query_vectors.stats(),
+            "results": self.results.stats(),
+        }
+
+
+# SearchIndex per (client, collection), registered by setup_vector_db
+_indexes = {}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
 
 
 def load_competency_data(file_path=settings.COMPETENCY_DATA_PATH):
@@ -27,14 +65,54 @@ def load_competency_data(file_path=settings.COMPETENCY_DATA_PATH):
 
 
 def init_model_and_db():
-    model = SentenceTransformer(settings.MODEL_NAME)
-    client = qdrant_client.QdrantClient(location=":memory:")
+    model = load_encoder()
+    if settings.QDRANT_URL:
+        client = qdrant_client.QdrantClient(url=settings.QDRANT_URL)
+    else:
+        client = qdrant_client.QdrantClient(location=":memory:")
     return model, client
 
 
-def setup_vector_db(client, model, df, collection_name=settings.QDRANT_COLLECTION_NAME):
-    vector_size = model.get_sentence_embedding_dimension()
+def encode_corpus(model, texts, batch_size=settings.ENCODE_BATCH_SIZE):
+    """Encode in batches; large corpora are spread over a multi-process pool."""
+    if len(texts) >= settings.MULTIPROCESS_ENCODE_MIN_ROWS and hasattr(
+        model, "start_multi_process_pool"
+    ):
+        pool = model.start_multi_process_pool()
+        try:
+            return model.encode_multi_process(texts, pool, batch_size=batch_size)
+        finally:
+            model.stop_multi_process_pool(pool)
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
 
+def bulk_load_vectors(
+    client,
+    collection_name,
+    embeddings,
+    payload_columns: dict,
+    batch_size=settings.UPLOAD_BATCH_SIZE,
+    parallel=settings.UPLOAD_PARALLEL,
+):
+    """Stream an embedding matrix and column-oriented payloads into a collection.
+
+    Point ids are the row numbers. `payload_columns` maps payload field names
+    to equally long arrays.
+    """
+    names = list(payload_columns)
+    columns = [np.asarray(payload_columns[name]).tolist() for name in names]
+    client.upload_collection(
+        collection_name=collection_name,
+        vectors=np.asarray(embeddings, dtype=np.float32),
+        payload=(dict(zip(names, values)) for values in zip(*columns)),
+        ids=range(len(embeddings)),
+        batch_size=batch_size,
+        parallel=parallel,
+        wait=True,
+    )
+
+
+def setup_vector_db(client, model, df, collection_name=settings.QDRANT_COLLECTION_NAME):
     try:
         client.get_collection(collection_name=collection_name)
         client.delete_collection(collection_name=collection_name)
@@ -42,42 +120,43 @@ def setup_vector_db(client, model, df, collection_name=settings.QDRANT_COLLECTIO
     except:
         pass
 
-    client.create_collection(
-        collection_name=collection_name,
-        vectors_config=models.VectorParams(
-            size=vector_size,
-            distance=models.Distance.COSINE,
-        ),
+    texts = (df["competency"] + ". " + df["description"]).tolist()
+    embeddings = EmbeddingStore(collection_name).get_or_encode(
+        texts, lambda batch: encode_corpus(model, batch)
     )
+    payloads = {
+        "competency": df["competency"].to_numpy(),
+        "description": df["description"].to_numpy(),
+    }
 
-    texts = (df["competency"] + ". " + df["description"]).tolist()
-    embeddings = model.encode(texts)
-
-    points = []
-    for i, (_, row) in enumerate(df.iterrows()):
-        points.append(
-            models.PointStruct(
-                id=i,
-                vector=embeddings[i].tolist(),
-                payload={
-                    "competency": row["competency"],
-                    "description": row["description"],
-                },
-            )
+    if choose_backend(len(df)) == "numpy":
+        backend = NumpySearchBackend(embeddings, payloads)
+        print(f"Indexed {len(backend)} competencies in memory (numpy backend)")
+    else:
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=model.get_sentence_embedding_dimension(),
+                distance=models.Distance.COSINE,
+            ),
         )
+        bulk_load_vectors(client, collection_name, embeddings, payloads)
+        backend = QdrantSearchBackend(client, collection_name)
 
-    # Calculate total points AFTER populating the list
-    total_points = len(points)
+    lexical = BM25Index(payloads["competency"], payloads["description"])
+    _indexes[(id(client), collection_name)] = SearchIndex(backend, lexical)
+    return len(backend)
 
-    batch_size = 100
-    uploaded_count = 0
-    for i in range(0, total_points, batch_size):
-        batch = points[i : i + batch_size]
-        client.upsert(collection_name=collection_name, points=batch, wait=True)
-        uploaded_count += len(batch)
 
-    count = client.count(collection_name=collection_name, exact=True).count
-    return count
+def get_search_index(client, collection_name=settings.QDRANT_COLLECTION_NAME):
+    """Index registered by `setup_vector_db`, else one searching Qdrant directly."""
+    key = (id(client), collection_name)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes.setdefault(
+            key, SearchIndex(QdrantSearchBackend(client, collection_name))
+        )
+    return index
 
 
 def search_competencies(
@@ -88,25 +167,234 @@ def search_competencies(
     top_n=settings.TOP_N,
     similarity_threshold=settings.SIMILARITY_THRESHOLD,
 ) -> list[Competency]:
-    query_vector = model.encode(query)
-
-    results = client.search(
+    return search_competencies_batch(
+        client,
+        model,
+        [query],
         collection_name=collection_name,
-        query_vector=query_vector,
-        limit=top_n,
-    )
+        top_n=top_n,
+        similarity_threshold=similarity_threshold,
+    )[0]
 
-    competencies = []
-    for res in results:
-        if res.score > similarity_threshold:
-            competencies.append(
-                Competency(
-                    name=res.payload["competency"],
-                    description=res.payload["description"],
-                    similarity_score=res.score,
+
+def search_competencies_batch(
+    client,
+    model,
+    queries: list[str],
+    collection_name=settings.QDRANT_COLLECTION_NAME,
+    top_n=settings.TOP_N,
+    similarity_threshold=settings.SIMILARITY_THRESHOLD,
+    batch_size=settings.ENCODE_BATCH_SIZE,
+) -> list[list[Competency]]:
+    """Return one competency list per query, in query order.
+
+    Cached results are reused; the remaining distinct queries are encoded in
+    one batched `model.encode` call (skipping cached vectors) and searched
+    together. With SEARCH_MODE=hybrid the vector ranking is fused with a
+    BM25 keyword ranking, and short queries made only of rare corpus terms
+    are answered from the keyword index without encoding.
+    """
+    index = get_search_index(client, collection_name)
+    hybrid = settings.SEARCH_MODE == "hybrid" and index.lexical is not None
+    normalized = [normalize_query(query) for query in queries]
+
+    found = {}
+    for query in dict.fromkeys(normalized):
+        competencies = index.results.get((query, top_n, similarity_threshold, hybrid))
+        if competencies is not None:
+            found[query] = competencies
+    pending = [query for query in dict.fromkeys(normalized) if query not in found]
+
+    if pending:
+        lexical_hits = {}
+        to_search = pending
+        depth = top_n
+        if hybrid:
+            depth = max(top_n, settings.HYBRID_CANDIDATES)
+            lexical_hits = {
+                query: index.lexical.competencies(index.lexical.search(query, depth))
+                for query in pending
+            }
+            to_search = [
+                query
+                for query in pending
+                if not _lexical_shortcut(index.lexical, query)
+            ]
+
+        vector_hits = dict(
+            zip(
+                to_search,
+                _vector_search(
+                    index, model, to_search, depth, similarity_threshold, batch_size
+                ),
+            )
+        )
+        for query in pending:
+            if hybrid:
+                rankings = [lexical_hits[query], vector_hits.get(query, [])]
+                competencies = reciprocal_rank_fusion(
+                    rankings, top_n, k=settings.HYBRID_RRF_K
                 )
+            else:
+                competencies = vector_hits[query]
+            index.results.set(
+                (query, top_n, similarity_threshold, hybrid), competencies
             )
+            found[query] = competencies
+
+    # Callers may mutate what they get back, so never hand out cached objects
+    return [
+        [dataclasses.replace(comp) for comp in found[query]] for query in normalized
+    ]
+
 
-    competencies.sort(key=lambda x: x.similarity_score, reverse=True)
+def cached_query_vector(client, query, collection_name=settings.QDRANT_COLLECTION_NAME):
+    """Embedding of `query` if an earlier search encoded it, else None.
 
-    return competencies
+    Never encodes: queries answered without the model (a role index match or
+    a lexical shortcut) have no cached vector.
+    """
+    index = get_search_index(client, collection_name)
+    return index.query_vectors.get(normalize_query(query))
+
+
+def _lexical_shortcut(lexical, query) -> bool:
+    """Whether keyword hits alone can answer `query` (no model call needed).
+
+    Only for short queries made of rare terms (e.g. "GAAP"), whose few
+    matching documents are the answer; broad terms are left to the model.
+    """
+    return len(
+        tokenize(query)
+    ) <= settings.LEXICAL_SHORTCUT_MAX_TERMS and lexical.covers(
+        query, max_docs=settings.LEXICAL_SHORTCUT_MAX_DOCS
+    )
+
+
+def _vector_search(index, model, queries, top_n, similarity_threshold, batch_size):
+    if not queries:
+        return []
+    vectors = {}
+    for query in queries:
+        vector = index.query_vectors.get(query)
+        if vector is not None:
+            vectors[query] = vector
+    to_encode = [query for query in queries if query not in vectors]
+    if to_encode:
+        encoded = model.encode(to_encode, batch_size=batch_size)
+        for query, vector in zip(to_encode, encoded):
+            index.query_vectors.set(query, vector)
+            vectors[query] = vector
+    return index.backend.search(
+        [vectors[query] for query in queries], top_n, similarity_threshold
+    )
+
+
+def load_course_catalog(file_path=settings.COURSE_CATALOG_PATH):
+    """Load the course catalog built by `python -m course_catalog`.
+
+    Returns `(df, embeddings, model_name)`, or `(None, None, None)` when no
+    catalog has been built yet.
+    """
+    if not os.path.exists(file_path):
+        print(f"No course catalog found at {file_path}")
+        return None, None, None
+
+    with np.load(file_path) as catalog:
+        df = pd.DataFrame(
+            {
+                "competency": catalog["competency"].astype(str),
+                "title": catalog["title"].astype(str),
+            }
+        )
+        embeddings = catalog["embeddings"]
+        model_name = str(catalog["model_name"])
+    print(f"Loaded course catalog with {len(df)} courses from {file_path}")
+    return df, embeddings, model_name
+
+
+def save_course_catalog(df, embeddings, file_path=settings.COURSE_CATALOG_PATH):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{file_path}.tmp.npz"
+    np.savez(
+        tmp_path,
+        competency=df["competency"].to_numpy(dtype=str),
+        title=df["title"].to_numpy(dtype=str),
+        embeddings=np.asarray(embeddings, dtype=np.float32),
+        model_name=np.array(encoder_id()),
+    )
+    os.replace(tmp_path, file_path)
+
+
+def setup_course_catalog(
+    client,
+    model,
+    file_path=settings.COURSE_CATALOG_PATH,
+    collection_name=settings.COURSE_COLLECTION_NAME,
+):
+    """Index the prebuilt course catalog; returns the number of courses indexed."""
+    df, embeddings, model_name = load_course_catalog(file_path)
+    if df is None or df.empty:
+        return 0
+
+    if model_name != encoder_id():
+        print(
+            f"Course catalog was embedded with {model_name}, re-encoding with {encoder_id()}"
+        )
+        embeddings = model.encode(df["title"].tolist())
+
+    try:
+        client.delete_collection(collection_name=collection_name)
+    except Exception:
+        pass
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(
+            size=model.get_sentence_embedding_dimension(),
+            distance=models.Distance.COSINE,
+        ),
+    )
+    bulk_load_vectors(
+        client,
+        collection_name,
+        embeddings,
+        {"competency": df["competency"].to_numpy(), "title": df["title"].to_numpy()},
+    )
+    return client.count(collection_name=collection_name, exact=True).count
+
+
+def search_courses(
+    client,
+    model,
+    query,
+    competency_name=None,
+    collection_name=settings.COURSE_COLLECTION_NAME,
+    top_n=settings.MAX_COURSES,
+    similarity_threshold=settings.COURSE_SIMILARITY_THRESHOLD,
+) -> list[str]:
+    """Return catalog course titles closest to `query`.
+
+    When `competency_name` is given only courses ingested for that
+    competency are considered.
+    """
+    query_filter = None
+    if competency_name:
+        query_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="competency", match=models.MatchValue(value=competency_name)
+                )
+            ]
+        )
+
+    results = client.search(
+        collection_name=collection_name,
+        query_vector=model.encode(query),
+        query_filter=query_filter,
+        limit=top_n,
+    )
+    return [
+        res.payload["title"] for res in results if res.score >= similarity_threshold
+    ]